@@ -0,0 +1,7 @@
+"""
+Benchmarks Package
+==================
+
+Performance measurements for the MCP Skeleton tools. These are scripts, not
+tests: run them directly, e.g. ``poetry run python -m benchmarks.bench_text_analyzer``.
+"""
@@ -0,0 +1,78 @@
+"""
+Benchmark: stdio cold start
+===========================
+
+Measures what an IDE client sees when it launches the server over stdio:
+time from spawning the process to the initialize response, to the tools/list
+response and to the first tool call's result. Each run starts a fresh
+process.
+
+Usage:
+    poetry run python -m benchmarks.bench_cold_start [--runs 10]
+    poetry run python -m benchmarks.bench_cold_start --save baseline-cold-start.json
+    poetry run python -m benchmarks.bench_cold_start --baseline baseline-cold-start.json
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.harness import Results, add_baseline_arguments, finish, summarize
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_MILESTONES = ("initialize", "tools_list", "first_call")
+
+
+async def cold_start() -> Dict[str, float]:
+    """Seconds from spawn to each milestone for one fresh server process."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["mcp_server.py"],
+        cwd=_ROOT,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            timings["initialize"] = time.perf_counter() - start
+            await session.list_tools()
+            timings["tools_list"] = time.perf_counter() - start
+            await session.call_tool("calculator", {"operation": "add", "a": 1, "b": 2})
+            timings["first_call"] = time.perf_counter() - start
+    return timings
+
+
+async def run(runs: int) -> Results:
+    samples: Dict[str, List[float]] = {milestone: [] for milestone in _MILESTONES}
+    for _ in range(runs):
+        timings = await cold_start()
+        for milestone in _MILESTONES:
+            samples[milestone].append(timings[milestone])
+    # Throughput here is launches per second of the given milestone
+    return {
+        f"cold_start/{milestone}": summarize(values, sum(values))
+        for milestone, values in samples.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="Server launches to measure")
+    add_baseline_arguments(parser, gate=("p50_ms",))
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.runs))
+    sys.exit(finish("cold_start", results, args))
+
+
+if __name__ == "__main__":
+    main()
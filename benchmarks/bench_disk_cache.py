@@ -0,0 +1,79 @@
+"""
+Benchmark: disk cache tier
+==========================
+
+Times reads and writes of the SQLite cache tier (utilities/disk_cache.py) for
+entries shaped like http_request results of various sizes. Entries above the
+compression threshold are zlib-compressed, so the large cases include
+compression and decompression.
+
+Usage:
+    poetry run python -m benchmarks.bench_disk_cache [--sizes 10,1000,20000]
+    poetry run python -m benchmarks.bench_disk_cache --save baseline-disk-cache.json
+    poetry run python -m benchmarks.bench_disk_cache --baseline baseline-disk-cache.json
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Any, Dict
+
+from benchmarks.harness import Results, add_baseline_arguments, finish, time_async
+from utilities.disk_cache import DiskCache
+
+
+def _result(items: int) -> Dict[str, Any]:
+    return {
+        "status_code": 200,
+        "url": "http://upstream.local/json",
+        "data": [{"id": i, "name": f"item-{i}"} for i in range(items)],
+        "truncated": False,
+    }
+
+
+async def run(sizes: list, seconds: float) -> Results:
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DiskCache(os.path.join(directory, "cache.db"), max_bytes=1 << 30)
+        # Enough other entries that lookups go through a real index
+        for i in range(10_000):
+            cache.put("bench", f"filler-{i}", {"i": i}, ttl=3600)
+
+        for size in sizes:
+            value = _result(size)
+            key = f"http://upstream.local/json/{size}"
+
+            async def write(k: str = key, v: Dict[str, Any] = value) -> None:
+                cache.put("bench", k, v, ttl=3600)
+
+            async def read(k: str = key) -> None:
+                assert cache.get("bench", k) is not None
+
+            results[f"put/{size}"] = await time_async(write, min_seconds=seconds)
+            results[f"get/{size}"] = await time_async(read, min_seconds=seconds)
+
+        async def miss() -> None:
+            cache.get("bench", "absent")
+
+        results["get/miss"] = await time_async(miss, min_seconds=seconds)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", default="10,1000,20000", help="Comma-separated item counts per entry"
+    )
+    parser.add_argument("--seconds", type=float, default=0.5, help="Minimum time per case")
+    add_baseline_arguments(parser, gate=("throughput", "p50_ms"))
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = asyncio.run(run(sizes, args.seconds))
+    sys.exit(finish("disk_cache", results, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Benchmark: end-to-end load test
+===============================
+
+Drives the real server through an MCP client over stdio and/or HTTP
+transports. Each client session runs a fixed mix of tool calls
+(calculator, get_weather, http_request, analyze_text). http_request hits a
+local stand-in upstream started by this script, so results do not depend on
+the internet.
+
+Results are reported per transport and tool as <transport>/<tool>, plus
+<transport>/all for the whole mix. stdio serves one client per server
+process, so stdio clients each start their own server. The HTTP transports
+share one server, configured from the environment as usual (e.g.
+HTTP_WORKERS).
+
+Usage:
+    poetry run python -m benchmarks.bench_load [--transports stdio,sse] [--clients 8] [--calls 40]
+    poetry run python -m benchmarks.bench_load --save baseline-load.json
+    poetry run python -m benchmarks.bench_load --baseline baseline-load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import AsyncExitStack, contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+import httpx
+
+from benchmarks.harness import Results, add_baseline_arguments, finish, summarize
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_TEXT = "The quick brown fox jumps over the lazy dog. " * 200
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def stand_in_upstream() -> Iterator[str]:
+    """Serve /json/<n> (a JSON array of n items) on a local port; yields the base URL."""
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import Response
+    from starlette.routing import Route
+
+    async def items(request: Request) -> Response:
+        count = int(request.path_params["count"])
+        body = json.dumps([{"id": i, "name": f"item-{i}"} for i in range(count)])
+        return Response(body, media_type="application/json")
+
+    port = _free_port()
+    app = Starlette(routes=[Route("/json/{count:int}", items)])
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def _workload(upstream: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """The tool calls every client repeats, in order."""
+    return [
+        ("calculator", {"operation": "multiply", "a": 6, "b": 7}),
+        ("get_weather", {"city": "London"}),
+        ("http_request", {"url": f"{upstream}/json/100"}),
+        ("analyze_text", {"text": _TEXT}),
+    ]
+
+
+def _server_env(port: int) -> Dict[str, str]:
+    return {
+        **os.environ,
+        "MCP_SERVER_HOST": "127.0.0.1",
+        "MCP_SERVER_PORT": str(port),
+        "LOG_LEVEL": "WARNING",
+        # The benchmark measures the tools, not the response cache
+        "HTTP_CACHE_ENABLED": "false",
+    }
+
+
+@contextmanager
+def http_server(transport: str) -> Iterator[str]:
+    """Start the server with an HTTP transport; yields the MCP endpoint URL."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "mcp_server.py", "--transport", transport],
+        cwd=_ROOT,
+        env=_server_env(port),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=0.5)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError(f"Server did not start with transport {transport}")
+                time.sleep(0.2)
+        yield f"http://127.0.0.1:{port}/{'sse' if transport == 'sse' else 'mcp'}"
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+class _StartLine:
+    """Holds every client until all sessions are initialized, so setup is not timed."""
+
+    def __init__(self, clients: int) -> None:
+        self.waiting = clients
+        self.go = asyncio.Event()
+        self.started = 0.0
+
+    async def ready(self) -> None:
+        self.waiting -= 1
+        if self.waiting == 0:
+            self.started = time.perf_counter()
+            self.go.set()
+        await self.go.wait()
+
+
+async def _client(
+    transport: str, endpoint: str, workload: List[Tuple[str, Dict[str, Any]]], calls: int,
+    start_line: _StartLine, latencies: Dict[str, List[float]],
+) -> None:
+    """One client session making `calls` tool calls from the workload mix."""
+    from mcp import ClientSession, StdioServerParameters
+
+    async with AsyncExitStack() as stack:
+        if transport == "stdio":
+            from mcp.client.stdio import stdio_client
+            params = StdioServerParameters(
+                command=sys.executable, args=["mcp_server.py"], cwd=_ROOT, env=_server_env(0)
+            )
+            read, write = await stack.enter_async_context(stdio_client(params))
+        elif transport == "sse":
+            from mcp.client.sse import sse_client
+            read, write = await stack.enter_async_context(sse_client(endpoint))
+        else:
+            from mcp.client.streamable_http import streamablehttp_client
+            read, write, _ = await stack.enter_async_context(streamablehttp_client(endpoint))
+        session = await stack.enter_async_context(ClientSession(read, write))
+        await session.initialize()
+        await start_line.ready()
+
+        for i in range(calls):
+            tool, arguments = workload[i % len(workload)]
+            start = time.perf_counter()
+            result = await session.call_tool(tool, arguments)
+            latencies.setdefault(tool, []).append(time.perf_counter() - start)
+            if result.isError:
+                raise RuntimeError(f"{tool} failed: {result.content}")
+
+
+async def run_transport(
+    transport: str, endpoint: str, upstream: str, clients: int, calls: int
+) -> Results:
+    """Run all clients concurrently against one transport."""
+    latencies: Dict[str, List[float]] = {}
+    workload = _workload(upstream)
+    start_line = _StartLine(clients)
+    await asyncio.gather(*(
+        _client(transport, endpoint, workload, calls, start_line, latencies)
+        for _ in range(clients)
+    ))
+    elapsed = time.perf_counter() - start_line.started
+
+    results = {
+        f"{transport}/{tool}": summarize(values, elapsed) for tool, values in latencies.items()
+    }
+    results[f"{transport}/all"] = summarize(
+        [value for values in latencies.values() for value in values], elapsed
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--transports", default="stdio,sse",
+        help="Comma-separated transports: stdio, sse, streamable-http",
+    )
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client sessions")
+    parser.add_argument("--calls", type=int, default=40, help="Tool calls per client")
+    add_baseline_arguments(parser, gate=("throughput", "p50_ms", "p99_ms"))
+    args = parser.parse_args()
+
+    results: Results = {}
+    with stand_in_upstream() as upstream:
+        for transport in args.transports.split(","):
+            if transport == "stdio":
+                results.update(asyncio.run(
+                    run_transport(transport, "", upstream, args.clients, args.calls)
+                ))
+                continue
+            with http_server(transport) as endpoint:
+                results.update(asyncio.run(
+                    run_transport(transport, endpoint, upstream, args.clients, args.calls)
+                ))
+    sys.exit(finish("load", results, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: logging cost per call
+================================
+
+Measures what one log call costs the code that makes it, for each way the
+logging pipeline (utilities/logging_setup.py) can be configured. Records are
+written to a sink that takes --sink-us microseconds per write, standing in for
+a slow or contended stderr: the synchronous handler pays that on every call,
+the queued handler leaves it to the writer thread.
+
+Cases:
+    disabled       - a DEBUG call below the configured level
+    sync/text      - formatted and written by the caller
+    async/text     - queued, formatted and written in the background
+    async/json     - as above, JSON lines
+    async/repeated - the same call site past log_repeat_limit (suppressed)
+
+Usage:
+    poetry run python -m benchmarks.bench_logging [--calls 20000] [--sink-us 20]
+    poetry run python -m benchmarks.bench_logging --save baseline-logging.json
+    poetry run python -m benchmarks.bench_logging --baseline baseline-logging.json
+"""
+
+import argparse
+import io
+import logging
+import sys
+import time
+from typing import List
+
+from benchmarks.harness import Results, add_baseline_arguments, finish, summarize
+from utilities.logging_setup import build_handler
+
+_BATCH = 100  # Calls timed together; single calls are too short for the clock
+
+
+class SlowSink(io.StringIO):
+    """A stream whose writes block for a fixed time, like a pipe nobody is draining."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        return len(text)
+
+
+def measure(handler: logging.Handler, calls: int, level: int, repeated: bool) -> List[float]:
+    """Seconds per log call, one sample per batch of _BATCH calls."""
+    logger = logging.getLogger("benchmarks.logging")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    samples = []
+    for batch in range(calls // _BATCH):
+        start = time.perf_counter()
+        for i in range(_BATCH):
+            if repeated:
+                logger.log(level, "Upstream error: %s", "connection refused")
+            else:
+                logger.log(level, "Request %d finished in %.3f ms", batch * _BATCH + i, 1.25)
+        samples.append((time.perf_counter() - start) / _BATCH)
+    return samples
+
+
+def run(calls: int, sink_delay: float) -> Results:
+    cases = {
+        # name: (json, queued, repeat limit, level, repeated)
+        "disabled": (False, False, 0, logging.DEBUG, False),
+        "sync/text": (False, False, 0, logging.INFO, False),
+        "async/text": (False, True, 0, logging.INFO, False),
+        "async/json": (True, True, 0, logging.INFO, False),
+        "async/repeated": (False, True, 20, logging.WARNING, True),
+    }
+    results: Results = {}
+    for name, (json_format, queued, repeat_limit, level, repeated) in cases.items():
+        handler, listener = build_handler(
+            SlowSink(sink_delay),
+            json_format=json_format,
+            # Room for every record, so calls measure queueing, not dropping
+            queue_size=calls + 1 if queued else 0,
+            repeat_limit=repeat_limit,
+        )
+        if listener is not None:
+            listener.start()
+        start = time.perf_counter()
+        samples = measure(handler, calls, level, repeated)
+        elapsed = time.perf_counter() - start
+        if listener is not None:
+            listener.stop()
+        # Each sample stands for _BATCH calls
+        results[f"log/{name}"] = summarize(samples, elapsed / _BATCH)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20_000, help="Log calls per case")
+    parser.add_argument(
+        "--sink-us", type=float, default=20.0, help="Microseconds each write to the sink takes"
+    )
+    add_baseline_arguments(parser, gate=("p50_ms",))
+    args = parser.parse_args()
+
+    results = run(args.calls, args.sink_us / 1_000_000)
+    sys.exit(finish("logging", results, args))
+
+
+if __name__ == "__main__":
+    main()
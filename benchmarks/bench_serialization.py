@@ -0,0 +1,98 @@
+"""
+Benchmark: tool result serialization
+====================================
+
+Measures the cost of turning a tool's result into the JSON-RPC message sent
+to the client, by result size: the MCP SDK's default conversion ("sdk/...")
+against the fast path of utilities/serialization.py ("fast/..."). Each
+operation runs the server's tools/call handler in-process and encodes the
+response the way the transports do; the tool itself returns a prebuilt
+result, so only serialization is timed. Results are shaped like an
+http_request response with n items in its JSON body.
+
+Usage:
+    poetry run python -m benchmarks.bench_serialization [--sizes 10,1000,20000]
+    poetry run python -m benchmarks.bench_serialization --save baseline-serialization.json
+    poetry run python -m benchmarks.bench_serialization --baseline baseline-serialization.json
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Any, Awaitable, Callable, Dict
+
+from benchmarks.harness import Results, add_baseline_arguments, finish, time_async
+from utilities.serialization import serialize_tools
+
+
+def _result(items: int) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "data": {
+            "status_code": 200,
+            "headers": {"content-type": "application/json"},
+            "content": [
+                {"id": i, "name": f"item-{i}", "tags": ["a", "b"], "score": i / 3}
+                for i in range(items)
+            ],
+        },
+        "error": None,
+    }
+
+
+def _call(fast: bool, result: Dict[str, Any]) -> Callable[[], Awaitable[Any]]:
+    """A tools/call round through a fresh server whose only tool returns result."""
+    from mcp import types
+    from mcp.server.fastmcp import FastMCP
+
+    server = FastMCP("bench")
+    if fast:
+        serialize_tools(server)
+
+    @server.tool()
+    async def fetch() -> dict:
+        return result
+
+    handler = server._mcp_server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(
+        method="tools/call", params=types.CallToolRequestParams(name="fetch", arguments={})
+    )
+
+    async def call() -> Any:
+        response = await handler(request)
+        message = types.JSONRPCMessage(types.JSONRPCResponse(
+            jsonrpc="2.0",
+            id=1,
+            result=response.model_dump(by_alias=True, mode="json", exclude_none=True),
+        ))
+        return message.model_dump_json(by_alias=True, exclude_none=True)
+
+    return call
+
+
+async def run(sizes: list, seconds: float) -> Results:
+    results: Results = {}
+    for size in sizes:
+        result = _result(size)
+        for path in ("sdk", "fast"):
+            call = _call(path == "fast", result)
+            results[f"{path}/{size}"] = await time_async(call, min_seconds=seconds)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", default="10,1000,20000", help="Comma-separated item counts per result"
+    )
+    parser.add_argument("--seconds", type=float, default=0.5, help="Minimum time per case")
+    add_baseline_arguments(parser, gate=("throughput", "p50_ms"))
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = asyncio.run(run(sizes, args.seconds))
+    sys.exit(finish("serialization", results, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: text_analyzer engine
+===============================
+
+Compares the single-pass, chunked scanner in tools.text_tools against the
+original multi-pass implementation (split + replace + three counts + max/min
+over a full word list) for speed and peak memory, and shows how long the
+event loop is blocked while a large document is analyzed.
+
+The "mapped" rows scan the same document from a memory-mapped file (the
+path passed as analyze_text's source), and the "request" rows show what
+passing it inline costs before analysis starts: encoding and decoding the
+JSON-RPC message that carries it.
+
+Usage:
+    poetry run python -m benchmarks.bench_text_analyzer [--sizes 1,10,50]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import pydantic_core
+
+from tools.text_tools import analyze_file_stats, analyze_text_stats, text_analyzer
+
+_SAMPLE = (
+    "The quick brown fox jumps over the lazy dog. Pack my box with five dozen "
+    "liquor jugs! How vexingly quick daft zebras jump? "
+)
+
+
+def legacy_text_analyzer(text: str) -> Dict[str, Any]:
+    """The original multi-pass implementation, kept as the baseline."""
+    words = text.split()
+    characters = len(text)
+    characters_no_spaces = len(text.replace(" ", ""))
+    sentence_count = text.count(".") + text.count("!") + text.count("?")
+    if not text.strip():
+        sentence_count = 0
+    return {
+        "text_length": characters,
+        "characters_no_spaces": characters_no_spaces,
+        "word_count": len(words),
+        "sentence_count": sentence_count,
+        "average_word_length": round(characters_no_spaces / max(len(words), 1), 2),
+        "longest_word": max(words, key=len) if words else "",
+        "shortest_word": min(words, key=len) if words else ""
+    }
+
+
+def request_roundtrip(text: str) -> Dict[str, Any]:
+    """Encode and decode a tools/call message carrying the text inline."""
+    message = {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+               "params": {"name": "analyze_text", "arguments": {"text": text}}}
+    return pydantic_core.from_json(pydantic_core.to_json(message))
+
+
+def measure(fn: Callable[[str], Any], text: str) -> Dict[str, float]:
+    """Return wall time and peak traced allocation for one call."""
+    start = time.perf_counter()
+    fn(text)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_mb": peak / 1e6}
+
+
+async def max_loop_stall(text: str) -> float:
+    """Largest gap between event-loop ticks while text_analyzer runs."""
+    gaps: List[float] = []
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    await text_analyzer(text)
+    task.cancel()
+    return max(gaps) if gaps else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1,10,50", help="Comma-separated document sizes in MB")
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'impl':>8} {'seconds':>9} {'peak MB':>9}")
+    for size_mb in (int(size) for size in args.sizes.split(",")):
+        text = (_SAMPLE * (size_mb * 1_000_000 // len(_SAMPLE) + 1))[: size_mb * 1_000_000]
+        assert analyze_text_stats(text) == legacy_text_analyzer(text)
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as file:
+            file.write(text)
+        try:
+            assert analyze_file_stats(file.name) == analyze_text_stats(text)
+            for name, fn, argument in (
+                ("legacy", legacy_text_analyzer, text),
+                ("scanner", analyze_text_stats, text),
+                ("mapped", analyze_file_stats, file.name),
+                ("request", request_roundtrip, text),
+            ):
+                result = measure(fn, argument)
+                print(
+                    f"{size_mb:>6}MB {name:>8} {result['seconds']:>9.3f} {result['peak_mb']:>9.1f}"
+                )
+        finally:
+            os.unlink(file.name)
+        stall = asyncio.run(max_loop_stall(text))
+        print(f"{size_mb:>6}MB max event-loop stall during text_analyzer: {stall * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: tool microbenchmarks
+===============================
+
+Times every function in tools/ in-process across input sizes. HTTP tools run
+against an in-memory stand-in upstream (httpx.MockTransport), so network
+noise does not enter the numbers.
+
+Usage:
+    poetry run python -m benchmarks.bench_tools [--filter text] [--seconds 0.5]
+    poetry run python -m benchmarks.bench_tools --save baseline-tools.json
+    poetry run python -m benchmarks.bench_tools --baseline baseline-tools.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.harness import Results, add_baseline_arguments, finish, time_async
+from tools.calculator_tools import calculate_batch, calculate_operation, evaluate_expression
+from tools.http_tools import fetch_api_data, fetch_many, response_cache
+from tools.text_tools import batch_text_analyzer, shutdown_process_pool, text_analyzer
+from tools.weather_tools import get_weather_data, weather_cache
+from utilities.http_client import http_pool
+
+Case = Tuple[str, Callable[[], Awaitable[Any]]]
+
+_SAMPLE = (
+    "The quick brown fox jumps over the lazy dog. Pack my box with five dozen "
+    "liquor jugs! How vexingly quick daft zebras jump? "
+)
+
+
+def _text(size: int) -> str:
+    return (_SAMPLE * (size // len(_SAMPLE) + 1))[:size]
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    """Stand-in upstream: /json/<n> returns a JSON array of n items."""
+    count = int(request.url.path.rsplit("/", 1)[-1])
+    body = json.dumps([{"id": i, "name": f"item-{i}"} for i in range(count)])
+    return httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+
+def build_cases() -> List[Case]:
+    """All benchmark cases, named <tool>/<input size>."""
+    cases: List[Case] = [("calculator/scalar", lambda: calculate_operation("multiply", 6, 7))]
+
+    for size in (1_000, 100_000):
+        values = [float(i) for i in range(size)]
+        cases.append((f"calculator_batch/{size}", lambda v=values: calculate_batch("add", v, v)))
+
+    for size in (100, 10_000):
+        bindings = [{"a": i, "b": i + 1, "c": 2} for i in range(size)]
+        cases.append((
+            f"evaluate/{size}",
+            lambda b=bindings: evaluate_expression("(a + b) * c - a / b", b),
+        ))
+
+    # The analysis itself, bypassing the memo cache, and a repeated call served from it
+    for size in (1_000, 100_000, 2_000_000):
+        text = _text(size)
+        cases.append((f"analyze_text/{size}", lambda t=text: text_analyzer.__wrapped__(t)))
+    text = _text(100_000)
+    cases.append(("analyze_text/memo_hit/100000", lambda: text_analyzer(text)))
+
+    for documents, size in ((100, 1_000), (200, 20_000)):
+        texts = [_text(size)] * documents
+        cases.append((f"analyze_texts/{documents}x{size}", lambda t=texts: batch_text_analyzer(t)))
+
+    cases.append(("get_weather/cached", lambda: get_weather_data("London")))
+
+    async def weather_miss() -> Dict[str, Any]:
+        weather_cache.clear()
+        return await get_weather_data("London")
+
+    cases.append(("get_weather/miss", weather_miss))
+
+    for count in (10, 1_000):
+        url = f"http://upstream.local/json/{count}"
+        cases.append((f"http_request/{count}", lambda u=url: fetch_api_data(u)))
+
+    for count in (10, 50):
+        requests = [{"url": f"http://upstream.local/json/{i}"} for i in range(count)]
+        cases.append((f"http_batch_request/{count}", lambda r=requests: fetch_many(r)))
+
+    return cases
+
+
+async def run(name_filter: str, seconds: float) -> Results:
+    http_pool.configure(transport=httpx.MockTransport(_upstream))
+    response_cache.clear()
+    results: Results = {}
+    try:
+        for name, operation in build_cases():
+            if name_filter in name:
+                results[name] = await time_async(operation, min_seconds=seconds)
+    finally:
+        await http_pool.close()
+        http_pool.configure(transport=None)
+        shutdown_process_pool()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--seconds", type=float, default=0.5, help="Minimum time per case")
+    add_baseline_arguments(parser, gate=("throughput", "p50_ms"))
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.filter, args.seconds))
+    sys.exit(finish("tools", results, args))
+
+
+if __name__ == "__main__":
+    main()
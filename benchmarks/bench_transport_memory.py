@@ -0,0 +1,126 @@
+"""
+Benchmark: per-session server memory by transport
+==================================================
+
+Starts the server in HTTP mode with each transport, opens N concurrent
+client sessions that each make one tool call and then stay idle, and reports
+the growth of the server's resident memory and open file descriptors per
+session.
+
+SSE keeps a long-lived stream plus per-session state for every connected
+client; stateless streamable HTTP keeps nothing once a request completes.
+
+Linux only (reads /proc). Usage:
+    poetry run python -m benchmarks.bench_transport_memory [--sessions 200]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from typing import Dict
+
+import httpx
+
+_PORT = 8931
+
+
+def _rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _open_fds(pid: int) -> int:
+    return len(os.listdir(f"/proc/{pid}/fd"))
+
+
+def _start_server(transport: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "MCP_SERVER_HOST": "127.0.0.1",
+        "MCP_SERVER_PORT": str(_PORT),
+        "HTTP_WORKERS": "1",
+        "LOG_LEVEL": "WARNING",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "mcp_server.py", "--transport", transport],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{_PORT}/", timeout=0.5)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Server did not start for transport {transport}")
+
+
+async def _open_sessions(transport: str, sessions: int, stack: AsyncExitStack) -> None:
+    from mcp import ClientSession
+
+    async def one() -> None:
+        if transport == "sse":
+            from mcp.client.sse import sse_client
+            read, write = await stack.enter_async_context(sse_client(f"http://127.0.0.1:{_PORT}/sse"))
+        else:
+            from mcp.client.streamable_http import streamablehttp_client
+            read, write, _ = await stack.enter_async_context(
+                streamablehttp_client(f"http://127.0.0.1:{_PORT}/mcp")
+            )
+        session = await stack.enter_async_context(ClientSession(read, write))
+        await session.initialize()
+        await session.call_tool("calculator", {"operation": "add", "a": 1, "b": 2})
+
+    # Sessions are opened sequentially: the exit stack is not task-safe
+    for _ in range(sessions):
+        await one()
+
+
+async def measure(transport: str, sessions: int) -> Dict[str, float]:
+    """Per-session RSS and file-descriptor growth for one transport."""
+    process = _start_server(transport)
+    try:
+        async with AsyncExitStack() as warmup:
+            await _open_sessions(transport, 5, warmup)
+        await asyncio.sleep(0.5)
+        base_rss, base_fds = _rss_kb(process.pid), _open_fds(process.pid)
+
+        async with AsyncExitStack() as stack:
+            await _open_sessions(transport, sessions, stack)
+            await asyncio.sleep(0.5)
+            rss, fds = _rss_kb(process.pid), _open_fds(process.pid)
+
+        return {
+            "rss_kb_per_session": (rss - base_rss) / sessions,
+            "fds_per_session": (fds - base_fds) / sessions,
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'transport':>16} {'RSS KB/session':>15} {'fds/session':>12}")
+    for transport in ("sse", "streamable-http"):
+        result = asyncio.run(measure(transport, args.sessions))
+        print(
+            f"{transport:>16} {result['rss_kb_per_session']:>15.1f} {result['fds_per_session']:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark harness
+=================
+
+Shared helpers for the benchmark suite: timing loops, latency summaries
+(throughput, p50/p95/p99), JSON baselines and the regression gate.
+
+Every suite produces a mapping of case name -> summary. ``--save`` writes it
+as a baseline, ``--baseline`` compares a run against one and exits non-zero
+when any case regressed by more than ``--tolerance``. Baselines are machine
+specific: record them on the machine (or CI runner) that will check them.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+Summary = Dict[str, float]
+Results = Dict[str, Summary]
+
+# Metrics the regression gate can check and whether larger values are better
+HIGHER_IS_BETTER = {"throughput": True, "p50_ms": False, "p95_ms": False, "p99_ms": False}
+
+
+def summarize(latencies: List[float], elapsed: float) -> Summary:
+    """
+    Summarize per-operation latencies.
+
+    Args:
+        latencies: Seconds taken by each operation
+        elapsed: Wall time of the whole run, used for throughput (operations
+            may overlap, so this is not the sum of latencies)
+
+    Returns:
+        Count, throughput (ops/s) and mean/p50/p95/p99/max latency in ms
+    """
+    ordered = sorted(latencies)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ordered[0] if ordered else 0.0
+    return {
+        "count": len(ordered),
+        "throughput": len(ordered) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+async def time_async(
+    operation: Callable[[], Awaitable[Any]],
+    min_seconds: float = 0.5,
+    max_iterations: int = 10_000,
+    warmup: int = 3,
+) -> Summary:
+    """
+    Call an async operation repeatedly and summarize its latency.
+
+    Runs at least once and stops after min_seconds or max_iterations,
+    whichever comes first.
+    """
+    for _ in range(warmup):
+        await operation()
+    latencies: List[float] = []
+    start = time.perf_counter()
+    while True:
+        call_start = time.perf_counter()
+        await operation()
+        latencies.append(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or len(latencies) >= max_iterations:
+            return summarize(latencies, elapsed)
+
+
+def print_results(results: Results) -> None:
+    """Print a results table."""
+    width = max((len(name) for name in results), default=4)
+    print(
+        f"{'case':<{width}} {'count':>7} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for name, s in results.items():
+        print(
+            f"{name:<{width}} {s['count']:>7} {s['throughput']:>10.1f} "
+            f"{s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f} {s['p99_ms']:>9.3f}"
+        )
+
+
+def compare(
+    current: Results, baseline: Results, tolerance: float, metrics: Sequence[str]
+) -> List[str]:
+    """
+    Find cases that regressed against a baseline.
+
+    A throughput drop or a latency increase larger than tolerance (a
+    fraction, e.g. 0.2 = 20%) in any of the given metrics is a regression.
+    Cases missing from either side are ignored.
+
+    Returns:
+        One message per regressed metric
+    """
+    regressions = []
+    for name, summary in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in metrics:
+            higher_is_better = HIGHER_IS_BETTER[metric]
+            old, new = reference.get(metric), summary.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name} {metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+    return regressions
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser, gate: Sequence[str]) -> None:
+    """
+    Add the --save / --baseline / --tolerance / --gate options to a suite's parser.
+
+    Args:
+        parser: The suite's argument parser
+        gate: Metrics checked by default; tail latencies of short
+            microbenchmarks are too noisy to gate on
+    """
+    parser.add_argument("--save", metavar="PATH", help="Write the results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a JSON baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed relative regression before failing (default 0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--gate", default=",".join(gate),
+        help=f"Comma-separated metrics to check, from {', '.join(HIGHER_IS_BETTER)}",
+    )
+
+
+def finish(suite: str, results: Results, args: argparse.Namespace) -> int:
+    """
+    Print results, then save and/or check them as requested.
+
+    Returns:
+        Process exit code: 1 if the baseline check found regressions, else 0
+    """
+    print_results(results)
+
+    if args.save:
+        document = {
+            "suite": suite,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        with open(args.save, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline: Dict[str, Any] = json.load(f)
+        if baseline.get("suite") != suite:
+            print(f"\nBaseline {args.baseline} is for suite {baseline.get('suite')!r}",
+                  file=sys.stderr)
+            return 1
+        metrics = [metric.strip() for metric in args.gate.split(",") if metric.strip()]
+        regressions = compare(results, baseline["results"], args.tolerance, metrics)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:",
+                  file=sys.stderr)
+            for message in regressions:
+                print(f"  {message}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
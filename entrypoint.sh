@@ -5,5 +5,5 @@ set -e
 
 echo "Starting MCP Skeleton Server..."
 
-# Run the MCP server (host/port are set via env vars and monkey-patched in mcp_server.py)
+# Run the MCP server (host, port, workers and other uvicorn settings come from env vars)
 exec python mcp_server.py --http
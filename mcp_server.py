@@ -31,36 +31,71 @@ TRANSPORT MODES:
 ----------------
 - stdio: Direct MCP client integration (Cursor, VS Code, Claude Desktop)
 - HTTP/SSE: Production deployments (Docker, Kubernetes, AKS, cloud)
+- Streamable HTTP (stateless): Horizontally scaled deployments where any
+  replica may serve any request (--transport streamable-http)
 """
 
-from fastmcp import FastMCP
+import argparse
 import logging
+import os
 import sys
+from typing import List, Optional, Union
+
+from mcp.server.fastmcp import FastMCP
 
 from utilities.config import settings
+from utilities.base_tools import render_memo_metrics
+from utilities.admission import admit_tools
+from utilities.batch import batch_tools, run_batch
+from utilities.deadlines import deadline_tools
+from utilities.http_server import build_http_app, serve_http
+from utilities.lazy import lazy_callable
+from utilities.lifecycle import server_lifespan
+from utilities.logging_setup import configure_logging, log_tools
+from utilities.metrics import instrument_tools, tool_metrics
+from utilities.profiling import profile_tools
+from utilities.serialization import serialize_tools
 
 # ============================================================================
 # Example Tool Imports (⚠️ REPLACE WITH YOUR OWN)
 # ============================================================================
-# These are DEMONSTRATION tools only. Delete or replace with your business logic:
-from tools.weather_tools import get_weather_data      # Example: API integration pattern
-from tools.calculator_tools import calculate_operation  # Example: Simple async function
-from tools.http_tools import fetch_api_data           # Example: HTTP client usage
-from tools.text_tools import text_analyzer            # Example: Data processing
-
-# ✅ Import YOUR tools here instead:
-# from tools.database_tools import query_database, insert_record
-# from tools.ml_tools import run_inference, get_embeddings
-# from tools.business_logic_tools import validate_order, calculate_price
-# from tools.api_integration_tools import fetch_external_data
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# These are DEMONSTRATION tools only. Delete or replace with your business logic.
+#
+# Tools are imported on first call (lazy_callable), not at startup: the schemas
+# MCP clients see come from the wrapper signatures below, so a stdio session
+# only imports the tool modules it calls (and numpy or the disk cache with them).
+get_weather_data = lazy_callable("tools.weather_tools:get_weather_data")  # Example: API integration pattern
+calculate_operation = lazy_callable("tools.calculator_tools:calculate_operation")  # Example: Simple async function
+calculate_batch = lazy_callable("tools.calculator_tools:calculate_batch")
+evaluate_expression = lazy_callable("tools.calculator_tools:evaluate_expression")
+fetch_api_data = lazy_callable("tools.http_tools:fetch_api_data")  # Example: HTTP client usage
+fetch_many = lazy_callable("tools.http_tools:fetch_many")
+get_http_pool_stats = lazy_callable("tools.http_tools:get_http_pool_stats")
+text_analyzer = lazy_callable("tools.text_tools:text_analyzer")  # Example: Data processing
+file_text_analyzer = lazy_callable("tools.text_tools:file_text_analyzer")
+batch_text_analyzer = lazy_callable("tools.text_tools:batch_text_analyzer")
+
+# ✅ Declare YOUR tools here instead:
+# query_database = lazy_callable("tools.database_tools:query_database")
+# run_inference = lazy_callable("tools.ml_tools:run_inference")
+# validate_order = lazy_callable("tools.business_logic_tools:validate_order")
+# fetch_external_data = lazy_callable("tools.api_integration_tools:fetch_external_data")
+
+# Configure logging (queued, structured and rate limited - see utilities/logging_setup.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Shared resources: started once on startup, released on shutdown. Resources
+# of tool modules that were never imported have nothing to release.
+if settings.weather_prewarm_cities:
+    server_lifespan.on_startup(lazy_callable("tools.weather_tools:prewarm_weather_cache"))
+server_lifespan.on_shutdown(
+    lazy_callable("utilities.http_client:http_pool.close", only_if_imported=True)
+)
+server_lifespan.on_shutdown(  # Started lazily by analyze_texts
+    lazy_callable("tools.text_tools:shutdown_process_pool", only_if_imported=True)
+)
+
 # Initialize MCP server
 # Update the 'instructions' below to describe YOUR tools, not the examples
 mcp = FastMCP(
@@ -68,9 +103,30 @@ mcp = FastMCP(
     instructions=(
         "MCP Skeleton - Template server with example tools (calculator, weather, HTTP, text). "
         "⚠️ REPLACE THIS: Update this description to explain YOUR actual tools and capabilities."
-    )
+    ),
+    lifespan=server_lifespan,
 )
 
+# Wrap every tool registered below (last installed runs outermost): metrics
+# see every call including queue time, log records are tagged with the tool
+# call they belong to, deadlines bound queueing and execution and cancel calls
+# of disconnected clients, admission control enforces the concurrency limits,
+# the profiler samples or watches the tool itself, and results are encoded on
+# the serialization fast path. batch_tools comes first to record each tool
+# exactly as registered, for the batch tool
+batch_tools(mcp)
+serialize_tools(mcp)
+profile_tools(mcp)
+admit_tools(mcp)
+deadline_tools(mcp)
+log_tools(mcp)
+instrument_tools(mcp)
+tool_metrics.add_collector(render_memo_metrics)  # Hit/miss counts of @memoize'd functions
+if settings.disk_cache_enabled:  # Counters exist once a tool module has opened the cache
+    tool_metrics.add_collector(
+        lazy_callable("utilities.disk_cache:disk_cache.render", only_if_imported=True)
+    )
+
 
 # ============================================================================
 # MCP Tool Registrations
@@ -129,6 +185,50 @@ async def calculator(operation: str, a: float, b: float) -> dict:
     return await calculate_operation(operation, a, b)
 
 
+@mcp.tool()
+async def calculator_batch(
+    operation: str, a: Union[float, list[float]], b: Union[float, list[float]]
+) -> dict:
+    """
+    [EXAMPLE TOOL] Perform a mathematical operation over arrays of numbers.
+    
+    ⚠️ This is a demonstration tool showing vectorized batch processing.
+    Replace with your actual business logic.
+    
+    Args:
+        operation: Type of operation - 'add', 'subtract', 'multiply', or 'divide'
+        a: First operand - a number or a list of numbers
+        b: Second operand - a number or a list of numbers (a single number is
+           applied to every element of the other list)
+        
+    Returns:
+        Element-wise results in input order; elements that fail (e.g. division
+        by zero) are null in results and listed in errors
+    """
+    return await calculate_batch(operation, a, b)
+
+
+@mcp.tool()
+async def evaluate(expression: str, bindings: list[dict[str, float]]) -> dict:
+    """
+    [EXAMPLE TOOL] Evaluate an arithmetic formula for many sets of variables.
+    
+    ⚠️ This is a demonstration tool showing compile-once, evaluate-many processing.
+    Replace with your actual business logic.
+    
+    Args:
+        expression: Formula using numbers, variable names, parentheses and + - * /,
+                    e.g. "(price - cost) / price"
+        bindings: Variable values to evaluate the formula with, one dict per evaluation,
+                  e.g. [{"price": 10, "cost": 7}, {"price": 8, "cost": 8}]
+        
+    Returns:
+        One result per binding in input order; failed evaluations are null in
+        results and listed in errors
+    """
+    return await evaluate_expression(expression, bindings)
+
+
 # ❌ Example Tool 3: HTTP Request (DEMO - replace with your tool)
 @mcp.tool()
 async def http_request(url: str, method: str = "GET") -> dict:
@@ -143,14 +243,52 @@ async def http_request(url: str, method: str = "GET") -> dict:
         method: HTTP method (GET or POST), defaults to GET
         
     Returns:
-        Response data from the API including status code and content
+        Response data from the API including status code and content.
+        Bodies larger than HTTP_MAX_RESPONSE_BYTES are cut short and flagged
+        with truncated=True.
     """
     return await fetch_api_data(url, method)
 
 
+@mcp.tool()
+async def http_batch_request(
+    requests: list[dict],
+    max_concurrency: Optional[int] = None,
+    max_per_host: Optional[int] = None,
+) -> dict:
+    """
+    [EXAMPLE TOOL] Fetch many URLs concurrently in a single call.
+    
+    ⚠️ This is a demonstration tool showing bounded concurrent fan-out.
+    Replace with your actual API integration logic.
+    
+    Args:
+        requests: List of request specs, each {"url": ..., "method": "GET" | "POST"}
+        max_concurrency: Optional cap on requests in flight at once
+        max_per_host: Optional cap on requests in flight against any one host
+        
+    Returns:
+        Results in the same order as the requests; failed items carry an "error" key
+    """
+    return await fetch_many(requests, max_concurrency, max_per_host)
+
+
+@mcp.tool()
+async def http_pool_stats() -> dict:
+    """
+    [EXAMPLE TOOL] Report usage of the shared HTTP connection pool.
+    
+    Use this to size the HTTP_MAX_CONNECTIONS / HTTP_MAX_CONNECTIONS_PER_HOST settings.
+    
+    Returns:
+        Connections in use, idle connections, waiting requests and configured limits
+    """
+    return await get_http_pool_stats()
+
+
 # ❌ Example Tool 4: Text Analysis (DEMO - replace with your tool)
 @mcp.tool()
-async def analyze_text(text: str) -> dict:
+async def analyze_text(text: Optional[str] = None, source: Optional[str] = None) -> dict:
     """
     [EXAMPLE TOOL] Analyze text and return various statistics.
     
@@ -159,14 +297,42 @@ async def analyze_text(text: str) -> dict:
     
     Args:
         text: The text to analyze
+        source: Instead of text, a file path or file:// URI on the server
+            (under TEXT_FILE_ROOTS); use this for large documents
         
     Returns:
         Text statistics including word count, character count, sentence count,
         average word length, and longest/shortest words
     """
+    if (text is None) == (source is None):
+        raise ValueError("Pass either text or source")
+    if source is not None:
+        return await file_text_analyzer(source)
     return await text_analyzer(text)
 
 
+@mcp.tool()
+async def analyze_texts(
+    texts: Optional[list[str]] = None, sources: Optional[list[str]] = None
+) -> dict:
+    """
+    [EXAMPLE TOOL] Analyze many documents in one call.
+    
+    ⚠️ This is a demonstration tool showing CPU-bound batch processing.
+    Replace with your actual data processing logic.
+    
+    Args:
+        texts: The documents to analyze
+        sources: Documents given as file paths or file:// URIs on the server
+            (under TEXT_FILE_ROOTS), analyzed after the texts
+        
+    Returns:
+        Per-document statistics (same fields as analyze_text, in input order)
+        plus corpus-wide totals
+    """
+    return await batch_text_analyzer(texts, sources)
+
+
 # ============================================================================
 # ✅ Add YOUR Tool Registrations Here
 # ============================================================================
@@ -189,39 +355,106 @@ async def analyze_text(text: str) -> dict:
 # ============================================================================
 
 
+# ============================================================================
+# Server Tools (keep these when replacing the examples)
+# ============================================================================
+
+@mcp.tool()
+async def batch(calls: list[dict], max_concurrency: Optional[int] = None) -> dict:
+    """
+    Run several tool calls in one round trip.
+    
+    Calls run concurrently unless one uses another's result: an argument
+    written as {"$ref": "<id>.<path>"} is replaced by that part of the
+    referenced call's result (e.g. {"$ref": "total.result"}), and the call
+    waits for it. A call whose reference failed is not run.
+    
+    Args:
+        calls: List of calls, each {"id": ..., "tool": ..., "args": {...}};
+            id defaults to the call's position and is needed only to reference it
+        max_concurrency: Optional cap on calls running at once
+        
+    Returns:
+        Per-call id, success, result or error, started_ms and duration_ms in
+        input order, plus succeeded/failed counts and the total duration_ms
+    """
+    return await run_batch(mcp, calls, max_concurrency)
+
+
 # ============================================================================
 # Server Entry Point
 # ============================================================================
 
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
+
+def create_http_app():
+    """
+    ASGI app factory for HTTP mode.
+    
+    uvicorn calls this once per worker process (imported by name when
+    HTTP_WORKERS > 1), so each worker builds its own app around this module's
+    tool registrations.
+    """
+    # Long-running servers open the shared HTTP client up front, so the first
+    # http_request does not pay for it (stdio sessions create it on first use)
+    server_lifespan.on_startup(lazy_callable("utilities.http_client:http_pool.start"))
+    if settings.mcp_transport == "streamable-http":
+        # Stateless: every request is self-contained, so any worker or replica can serve it
+        mcp.settings.stateless_http = settings.http_stateless
+        mcp.settings.json_response = settings.http_json_response
+        app = mcp.streamable_http_app()
+        return build_http_app(app, server_lifespan, transport_lifespan=mcp.session_manager.run)
+    return build_http_app(mcp.sse_app(), server_lifespan, session_affinity=True)
+
+
+def parse_transport(argv: List[str]) -> str:
+    """
+    Select the transport from the command line.
+    
+    --transport {stdio,sse,streamable-http} wins; --http is kept as a shortcut
+    for sse; otherwise MCP_TRANSPORT from the environment is used.
+    """
+    parser = argparse.ArgumentParser(description=settings.server_name)
+    parser.add_argument("--transport", choices=TRANSPORTS, default=None)
+    parser.add_argument("--http", action="store_true", help="Shortcut for --transport sse")
+    args, _ = parser.parse_known_args(argv)
+    if args.transport:
+        return args.transport
+    if args.http:
+        return "sse"
+    return settings.mcp_transport
+
+
 def main() -> None:
     """Main entry point for the MCP server."""
-    logger.info(f"Starting {settings.server_name} v{settings.server_version}...")
-    logger.info(f"Log level: {settings.log_level}")
+    logger.info("Starting %s v%s...", settings.server_name, settings.server_version)
+    logger.info("Log level: %s", settings.log_level)
     
-    # Support both stdio and HTTP transports
-    # Use HTTP if --http flag is provided, otherwise use stdio
-    transport = "sse" if "--http" in sys.argv else "stdio"
+    # Support stdio, HTTP/SSE and stateless streamable-HTTP transports
+    transport = parse_transport(sys.argv[1:])
     
-    if transport == "sse":
-        logger.info(f"Running in HTTP mode on http://{settings.mcp_server_host}:{settings.mcp_server_port}")
-        logger.info(f"MCP endpoint: http://{settings.mcp_server_host}:{settings.mcp_server_port}/sse")
-        
-        # Monkey patch uvicorn.Config to force host/port binding
-        import uvicorn
-        original_config_init = uvicorn.Config.__init__
-        
-        def patched_config_init(self, *args, **kwargs):
-            # Force host and port regardless of what was passed
-            kwargs['host'] = settings.mcp_server_host
-            kwargs['port'] = settings.mcp_server_port
-            return original_config_init(self, *args, **kwargs)
-        
-        uvicorn.Config.__init__ = patched_config_init
-        
-        mcp.run(transport=transport)
-    else:
+    if transport == "stdio":
         logger.info("Running in stdio mode (for direct MCP client integration)")
         mcp.run(transport=transport)
+        return
+    
+    # Worker processes re-read the transport from the environment
+    settings.mcp_transport = transport
+    os.environ["MCP_TRANSPORT"] = transport
+    endpoint = "/sse" if transport == "sse" else mcp.settings.streamable_http_path
+    
+    base_url = f"http://{settings.mcp_server_host}:{settings.mcp_server_port}"
+    logger.info("Running in HTTP mode (%s) on %s", transport, base_url)
+    logger.info("MCP endpoint: %s%s", base_url, endpoint)
+    logger.info("Workers: %s", settings.http_workers)
+    if transport == "streamable-http" and not settings.http_stateless and settings.http_workers > 1:
+        logger.warning("Stateful streamable-http sessions are not shared between workers; "
+                       "set HTTP_STATELESS=true or HTTP_WORKERS=1")
+    
+    # uvicorn is configured from Settings (host, port, workers, backlog,
+    # keep-alive timeout, concurrency limit) - see utilities/http_server.py
+    serve_http(create_http_app)
 
 
 if __name__ == "__main__":
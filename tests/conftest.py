@@ -7,6 +7,8 @@ Add your custom fixtures here.
 """
 
 import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.types import ProgressNotification
 
 
 @pytest.fixture
@@ -21,6 +23,30 @@ def sample_numbers():
     return {"a": 10, "b": 5}
 
 
+@pytest.fixture
+def call_with_progress():
+    """Fixture calling a tool in-process as a client asking for progress."""
+
+    async def call(mcp, tool, arguments):
+        """Returns the tool result and the progress notifications received before it."""
+        received = []
+
+        async def on_message(message):
+            if isinstance(getattr(message, "root", None), ProgressNotification):
+                received.append(message.root.params)
+
+        async def on_progress(progress, total, message):
+            pass  # Passing a callback makes the client send a progressToken
+
+        async with create_connected_server_and_client_session(
+            mcp, message_handler=on_message
+        ) as client:
+            result = await client.call_tool(tool, arguments, progress_callback=on_progress)
+        return result, received
+
+    return call
+
+
 # Add more fixtures as needed for your tests
 # Example:
 # @pytest.fixture
@@ -0,0 +1,122 @@
+"""
+Tests for Admission Control
+===========================
+
+Shows how concurrency limits queue and reject tool calls under load.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from utilities.admission import AdmissionController, ConcurrencyLimiter, Overloaded, parse_limits
+
+
+def _slow_tool(release: asyncio.Event):
+    async def analyze(text: str) -> dict:
+        await release.wait()
+        return {"length": len(text)}
+    return analyze
+
+
+@pytest.mark.asyncio
+async def test_calls_over_queue_size_rejected_immediately():
+    """Test a full queue rejects new calls with a structured overload error."""
+    controller = AdmissionController(tool_limits={"analyze": 1}, queue_size=1, queue_timeout=5)
+    release = asyncio.Event()
+    tool = controller.wrap("analyze", _slow_tool(release))
+
+    running = asyncio.create_task(tool("a"))
+    queued = asyncio.create_task(tool("b"))
+    await asyncio.sleep(0)
+
+    rejected = await tool("c")
+    assert rejected["success"] is False
+    assert "Server overloaded" in rejected["error"]
+    assert rejected["data"]["reason"] == "queue_full"
+    assert controller.stats()["analyze"]["queued"] == 1
+
+    release.set()
+    assert await running == {"length": 1}
+    assert await queued == {"length": 1}
+    stats = controller.stats()["analyze"]
+    assert stats["active"] == 0
+    assert stats["rejected"] == {"queue_full": 1, "queue_timeout": 0}
+
+
+@pytest.mark.asyncio
+async def test_queued_call_times_out():
+    """Test a queued call gives up after the queue timeout."""
+    controller = AdmissionController(max_concurrent=1, queue_size=10, queue_timeout=0.05)
+    release = asyncio.Event()
+    tool = controller.wrap("analyze", _slow_tool(release))
+
+    running = asyncio.create_task(tool("a"))
+    await asyncio.sleep(0)
+    rejected = await tool("b")
+    assert rejected["data"] == {
+        "tool": "analyze", "scope": "global", "reason": "queue_timeout",
+        "limit": 1, "queue_depth": 0,
+    }
+
+    release.set()
+    await running
+    assert "mcp_admission_rejected_total" in controller.render()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("release_after", [0.04, 0.06])
+async def test_slot_freed_as_the_queue_timeout_fires_is_not_lost(release_after):
+    """Test a slot granted in the same loop iteration as the timeout is kept or given back."""
+    limiter = ConcurrencyLimiter("analyze", 1, queue_size=1, queue_timeout=0.05)
+    await limiter.acquire()
+    asyncio.get_running_loop().call_later(release_after, limiter.release)
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    time.sleep(0.1)  # Blocks the loop: the release and the timeout become due together
+
+    try:
+        await waiter
+    except Overloaded:
+        pass
+    else:
+        limiter.release()
+    assert limiter.active == 0 and limiter.waiting == 0
+    await asyncio.wait_for(limiter.acquire(), 0.01)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_keep_a_granted_slot():
+    """Test cancelling a queued call right after its slot was granted gives the slot back."""
+    limiter = ConcurrencyLimiter("analyze", 1, queue_size=1, queue_timeout=5)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    limiter.release()
+    waiter.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.active == 0
+    await asyncio.wait_for(limiter.acquire(), 0.01)
+
+
+@pytest.mark.asyncio
+async def test_unlimited_tools_are_not_wrapped():
+    """Test tools without any configured limit run untouched."""
+    controller = AdmissionController(tool_limits={"other": 2})
+
+    async def quick() -> dict:
+        return {}
+
+    assert controller.wrap("quick", quick) is quick
+
+
+def test_parse_limits():
+    """Test the tool=N,tool=N format."""
+    assert parse_limits("analyze_text=4, http_request=32,") == {
+        "analyze_text": 4, "http_request": 32,
+    }
+    with pytest.raises(ValueError):
+        parse_limits("analyze_text=0")
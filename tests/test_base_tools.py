@@ -0,0 +1,179 @@
+"""
+Tests for Base Tools Memoization
+================================
+
+Shows how tools report progress to clients, and how @memoize keys, bounds
+and expires cached tool results.
+"""
+
+import asyncio
+import inspect
+import json
+import time
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from utilities.base_tools import BaseTools, memo_caches, memo_key, memoize, render_memo_metrics
+from utilities.config import settings
+
+
+@pytest.mark.asyncio
+async def test_progress_reported_with_partial_results(monkeypatch, call_with_progress):
+    """Test reports reach the client before the result, nested operations stay silent."""
+    monkeypatch.setattr(settings, "progress_min_interval", 0.0)
+    tools = BaseTools("test")
+    mcp = FastMCP("test")
+
+    @mcp.tool()
+    async def count(n: int) -> dict:
+        async with tools.progress(total=n) as progress:
+            for i in range(1, n + 1):
+                async with tools.progress() as nested:
+                    assert not nested.active
+                progress.report(i, message=f"{i} of {n}", partial={"counted": i})
+        return {"counted": n}
+
+    result, received = await call_with_progress(mcp, "count", {"n": 3})
+    assert not result.isError
+    assert [(p.progress, p.total, p.message) for p in received] == [
+        (1, 3, "1 of 3"), (2, 3, "2 of 3"), (3, 3, "3 of 3")
+    ]
+    assert received[-1].meta.partial == {"counted": 3}
+
+
+@pytest.mark.asyncio
+async def test_progress_rate_limited_and_inactive_outside_requests(monkeypatch, call_with_progress):
+    """Test reports closer than the minimum interval are dropped."""
+    monkeypatch.setattr(settings, "progress_min_interval", 60.0)
+    tools = BaseTools("test")
+    mcp = FastMCP("test")
+
+    @mcp.tool()
+    async def busy() -> dict:
+        async with tools.progress() as progress:
+            return {"active": progress.active, "sent": [progress.report(i) for i in range(3)]}
+
+    result, received = await call_with_progress(mcp, "busy", {})
+    assert json.loads(result.content[0].text) == {"active": True, "sent": [False] * 3}
+    assert received == []
+
+    async with tools.progress() as progress:
+        assert not progress.active
+
+
+@pytest.mark.asyncio
+async def test_repeated_calls_served_from_cache():
+    """Test equal arguments hit the cache however they are spelled."""
+    calls = []
+
+    @memoize
+    async def scale(value: float, factor: float = 2.0) -> dict:
+        calls.append(value)
+        return {"value": value * factor}
+
+    assert await scale(3) == {"value": 6.0}
+    assert await scale(3, 2.0) == {"value": 6.0}
+    assert await scale(value=3, factor=2.0) == {"value": 6.0}
+    assert await scale(4) == {"value": 8.0}
+    assert calls == [3, 4]
+    assert scale.cache.stats()["hits"] == 2
+    assert scale.cache.stats()["misses"] == 2
+    assert 'mcp_memo_hits_total{function="scale"} 2' in render_memo_metrics()
+    del memo_caches["scale"]
+
+
+@pytest.mark.asyncio
+async def test_hits_return_copies_and_errors_are_not_cached():
+    """Test callers cannot corrupt cached results and failures are retried."""
+    attempts = []
+
+    @memoize
+    async def lookup(key: str) -> dict:
+        attempts.append(key)
+        if len(attempts) == 1:
+            raise ValueError("upstream down")
+        return {"key": key, "tags": []}
+
+    with pytest.raises(ValueError):
+        await lookup("a")
+    first = await lookup("a")
+    first["tags"].append("mutated")
+    assert await lookup("a") == {"key": "a", "tags": []}
+    assert len(attempts) == 2
+    del memo_caches["lookup"]
+
+
+@pytest.mark.asyncio
+async def test_eviction_by_total_bytes_and_ttl(monkeypatch):
+    """Test least recently used entries are evicted by size and expired by TTL."""
+
+    @memoize(max_bytes=200, ttl=60)
+    async def pad(n: int) -> dict:
+        return {"padding": "x" * n}
+
+    await pad(50)
+    await pad(60)
+    await pad(50)  # Most recently used
+    await pad(70)  # Over 200 bytes: evicts pad(60)
+    assert pad.cache.stats()["evictions"] == 1
+    assert pad.cache.size <= 200
+
+    hits = pad.cache.hits
+    await pad(50)
+    assert pad.cache.hits == hits + 1
+    monkeypatch.setattr("utilities.base_tools.time.monotonic", lambda: 10**9)
+    await pad(50)  # Expired
+    assert pad.cache.hits == hits + 1
+    del memo_caches["pad"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    """Test calls arriving while the same call runs wait for its result."""
+    runs = []
+
+    @memoize
+    async def slow(text: str) -> dict:
+        runs.append(text)
+        await asyncio.sleep(0.01)
+        return {"length": len(text)}
+
+    results = await asyncio.gather(*(slow("same") for _ in range(5)))
+    assert results == [{"length": 4}] * 5
+    assert runs == ["same"]
+    del memo_caches["slow"]
+
+
+@pytest.mark.asyncio
+async def test_large_arguments_keyed_off_the_event_loop(monkeypatch):
+    """Test hashing a large document does not stall other work on the event loop."""
+    monkeypatch.setattr(settings, "text_offload_threshold", 1_000)
+
+    @memoize
+    async def length(text: str) -> dict:
+        return {"length": len(text)}
+
+    text = "word " * 4_000_000
+    start = time.perf_counter()
+    memo_key(inspect.signature(length.__wrapped__), (text,), {})
+    hashing = time.perf_counter() - start
+
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        assert await length(text) == {"length": len(text)}
+    finally:
+        task.cancel()
+    assert max(gaps) < hashing / 2
+    del memo_caches["length"]
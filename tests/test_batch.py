@@ -0,0 +1,156 @@
+"""
+Tests for the Batch Tool
+========================
+
+Shows how a batch runs independent calls concurrently, orders calls that
+reference each other's results, and reports each call's outcome.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from utilities.admission import AdmissionController
+from tools.http_tools import fetch_api_data
+from utilities.base_tools import BaseTools
+from utilities.batch import BatchError, batch_tools, run_batch
+from utilities.http_client import http_pool
+from utilities.serialization import serialize_tools
+from utilities.tool_hooks import wrap_tools
+
+
+@pytest.fixture
+def mcp():
+    """Server with the batch tool and a few small tools on the fast path."""
+    server = FastMCP("test")
+    batch_tools(server)
+    serialize_tools(server)
+    server.running = []
+
+    @server.tool()
+    async def add(a: float, b: float) -> dict:
+        server.running.append("add")
+        await asyncio.sleep(0.05)
+        return {"success": True, "result": a + b}
+
+    @server.tool()
+    async def fail(reason: str) -> dict:
+        return {"success": False, "data": None, "error": reason}
+
+    @server.tool()
+    async def batch(calls: list[dict]) -> dict:
+        return await run_batch(server, calls)
+
+    return server
+
+
+@pytest.mark.asyncio
+async def test_references_order_calls_and_others_run_concurrently(mcp):
+    """Test a call waits for the calls it references while independent calls overlap."""
+    result = await run_batch(mcp, [
+        {"id": "x", "tool": "add", "args": {"a": 1, "b": 2}},
+        {"id": "y", "tool": "add", "args": {"a": 10, "b": 20}},
+        {"id": "sum", "tool": "add", "args": {
+            "a": {"$ref": "x.result"}, "b": {"$ref": "y.result"},
+        }},
+    ])
+    x, y, total = result["results"]
+    assert total["result"] == {"success": True, "result": 33.0}
+    assert result["succeeded"] == 3 and result["failed"] == 0
+    assert abs(x["started_ms"] - y["started_ms"]) < 40
+    assert total["started_ms"] >= max(x["started_ms"] + x["duration_ms"],
+                                      y["started_ms"] + y["duration_ms"])
+    assert result["duration_ms"] < 150
+
+
+@pytest.mark.asyncio
+async def test_failures_skip_dependants_only(mcp):
+    """Test an error response fails the calls referencing it but not unrelated calls."""
+    result = await run_batch(mcp, [
+        {"id": "bad", "tool": "fail", "args": {"reason": "upstream down"}},
+        {"tool": "add", "args": {"a": {"$ref": "bad.result"}, "b": 1}},
+        {"tool": "add", "args": {"a": 1, "b": 1}},
+        {"tool": "add", "args": {"a": "not a number", "b": 1}},
+    ])
+    bad, dependant, independent, invalid = result["results"]
+    assert bad["error"] == "upstream down"
+    assert dependant == {"id": "1", "tool": "add", "success": False,
+                         "error": "Dependency 'bad' failed"}
+    assert independent["result"]["result"] == 2.0
+    assert not invalid["success"] and "validation error" in invalid["error"]
+    assert result["failed"] == 3
+    assert mcp.running == ["add"]
+
+
+@pytest.mark.asyncio
+async def test_success_envelopes_feed_dependants(mcp):
+    """Test results in the standard envelope ("error": None) count as successes."""
+    tools = BaseTools("test")
+
+    @mcp.tool()
+    async def double(value: float) -> dict:
+        return tools.success_response(value * 2)
+
+    result = await run_batch(mcp, [
+        {"id": "first", "tool": "double", "args": {"value": 2}},
+        {"id": "second", "tool": "double", "args": {"value": {"$ref": "first.data"}}},
+    ])
+    assert result["succeeded"] == 2 and result["failed"] == 0
+    assert result["results"][1]["result"]["data"] == 8
+
+
+@pytest.mark.asyncio
+async def test_failed_http_request_skips_dependants(mcp):
+    """Test an HTTP error result ({"error", "url", "method"}) fails its dependants."""
+    mcp.tool(name="http_request")(fetch_api_data)
+    http_pool.configure(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+    try:
+        result = await run_batch(mcp, [
+            {"id": "page", "tool": "http_request", "args": {"url": "https://api.test/down"}},
+            {"tool": "add", "args": {"a": {"$ref": "page.data.count"}, "b": 1}},
+        ])
+    finally:
+        http_pool.configure(transport=None)
+    page, dependant = result["results"]
+    assert not page["success"] and "503" in page["error"]
+    assert dependant["error"] == "Dependency 'page' failed"
+    assert result["failed"] == 2
+    assert mcp.running == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("calls, message", [
+    ([], "empty"),
+    ([{"id": "a", "tool": "add", "args": {"a": {"$ref": "b.result"}, "b": 1}},
+      {"id": "b", "tool": "add", "args": {"a": {"$ref": "a.result"}, "b": 1}}], "cycle"),
+    ([{"tool": "add", "args": {"a": {"$ref": "missing.result"}, "b": 1}}], "unknown"),
+    ([{"tool": "batch", "args": {"calls": []}}], "nested"),
+])
+async def test_invalid_batches_rejected_before_running(mcp, calls, message):
+    """Test malformed batches are rejected as a whole."""
+    with pytest.raises(BatchError, match=message):
+        await run_batch(mcp, calls)
+    assert mcp.running == []
+
+
+@pytest.mark.asyncio
+async def test_batch_calls_share_the_callers_global_slot():
+    """Test calls of a batch do not wait for global slots held by the batch itself."""
+    server = FastMCP("test")
+    batch_tools(server)
+    serialize_tools(server)
+    wrap_tools(server, AdmissionController(max_concurrent=1, queue_timeout=0.1).wrap)
+
+    @server.tool()
+    async def echo(value: str) -> dict:
+        return {"value": value}
+
+    @server.tool()
+    async def batch(calls: list[dict]) -> dict:
+        return await run_batch(server, calls)
+
+    calls = [{"tool": "echo", "args": {"value": str(i)}} for i in range(3)]
+    encoded = await server.call_tool("batch", {"calls": calls})
+    assert '"succeeded":3' in encoded.content[0].text
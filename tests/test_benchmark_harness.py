@@ -0,0 +1,35 @@
+"""
+Tests for the Benchmark Harness
+===============================
+
+Shows how latency summaries are computed and how the regression gate decides.
+"""
+
+import pytest
+
+from benchmarks.harness import compare, summarize
+
+
+def test_summarize_percentiles_and_throughput():
+    """Test percentiles come from the latency distribution and throughput from wall time."""
+    summary = summarize([i / 1000 for i in range(1, 101)], elapsed=2.0)
+    assert summary["count"] == 100
+    assert summary["throughput"] == 50.0
+    assert summary["p50_ms"] == pytest.approx(50.5)
+    assert summary["p99_ms"] == pytest.approx(99.01)
+    assert summary["max_ms"] == pytest.approx(100.0)
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    """Test slower latency or lower throughput beyond tolerance is reported."""
+    baseline = {
+        "a": {"throughput": 100.0, "p50_ms": 10.0},
+        "b": {"throughput": 100.0, "p50_ms": 10.0},
+    }
+    current = {
+        "a": {"throughput": 90.0, "p50_ms": 11.0},  # Within 20%
+        "b": {"throughput": 70.0, "p50_ms": 5.0},  # Faster, but lower throughput
+        "new": {"throughput": 1.0, "p50_ms": 1.0},  # Not in the baseline
+    }
+    regressions = compare(current, baseline, tolerance=0.2, metrics=["throughput", "p50_ms"])
+    assert regressions == ["b throughput: 100.000 -> 70.000 (-30%)"]
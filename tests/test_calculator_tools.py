@@ -7,7 +7,9 @@ Replace these tests with tests for YOUR business logic.
 """
 
 import pytest
-from tools.calculator_tools import calculate_operation
+
+import tools.calculator_tools as calculator_tools
+from tools.calculator_tools import calculate_batch, calculate_operation, evaluate_expression
 
 
 @pytest.mark.asyncio
@@ -57,3 +59,89 @@ async def test_invalid_operation():
     with pytest.raises(ValueError, match="Unsupported operation"):
         await calculate_operation("modulo", 10, 3)
 
+
+
+@pytest.fixture(params=["numpy", "python"])
+def batch_backend(request, monkeypatch):
+    """Run batch tests against both the NumPy and pure-Python backends."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(calculator_tools, "np", None)
+    return request.param
+
+
+@pytest.mark.asyncio
+async def test_batch_elementwise(batch_backend):
+    """Test element-wise operations over two lists."""
+    result = await calculate_batch("multiply", [1, 2, 3], [4, 5, 6])
+    assert result["results"] == [4, 10, 18]
+    assert result["count"] == 3
+    assert result["errors"] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_broadcast_scalar(batch_backend):
+    """Test a single number is broadcast against a list."""
+    result = await calculate_batch("add", [1, 2, 3], 10)
+    assert result["results"] == [11, 12, 13]
+
+
+@pytest.mark.asyncio
+async def test_batch_divide_by_zero_per_element(batch_backend):
+    """Test division by zero is reported per element without failing the batch."""
+    result = await calculate_batch("divide", 10, [2, 0, 5])
+    assert result["results"] == [5, None, 2]
+    assert result["errors"] == [{"index": 1, "error": "Division by zero is not allowed"}]
+
+
+@pytest.mark.asyncio
+async def test_batch_length_mismatch(batch_backend):
+    """Test lists of different lengths are rejected."""
+    with pytest.raises(ValueError, match="same length"):
+        await calculate_batch("add", [1, 2], [1, 2, 3])
+
+
+@pytest.mark.asyncio
+async def test_batch_invalid_operation():
+    """Test invalid batch operation raises error."""
+    with pytest.raises(ValueError, match="Unsupported operation"):
+        await calculate_batch("modulo", [1], [2])
+
+
+@pytest.mark.asyncio
+async def test_expression_over_bindings():
+    """Test an expression is evaluated for every binding."""
+    bindings = [{"a": 1, "b": 2, "c": 3}, {"a": 0, "b": 1, "c": -2}]
+    result = await evaluate_expression("(a + b) * c", bindings)
+    assert result["results"] == [9, -2]
+    assert result["variables"] == ["a", "b", "c"]
+    assert result["errors"] == []
+
+
+@pytest.mark.asyncio
+async def test_expression_per_binding_errors():
+    """Test division by zero and missing variables fail only their binding."""
+    result = await evaluate_expression("x / y", [{"x": 1, "y": 0}, {"x": 1}, {"x": 6, "y": 3}])
+    assert result["results"] == [None, None, 2]
+    assert result["errors"][0] == {"index": 0, "error": "Division by zero is not allowed"}
+    assert result["errors"][1]["index"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expression_compiled_once():
+    """Test repeated expressions are served from the compiled-expression cache."""
+    await evaluate_expression("n * 2 + 1", [{"n": 1}])
+    result = await evaluate_expression("n * 2 + 1", [{"n": 2}])
+    assert result["results"] == [5]
+    assert result["cache"]["hits"] >= 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "expression", ["__import__('os')", "a.b", "x[0]", "2 ** 8", "'text'", "lambda: 1"]
+)
+async def test_expression_rejects_unsafe_syntax(expression):
+    """Test anything beyond arithmetic on numbers and variables is rejected."""
+    with pytest.raises(ValueError):
+        await evaluate_expression(expression, [{}])
@@ -0,0 +1,80 @@
+"""
+Tests for Deadlines and Cancellation
+====================================
+
+Shows how tool calls are bounded by timeouts and cancelled when clients leave.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from utilities import deadlines
+from utilities.deadlines import CancelOnDisconnectMiddleware, DeadlinePolicy, bounded_timeout
+
+
+async def _sleepy(seconds: float) -> dict:
+    await asyncio.sleep(seconds)
+    return {"slept": seconds}
+
+
+@pytest.mark.asyncio
+async def test_call_past_deadline_returns_error():
+    """Test a call running past its timeout is cancelled with a structured error."""
+    policy = DeadlinePolicy(default_timeout=0.05)
+    result = await policy.wrap("sleepy", _sleepy)(1)
+    assert result["success"] is False
+    assert result["error"].startswith("Deadline exceeded")
+    assert await policy.wrap("sleepy", _sleepy)(0) == {"slept": 0}
+
+
+@pytest.mark.asyncio
+async def test_per_tool_timeout_and_deadline_visible_to_tool():
+    """Test per-tool overrides win and outbound timeouts are capped by the deadline."""
+    policy = DeadlinePolicy(default_timeout=60, tool_timeouts={"probe": 2})
+
+    async def probe() -> dict:
+        return {"http_timeout": bounded_timeout(30)}
+
+    result = await policy.wrap("probe", probe)()
+    assert 1.5 < result["http_timeout"] <= 2
+    assert bounded_timeout(30) == 30  # No deadline outside a tool call
+
+
+@pytest.mark.asyncio
+async def test_client_timeout_from_request_meta():
+    """Test a shorter timeout requested in _meta is honoured."""
+    if deadlines.request_ctx is None:
+        pytest.skip("MCP SDK without request context")
+    from mcp.types import RequestParams
+
+    token = deadlines.request_ctx.set(SimpleNamespace(meta=RequestParams.Meta(timeout=0.05)))
+    try:
+        policy = DeadlinePolicy(default_timeout=60)
+        assert policy.timeout_for("sleepy") == 0.05
+        result = await policy.wrap("sleepy", _sleepy)(1)
+    finally:
+        deadlines.request_ctx.reset(token)
+    assert result["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_running_tool_calls():
+    """Test the middleware cancels tool calls started over a dropped connection."""
+    policy = DeadlinePolicy()
+    tool = policy.wrap("sleepy", _sleepy)
+    results = []
+
+    async def app(scope, receive, send):
+        # Like the MCP transports: the tool runs in a task spawned by the request
+        call = asyncio.create_task(tool(10))
+        await asyncio.sleep(0)
+        await receive()
+        results.append(await call)
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    await asyncio.wait_for(CancelOnDisconnectMiddleware(app)({"type": "http"}, receive, None), 1)
+    assert results[0]["error"] == "Cancelled: the client disconnected"
@@ -0,0 +1,200 @@
+"""
+Tests for the Disk Cache
+========================
+
+Shows how the SQLite cache tier stores, expires and evicts entries, and how
+the HTTP and weather caches use it to start warm in a new process.
+"""
+
+import os
+import sqlite3
+import stat
+import threading
+import time
+
+import httpx
+import pytest
+
+from tools.http_tools import ResponseCache
+from tools.weather_tools import MockWeatherProvider, WeatherCache
+from utilities.disk_cache import DiskCache
+from utilities.http_client import http_pool
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a fresh cache database."""
+    return str(tmp_path / "cache" / "cache.db")
+
+
+def test_entries_shared_between_instances(db_path):
+    """Test an entry written by one process is read by another, compressed or not."""
+    writer = DiskCache(db_path, max_bytes=1_000_000, compress_bytes=100)
+    small, large = {"n": 1}, {"text": "abc" * 1000}
+    writer.put("ns", "small", small, ttl=60)
+    writer.put("ns", "large", large, ttl=60)
+
+    reader = DiskCache(db_path, max_bytes=1_000_000)
+    assert reader.get("ns", "small")[0] == small
+    assert reader.get("ns", "large")[0] == large
+    assert reader.get("other", "small") is None
+    assert reader.stats()["hits"] == 2
+
+
+def test_expired_entries_kept_for_grace_period(db_path):
+    """Test expired entries are returned during their grace period, then purged."""
+    cache = DiskCache(db_path, max_bytes=1_000_000)
+    cache.put("ns", "stale", "value", ttl=-10, keep=60)
+    cache.put("ns", "gone", "value", ttl=-10)
+    value, expires_at = cache.get("ns", "stale")
+    assert value == "value"
+    assert expires_at < time.time()
+    assert cache.get("ns", "gone") is None
+
+
+def test_size_bound_evicts_least_recently_read_entries(db_path, monkeypatch):
+    """Test the database is kept under max_bytes, dropping entries not read for longest first."""
+    monkeypatch.setattr("utilities.disk_cache._EVICT_EVERY", 1)
+    monkeypatch.setattr("utilities.disk_cache._TOUCH_AFTER", 0.0)
+    cache = DiskCache(db_path, max_bytes=2_000, compress_bytes=10**9)
+    cache.put("ns", "read", "x" * 500, ttl=60)
+    cache.put("ns", "unread", "x" * 500, ttl=3600)
+    for i in range(10):
+        assert cache.get("ns", "read") is not None
+        cache.put("ns", f"other-{i}", "x" * 500, ttl=3600)
+    assert cache.evictions > 0
+    assert cache.get("ns", "read") is not None
+    assert cache.get("ns", "unread") is None
+
+
+@pytest.mark.asyncio
+async def test_io_runs_off_the_event_loop(db_path, monkeypatch):
+    """Test lookups and writes from async code run in the disk cache thread, in order."""
+    cache = DiskCache(db_path, max_bytes=1_000_000)
+    threads = []
+    put = cache.put
+
+    def recording_put(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        put(*args, **kwargs)
+
+    monkeypatch.setattr(cache, "put", recording_put)
+    cache.store("ns", "key", {"n": 1}, ttl=60)
+    assert (await cache.lookup("ns", "key"))[0] == {"n": 1}
+    assert threads[0].startswith("disk-cache")
+    assert threading.current_thread().name == "MainThread"
+
+
+def test_database_private_to_the_user(db_path):
+    """Test the cache directory is created with mode 0700 and the database with 0600."""
+    DiskCache(db_path, max_bytes=1_000).put("ns", "key", "value", ttl=60)
+    assert stat.S_IMODE(os.stat(os.path.dirname(db_path)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(db_path).st_mode) == 0o600
+
+
+def test_workers_starting_together_share_one_schema(db_path):
+    """Test processes opening a new database at once neither fail nor drop each other's tables."""
+    caches = [DiskCache(db_path, max_bytes=1_000_000) for _ in range(8)]
+    barrier = threading.Barrier(len(caches))
+
+    def start(index):
+        barrier.wait()
+        caches[index].put("ns", f"key-{index}", index, ttl=60)
+
+    threads = [threading.Thread(target=start, args=(i,)) for i in range(len(caches))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(cache.errors for cache in caches) == 0
+    assert [DiskCache(db_path, max_bytes=1_000_000).get("ns", f"key-{i}")[0]
+            for i in range(len(caches))] == list(range(len(caches)))
+
+
+def test_unversioned_database_recreated(db_path):
+    """Test a database of the first layout (no schema version) is replaced on open."""
+    os.makedirs(os.path.dirname(db_path), mode=0o700)
+    old = sqlite3.connect(db_path)
+    old.execute("CREATE TABLE entries (key BLOB PRIMARY KEY, value BLOB, size INTEGER)")
+    old.close()
+    cache = DiskCache(db_path, max_bytes=1_000_000)
+    cache.put("ns", "key", "value", ttl=60)
+    assert cache.get("ns", "key")[0] == "value"
+    assert cache.errors == 0
+
+
+def test_unusable_database_degrades_to_misses(tmp_path):
+    """Test errors are counted and treated as misses instead of failing the call."""
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    cache = DiskCache(str(blocker / "cache.db"), max_bytes=1_000)
+    cache.put("ns", "key", "value", ttl=60)
+    assert cache.get("ns", "key") is None
+    assert cache.errors == 2
+
+
+@pytest.mark.asyncio
+async def test_new_http_cache_served_from_disk(db_path):
+    """Test a restarted process answers a cached GET without calling the upstream."""
+    calls = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"v": 1}, headers={"Cache-Control": "max-age=60"})
+
+    http_pool.configure(transport=httpx.MockTransport(upstream))
+    try:
+        first = ResponseCache(DiskCache(db_path, max_bytes=1_000_000))
+        result, status = await first.get("http://upstream.test/a", {}, 1_000)
+        assert status == "miss"
+
+        restarted = ResponseCache(DiskCache(db_path, max_bytes=1_000_000))
+        cached, status = await restarted.get("http://upstream.test/a", {}, 1_000)
+    finally:
+        await http_pool.close()
+        http_pool.configure(transport=None)
+    assert status == "hit"
+    assert cached == result
+    assert restarted.stats()["disk_hits"] == 1
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_disk_entry_not_counted_as_hit(db_path):
+    """Test an expired entry loaded from disk for revalidation is not a disk hit."""
+    def upstream(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        headers = {"ETag": '"v1"', "Cache-Control": "no-cache"}
+        return httpx.Response(200, json={"v": 1}, headers=headers)
+
+    http_pool.configure(transport=httpx.MockTransport(upstream))
+    try:
+        await ResponseCache(DiskCache(db_path, max_bytes=1_000_000)).get(
+            "http://upstream.test/a", {}, 1_000
+        )
+        restarted = ResponseCache(DiskCache(db_path, max_bytes=1_000_000))
+        _, status = await restarted.get("http://upstream.test/a", {}, 1_000)
+    finally:
+        await http_pool.close()
+        http_pool.configure(transport=None)
+    assert status == "revalidated"
+    assert restarted.stats()["disk_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_new_weather_cache_served_from_disk(db_path):
+    """Test weather fetched by one process is served by another with its age."""
+    fetches = []
+
+    class CountingProvider(MockWeatherProvider):
+        async def fetch(self, city):
+            fetches.append(city)
+            return await super().fetch(city)
+
+    first = WeatherCache(CountingProvider(), DiskCache(db_path, max_bytes=1_000_000))
+    await first.get("Oslo")
+    restarted = WeatherCache(CountingProvider(), DiskCache(db_path, max_bytes=1_000_000))
+    result = await restarted.get("oslo")
+    assert result["cache"]["status"] == "hit"
+    assert fetches == ["Oslo"]
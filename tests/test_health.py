@@ -0,0 +1,78 @@
+"""
+Tests for Health Checks
+=======================
+
+Shows how /healthz and /readyz are answered outside the MCP transport and
+how readiness follows the worker's saturation signals.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from starlette.testclient import TestClient
+
+from utilities.health import HealthChecks, LoopLagMonitor
+from utilities.http_server import build_http_app
+from utilities.metrics import tool_metrics
+
+
+@asynccontextmanager
+async def no_lifespan():
+    yield
+
+
+def test_endpoints_do_not_reach_the_mcp_transport(monkeypatch):
+    """Test health endpoints answer without calling the MCP app, and report each check."""
+    transport_calls = []
+
+    async def mcp_app(scope, receive, send):
+        transport_calls.append(scope["path"])
+
+    monkeypatch.setattr("utilities.config.settings.ready_max_in_flight", 2)
+    with TestClient(build_http_app(mcp_app, no_lifespan)) as client:
+        assert client.get("/healthz").json() == {"status": "ok"}
+        ready = client.get("/readyz")
+        assert ready.status_code == 200
+        assert ready.json()["checks"]["tool_calls_in_flight"] == {
+            "value": 0, "limit": 2, "ok": True
+        }
+
+        tool_metrics.series("busy_tool").in_flight = 3
+        try:
+            not_ready = client.get("/readyz")
+        finally:
+            tool_metrics.reset()
+        assert not_ready.status_code == 503
+        assert not_ready.json()["ready"] is False
+    assert transport_calls == []
+
+
+def test_unready_on_loop_lag_or_pool_saturation(monkeypatch):
+    """Test readiness fails once a signal crosses its limit; a limit of 0 disables a check."""
+    checks = HealthChecks(max_loop_lag=0.1, max_pool_utilization=0.5)
+    assert checks.readiness()[0]
+
+    checks.monitor.samples.append(0.2)
+    ready, report = checks.readiness()
+    assert not ready and not report["checks"]["loop_lag_seconds"]["ok"]
+
+    checks.monitor.samples.clear()
+    monkeypatch.setattr("utilities.health._pool_utilization", lambda: 0.75)
+    assert not checks.readiness()[0]
+    assert HealthChecks(max_loop_lag=0.1).readiness()[0]
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_measured_while_the_loop_is_blocked():
+    """Test the monitor sees how long blocking code held up the event loop."""
+    monitor = LoopLagMonitor(interval=0.01)
+    await monitor.start()
+    try:
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # Blocks the event loop
+        await asyncio.sleep(0.02)
+    finally:
+        await monitor.stop()
+    assert 0.05 <= monitor.lag < 1.0
@@ -0,0 +1,137 @@
+"""
+Tests for the HTTP Serving Layer
+================================
+
+Exercises SSE session affinity between workers without starting uvicorn: two
+middleware instances stand in for two worker processes sharing a registry.
+"""
+
+import asyncio
+import os
+import stat
+
+import pytest
+
+from utilities.http_server import SessionAffinityMiddleware, default_session_dir
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+
+
+class FakeTransport:
+    """Minimal stand-in for the MCP SSE app of one worker."""
+
+    def __init__(self, name):
+        self.name = name
+        self.posts = []
+        self.stream_open = asyncio.Event()
+        self.close_stream = asyncio.Event()
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] == "GET":
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream")],
+            })
+            endpoint = f"event: endpoint\r\ndata: /messages/?session_id={SESSION_ID}\r\n\r\n"
+            await send({"type": "http.response.body", "body": endpoint.encode(), "more_body": True})
+            self.stream_open.set()
+            await self.close_stream.wait()
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        message = await receive()
+        self.posts.append(message["body"])
+        await send({"type": "http.response.start", "status": 202, "headers": []})
+        await send({"type": "http.response.body", "body": self.name.encode()})
+
+
+async def _post(app, body):
+    """Send a session POST through an ASGI app and return (status, body)."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/messages/",
+        "root_path": "",
+        "query_string": f"session_id={SESSION_ID}".encode(),
+        "headers": [(b"content-type", b"application/json")],
+    }
+    await app(scope, receive, send)
+    return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:])
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two workers sharing one session registry directory."""
+    owner_app, other_app = FakeTransport("owner"), FakeTransport("other")
+    owner = SessionAffinityMiddleware(owner_app, str(tmp_path))
+    other = SessionAffinityMiddleware(other_app, str(tmp_path))
+    owner.socket_path = str(tmp_path / "owner.sock")
+    other.socket_path = str(tmp_path / "other.sock")
+    return owner, other
+
+
+@pytest.mark.asyncio
+async def test_post_is_relayed_to_session_owner(workers):
+    """Test a message for a session owned by another worker reaches the owner."""
+    owner, other = workers
+    await owner.start()
+    await other.start()
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/sse", "query_string": b"", "headers": []}
+    stream = asyncio.create_task(owner(scope, receive, send))
+    try:
+        await owner.app.stream_open.wait()
+        status, body = await _post(other, b'{"jsonrpc": "2.0"}')
+        assert status == 202
+        assert body == b"owner"
+        assert owner.app.posts == [b'{"jsonrpc": "2.0"}']
+        assert other.app.posts == []
+    finally:
+        owner.app.close_stream.set()
+        await stream
+        await owner.stop()
+        await other.stop()
+
+    # The session is unregistered once its stream ends
+    status, body = await _post(other, b"{}")
+    assert body == b"other"
+
+
+@pytest.mark.asyncio
+async def test_post_for_unknown_session_stays_local(workers):
+    """Test messages without a registered owner are handled by the receiving worker."""
+    _, other = workers
+    status, body = await _post(other, b"{}")
+    assert status == 202
+    assert body == b"other"
+
+
+@pytest.mark.asyncio
+async def test_session_dir_private_to_the_user(tmp_path, monkeypatch):
+    """Test the default registry is created with mode 0700 and a shared one is refused."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    worker = SessionAffinityMiddleware(FakeTransport("worker"), default_session_dir())
+    await worker.start()
+    await worker.stop()
+    assert stat.S_IMODE(os.stat(tmp_path / "mcp-skeleton-sessions").st_mode) == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError, match="mode 0700"):
+        await SessionAffinityMiddleware(FakeTransport("worker"), str(shared)).start()
@@ -0,0 +1,275 @@
+"""
+Tests for HTTP Tools
+====================
+
+Example test cases showing how to test HTTP client usage without network
+access, by pointing the shared client pool at an httpx.MockTransport.
+Replace these tests with tests for YOUR API integrations.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from tools.http_tools import fetch_api_data, fetch_many, get_http_pool_stats, response_cache
+from utilities.config import settings
+from utilities.http_client import http_pool
+
+
+upstream_calls = []
+in_flight = []
+peak_in_flight = []
+gate = asyncio.Event()
+
+
+async def _handler(request: httpx.Request) -> httpx.Response:
+    upstream_calls.append(request)
+    if request.url.path == "/json":
+        return httpx.Response(200, json={"hello": "world"})
+    if request.url.path == "/missing":
+        return httpx.Response(404, text="not found")
+    if request.url.path == "/fresh":
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, text="fresh", headers={"Cache-Control": "max-age=60"})
+    if request.url.path == "/etag":
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        headers = {"ETag": '"v1"', "Cache-Control": "no-cache"}
+        return httpx.Response(200, text="tagged", headers=headers)
+    if request.url.path == "/large":
+        return httpx.Response(200, text="x" * 10_000, headers={"Cache-Control": "max-age=60"})
+    if request.url.path == "/slow":
+        in_flight.append(1)
+        peak_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        return httpx.Response(200, text=request.url.params.get("n", ""))
+    if request.url.path == "/chunked":
+        async def chunks():
+            for _ in range(3):
+                yield b"x" * 100
+        return httpx.Response(200, content=chunks(), headers={"Content-Length": "300"})
+    if request.url.path == "/gate":
+        await gate.wait()
+        return httpx.Response(200, text="opened")
+    if request.url.path == "/no-store":
+        return httpx.Response(200, text="secret", headers={"Cache-Control": "no-store"})
+    return httpx.Response(200, text=f"{request.method} ok")
+
+
+@pytest.fixture
+def mock_upstream():
+    """Route the shared HTTP client to an in-process mock upstream."""
+    upstream_calls.clear()
+    peak_in_flight.clear()
+    response_cache.clear()
+    http_pool.configure(transport=httpx.MockTransport(_handler))
+    yield
+    http_pool.configure(transport=None)
+
+
+@pytest.mark.asyncio
+async def test_fetch_json(mock_upstream):
+    """Test JSON responses are parsed."""
+    result = await fetch_api_data("http://upstream.test/json")
+    assert result["status_code"] == 200
+    assert result["data"] == {"hello": "world"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_text_post(mock_upstream):
+    """Test POST requests return text bodies."""
+    result = await fetch_api_data("http://upstream.test/text", method="POST")
+    assert result["data"] == "POST ok"
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_status(mock_upstream):
+    """Test HTTP errors are reported in the response."""
+    result = await fetch_api_data("http://upstream.test/missing")
+    assert "error" in result
+    assert result["method"] == "GET"
+
+
+@pytest.mark.asyncio
+async def test_unsupported_method(mock_upstream):
+    """Test unsupported methods are reported in the response."""
+    result = await fetch_api_data("http://upstream.test/", method="DELETE")
+    assert "Unsupported HTTP method" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared(mock_upstream):
+    """Test the pooled client is reused across calls."""
+    assert http_pool.client is http_pool.client
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit(mock_upstream, monkeypatch):
+    """Test requests still complete when a per-host cap is configured."""
+    monkeypatch.setattr(settings, "http_max_connections_per_host", 1)
+    result = await fetch_api_data("http://upstream.test/json")
+    assert result["status_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(mock_upstream):
+    """Test pool statistics include usage and limits."""
+    stats = await get_http_pool_stats()
+    for key in ("connections_in_use", "connections_idle", "requests_waiting", "max_connections"):
+        assert key in stats
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_requests_beyond_the_connection_limit(mock_upstream, monkeypatch):
+    """Test requests in flight beyond http_max_connections are reported as waiting."""
+    monkeypatch.setattr(settings, "http_max_connections", 2)
+    gate.clear()
+    requests = [
+        asyncio.create_task(fetch_api_data(f"http://upstream.test/gate?n={i}", method="POST"))
+        for i in range(5)
+    ]
+    await asyncio.sleep(0.01)
+    assert (await get_http_pool_stats())["requests_waiting"] == 3
+    gate.set()
+    await asyncio.gather(*requests)
+    assert (await get_http_pool_stats())["requests_waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_within_max_age(mock_upstream):
+    """Test fresh responses are served from cache."""
+    first = await fetch_api_data("http://upstream.test/fresh")
+    second = await fetch_api_data("http://upstream.test/fresh")
+    assert first["cache"]["status"] == "miss"
+    assert second["cache"]["status"] == "hit"
+    assert second["data"] == "fresh"
+    assert second["cache"]["hits"] == 1
+    assert len(upstream_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_revalidates_with_etag(mock_upstream):
+    """Test stale responses are revalidated with If-None-Match."""
+    await fetch_api_data("http://upstream.test/etag")
+    result = await fetch_api_data("http://upstream.test/etag")
+    assert result["cache"]["status"] == "revalidated"
+    assert result["data"] == "tagged"
+    assert upstream_calls[-1].headers["if-none-match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_cache_respects_no_store(mock_upstream):
+    """Test no-store responses are never cached."""
+    await fetch_api_data("http://upstream.test/no-store")
+    result = await fetch_api_data("http://upstream.test/no-store")
+    assert result["cache"]["status"] == "miss"
+    assert len(upstream_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_single_flight(mock_upstream):
+    """Test concurrent identical GETs share one upstream request."""
+    calls = [fetch_api_data("http://upstream.test/fresh") for _ in range(10)]
+    results = await asyncio.gather(*calls)
+    assert len(upstream_calls) == 1
+    assert all(result["data"] == "fresh" for result in results)
+    assert sum(result["cache"]["status"] == "coalesced" for result in results) == 9
+
+
+@pytest.mark.asyncio
+async def test_cache_lru_eviction(mock_upstream, monkeypatch):
+    """Test the cache is bounded by http_cache_max_entries."""
+    monkeypatch.setattr(settings, "http_cache_max_entries", 1)
+    await fetch_api_data("http://upstream.test/fresh")
+    await fetch_api_data("http://upstream.test/fresh?other=1")
+    result = await fetch_api_data("http://upstream.test/fresh")
+    assert result["cache"]["status"] == "miss"
+    assert result["cache"]["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_post_bypasses_cache(mock_upstream):
+    """Test non-GET requests are never cached."""
+    result = await fetch_api_data("http://upstream.test/fresh", method="POST")
+    assert result["cache"]["status"] == "bypass"
+
+
+@pytest.mark.asyncio
+async def test_body_truncated_at_max_bytes(mock_upstream):
+    """Test reading stops at max_bytes and the result is flagged."""
+    result = await fetch_api_data("http://upstream.test/large", max_bytes=100)
+    assert result["truncated"] is True
+    assert result["data"] == "x" * 100
+
+
+@pytest.mark.asyncio
+async def test_body_within_limit_not_truncated(mock_upstream):
+    """Test bodies below max_bytes are returned whole and not flagged."""
+    result = await fetch_api_data("http://upstream.test/json", max_bytes=1_000)
+    assert result["truncated"] is False
+    assert result["data"] == {"hello": "world"}
+
+
+@pytest.mark.asyncio
+async def test_truncated_body_not_cached(mock_upstream):
+    """Test truncated bodies are never stored in the response cache."""
+    await fetch_api_data("http://upstream.test/large", max_bytes=100)
+    result = await fetch_api_data("http://upstream.test/large", max_bytes=100)
+    assert result["cache"]["status"] == "miss"
+
+
+@pytest.mark.asyncio
+async def test_download_progress_reported(mock_upstream, monkeypatch, call_with_progress):
+    """Test a client asking for progress is told how many bytes have arrived."""
+    monkeypatch.setattr(settings, "progress_min_interval", 0.0)
+    mcp = FastMCP("test")
+    mcp.tool()(fetch_api_data)
+
+    result, received = await call_with_progress(
+        mcp, "fetch_api_data", {"url": "http://upstream.test/chunked"}
+    )
+    assert not result.isError
+    assert [(p.progress, p.total) for p in received] == [(100, 300), (200, 300), (300, 300)]
+    assert received[0].meta.partial == {"status_code": 200, "bytes": 100}
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_preserves_order(mock_upstream):
+    """Test batch results come back in input order with per-item errors."""
+    requests = [{"url": f"http://upstream.test/slow?n={i}"} for i in range(5)]
+    requests.append({"url": "http://upstream.test/missing"})
+    requests.append({"method": "GET"})
+    result = await fetch_many(requests)
+    assert result["count"] == 7
+    assert [item["data"] for item in result["results"][:5]] == ["0", "1", "2", "3", "4"]
+    assert "error" in result["results"][5]
+    assert "error" in result["results"][6]
+    assert result["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_bounds_per_host_concurrency(mock_upstream):
+    """Test no more than max_per_host requests hit one host at once."""
+    requests = [{"url": f"http://upstream.test/slow?n={i}"} for i in range(12)]
+    await fetch_many(requests, max_concurrency=10, max_per_host=3)
+    assert max(peak_in_flight) <= 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_limits_capped_by_settings(mock_upstream, monkeypatch):
+    """Test a caller cannot raise the per-host limit above http_batch_max_per_host."""
+    monkeypatch.setattr(settings, "http_batch_max_per_host", 2)
+    requests = [{"url": f"http://upstream.test/slow?n={i}"} for i in range(8)]
+    await fetch_many(requests, max_per_host=6)
+    assert max(peak_in_flight) <= 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_rejects_oversized_batch(mock_upstream, monkeypatch):
+    """Test batches above http_batch_max_items are rejected."""
+    monkeypatch.setattr(settings, "http_batch_max_items", 2)
+    with pytest.raises(ValueError, match="Too many requests"):
+        await fetch_many([{"url": "http://upstream.test/"}] * 3)
@@ -0,0 +1,44 @@
+"""
+Tests for Deferred Imports
+==========================
+
+Shows how tools are imported on first call instead of at server startup.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from utilities.lazy import lazy_callable
+
+
+@pytest.mark.asyncio
+async def test_lazy_callable_imports_on_first_call():
+    """Test the stand-in resolves its target and forwards arguments."""
+    calculate = lazy_callable("tools.calculator_tools:calculate_operation")
+    result = await calculate("add", 2, 3)
+    assert result["result"] == 5
+
+
+def test_lazy_callable_skips_modules_never_imported():
+    """Test only_if_imported hooks do nothing for modules nobody loaded."""
+    hook = lazy_callable("some_module_never_imported:cleanup", only_if_imported=True)
+    assert hook() is None
+
+
+def test_invalid_target_rejected():
+    """Test targets must name a module and an attribute."""
+    with pytest.raises(ValueError):
+        lazy_callable("tools.calculator_tools")
+
+
+def test_tools_package_imports_modules_on_demand():
+    """Test importing one tool module does not import the others."""
+    code = (
+        "import sys, tools.weather_tools, tools;"
+        "assert 'tools.http_tools' not in sys.modules;"
+        "assert callable(tools.fetch_api_data);"
+        "assert 'tools.http_tools' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
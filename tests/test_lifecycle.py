@@ -0,0 +1,43 @@
+"""
+Tests for Server Lifecycle
+==========================
+
+Shows how shared resources are started and stopped around the server.
+"""
+
+import pytest
+
+from utilities.lifecycle import ServerLifespan
+
+
+@pytest.mark.asyncio
+async def test_hooks_run_once_for_nested_sessions():
+    """Test startup/shutdown run only for the first and last user."""
+    events = []
+    lifespan = ServerLifespan()
+    lifespan.on_startup(lambda: events.append("start"))
+
+    async def stop():
+        events.append("stop")
+
+    lifespan.on_shutdown(stop)
+
+    async with lifespan():
+        async with lifespan():
+            assert lifespan.active
+        assert events == ["start"]
+    assert events == ["start", "stop"]
+    assert not lifespan.active
+
+
+@pytest.mark.asyncio
+async def test_failing_shutdown_hook_does_not_block_others():
+    """Test every shutdown hook runs even if one fails."""
+    events = []
+    lifespan = ServerLifespan()
+    lifespan.on_shutdown(lambda: events.append("first"))
+    lifespan.on_shutdown(lambda: 1 / 0)
+
+    async with lifespan():
+        pass
+    assert events == ["first"]
@@ -0,0 +1,112 @@
+"""
+Tests for the Logging Pipeline
+==============================
+
+Shows how log records are queued, tagged with their tool call, formatted as
+JSON and rate limited per call site.
+"""
+
+import io
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from utilities.logging_setup import build_handler, log_tools
+
+
+@pytest.fixture
+def capture():
+    """A logger writing through a pipeline handler; yields (logger, output, build)."""
+    logger = logging.getLogger("tests.logging_setup")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    output = io.StringIO()
+    listeners = []
+
+    def build(start=True, **options):
+        handler, listener = build_handler(output, **options)
+        logger.handlers = [handler]
+        if listener is not None and start:
+            listener.start()
+            listeners.append(listener)
+        return handler, listener
+
+    yield logger, output, build
+    for listener in listeners:
+        if listener._thread is not None:
+            listener.stop()
+    logger.handlers = []
+
+
+def test_queued_records_are_formatted_by_the_writer(capture):
+    """Test arguments are merged in the background and records are written in order."""
+    logger, output, build = capture
+    _, listener = build(queue_size=100)
+    for i in range(5):
+        logger.info("Request %d done", i)
+    listener.stop()  # Writes out everything queued
+    lines = [line for line in output.getvalue().splitlines() if line]
+    assert len(lines) == 5
+    assert lines[-1].endswith("Request 4 done")
+
+
+def test_full_queue_drops_instead_of_blocking(capture):
+    """Test a full queue counts dropped records rather than blocking the caller."""
+    logger, _, build = capture
+    handler, _ = build(start=False, queue_size=2)  # Nothing drains the queue
+    for i in range(5):
+        logger.info("Request %d done", i)
+    assert handler.dropped == 3
+
+
+def test_repeated_call_site_is_rate_limited(capture):
+    """Test repeats beyond the limit are suppressed and counted on the next window."""
+    logger, output, build = capture
+    handler, _ = build(json_format=True, repeat_limit=3, repeat_window=60)
+    for i in range(10):
+        logger.warning("Upstream error: %s", i)
+    logger.warning("Different message")
+    entries = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [entry["message"] for entry in entries] == [
+        "Upstream error: 0", "Upstream error: 1", "Upstream error: 2", "Different message",
+    ]
+
+    limiter = handler.filters[-1]
+    limiter.window = 0  # Start a new window
+    logger.warning("Upstream error: %s", "again")
+    last = json.loads(output.getvalue().splitlines()[-1])
+    assert last["suppressed"] == 7
+
+
+@pytest.mark.asyncio
+async def test_tool_call_context_in_json_records(capture):
+    """Test records logged during a tool call carry its name, call id and duration."""
+    logger, output, build = capture
+    build(json_format=True)
+    tools_logger = logging.getLogger("mcp_skeleton.tools")
+    tools_logger.handlers, tools_logger.propagate = logger.handlers, False
+    tools_logger.setLevel(logging.DEBUG)
+
+    mcp = SimpleNamespace(tool=lambda name=None, **kwargs: (lambda fn: fn))
+    log_tools(mcp)
+
+    async def lookup(key: str) -> dict:
+        logger.info("Looking up %s", key)
+        return {"key": key}
+
+    try:
+        assert await mcp.tool()(lookup)("k") == {"key": "k"}
+    finally:
+        tools_logger.handlers, tools_logger.propagate = [], True
+        tools_logger.setLevel(logging.NOTSET)
+
+    inside, finished = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert inside["message"] == "Looking up k"
+    assert inside["tool"] == finished["tool"] == "lookup"
+    assert inside["call_id"] == finished["call_id"]
+    assert finished["duration_ms"] >= 0
+
+    logger.info("Outside")
+    assert "tool" not in json.loads(output.getvalue().splitlines()[-1])
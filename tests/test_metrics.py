@@ -0,0 +1,67 @@
+"""
+Tests for Tool Metrics
+======================
+
+Shows how tool calls are measured and exposed for Prometheus.
+"""
+
+import pytest
+
+from utilities.metrics import ToolMetrics
+
+
+@pytest.mark.asyncio
+async def test_instrumented_tool_records_calls_latency_and_payload():
+    """Test a successful call updates the counters and histograms."""
+    metrics = ToolMetrics()
+
+    async def add(a: float, b: float) -> dict:
+        """Add two numbers."""
+        return {"result": a + b}
+
+    tool = metrics.instrument("add", add)
+    assert await tool(1, b=2) == {"result": 3}
+    assert tool.__name__ == "add" and tool.__doc__ == "Add two numbers."
+
+    series = metrics.series("add")
+    assert series.calls == 1
+    assert series.in_flight == 0
+    assert series.errors == {}
+    assert series.latency.count == 1
+    assert series.payload.total == len('{"result":3}')
+
+
+@pytest.mark.asyncio
+async def test_instrumented_tool_counts_errors_by_type():
+    """Test exceptions are counted per type and re-raised."""
+    metrics = ToolMetrics()
+
+    async def fail() -> dict:
+        raise ValueError("bad input")
+
+    tool = metrics.instrument("fail", fail)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await tool()
+
+    series = metrics.series("fail")
+    assert series.calls == 2
+    assert series.errors == {"ValueError": 2}
+    assert series.payload.count == 0
+
+
+@pytest.mark.asyncio
+async def test_render_prometheus_text_format():
+    """Test the exposition output contains cumulative histogram buckets."""
+    metrics = ToolMetrics()
+
+    async def echo(text: str) -> dict:
+        return {"text": text}
+
+    await metrics.instrument("echo", echo)("hi")
+    output = metrics.render()
+
+    assert "# TYPE mcp_tool_duration_seconds histogram" in output
+    assert 'mcp_tool_calls_total{tool="echo",' in output
+    assert 'le="+Inf"} 1' in output
+    assert output.endswith("\n")
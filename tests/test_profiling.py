@@ -0,0 +1,73 @@
+"""
+Tests for Tool Profiling
+========================
+
+Shows how sampled profiles and slow-call logs are produced.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+import pytest
+
+from utilities.profiling import ToolProfiler
+
+
+@pytest.mark.asyncio
+async def test_sampled_call_writes_profile(tmp_path):
+    """Test a call sampled at rate 1.0 leaves a .prof file behind."""
+    profiler = ToolProfiler()
+    profiler.profile_dir = str(tmp_path)
+    profiler.configure(sample_rate=1.0, slow_call_threshold=0)
+
+    async def add(a: float, b: float) -> dict:
+        return {"result": a + b}
+
+    assert await profiler.wrap("add", add)(a=1, b=2) == {"result": 3}
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].startswith("add-") and files[0].endswith(".prof")
+
+
+@pytest.mark.asyncio
+async def test_slow_call_logged_with_arguments_and_stack(caplog):
+    """Test a call blocking past the threshold is logged with a stack sample."""
+    profiler = ToolProfiler()
+    profiler.configure(sample_rate=0, slow_call_threshold=0.05)
+
+    async def crunch(text: str) -> dict:
+        time.sleep(0.3)  # Blocks the event loop, like a CPU-bound tool
+        return {"length": len(text)}
+
+    with caplog.at_level(logging.WARNING, logger="utilities.profiling"):
+        await profiler.wrap("crunch", crunch)(text="hello")
+
+    message = caplog.records[-1].getMessage()
+    assert "Slow tool call: crunch" in message
+    assert "text='hello'" in message
+    assert "in crunch" in message
+
+
+@pytest.mark.asyncio
+async def test_fast_calls_are_not_logged(caplog):
+    """Test calls under the threshold produce no log output."""
+    profiler = ToolProfiler()
+    profiler.configure(sample_rate=0, slow_call_threshold=5)
+
+    async def quick() -> dict:
+        await asyncio.sleep(0)
+        return {}
+
+    with caplog.at_level(logging.WARNING, logger="utilities.profiling"):
+        await profiler.wrap("quick", quick)()
+    assert not caplog.records
+
+
+def test_configure_rejects_invalid_values():
+    """Test out-of-range settings are refused."""
+    profiler = ToolProfiler()
+    with pytest.raises(ValueError):
+        profiler.configure(sample_rate=2)
+    with pytest.raises(ValueError):
+        profiler.configure(slow_call_threshold=-1)
@@ -0,0 +1,69 @@
+"""
+Tests for Result Serialization
+==============================
+
+Shows which tool results take the serialization fast path and what it produces.
+"""
+
+import json
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult, TextContent
+from pydantic import BaseModel
+
+from utilities.base_tools import ToolResponse
+from utilities.serialization import encode_result, payload_size, serialize_tools
+
+
+def test_encode_result_is_compact_json():
+    """Test a result is encoded once, compactly, as the only text content."""
+    result = {"success": True, "data": {"items": [1, 2.5, "é"]}, "error": None}
+    encoded = encode_result(result)
+    assert isinstance(encoded, CallToolResult)
+    text = encoded.content[0].text
+    assert json.loads(text) == result
+    assert " " not in text.replace("é", "")
+    assert payload_size(encoded) == len(text.encode())
+    assert payload_size(result) == len(text.encode())
+
+
+def test_tool_response_model_encoded_directly():
+    """Test a ToolResponse is encoded without converting it to a dict first."""
+    response = ToolResponse[dict](success=False, error="boom", data={"code": 7})
+    text = encode_result(response).content[0].text
+    assert json.loads(text) == {"success": False, "data": {"code": 7}, "error": "boom"}
+
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+
+@pytest.mark.asyncio
+async def test_only_unstructured_dict_results_take_fast_path():
+    """Test dict results are pre-encoded; structured and text results keep the SDK path."""
+    mcp = FastMCP("test")
+    serialize_tools(mcp)
+
+    @mcp.tool()
+    async def as_dict() -> dict:
+        return {"value": 1}
+
+    @mcp.tool()
+    async def as_model() -> Point:
+        return Point(x=1, y=2)
+
+    @mcp.tool()
+    async def as_text() -> str:
+        return "plain"
+
+    fast = await mcp.call_tool("as_dict", {})
+    assert isinstance(fast, CallToolResult)
+    assert fast.content[0].text == '{"value":1}'
+
+    content, structured = await mcp.call_tool("as_model", {})
+    assert structured == {"x": 1, "y": 2}
+
+    content, structured = await mcp.call_tool("as_text", {})
+    assert isinstance(content[0], TextContent) and structured == {"result": "plain"}
@@ -0,0 +1,75 @@
+"""
+Tests for Single-Flight Coalescing
+==================================
+
+Shows how concurrent callers share one execution, and how cancelling one
+caller does not take the shared call away from the others.
+"""
+
+import asyncio
+
+import pytest
+
+from utilities.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    """Test callers arriving while a call is in flight get its result without running it."""
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(flight.run("key", work) for _ in range(3)))
+    assert results == [("value", False), ("value", True), ("value", True)]
+    assert calls == [1]
+    assert "key" not in flight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_leaves_the_call_to_followers():
+    """Test a follower still gets the result when the caller that started the call is cancelled."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(flight.run("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.run("key", work))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await follower == ("value", True)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_call_cancelled_once_every_caller_is_gone():
+    """Test the shared call stops when all of its callers are cancelled."""
+    flight = SingleFlight()
+    stopped = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            stopped.set()
+            raise
+
+    callers = [asyncio.create_task(flight.run("key", work)) for _ in range(2)]
+    await asyncio.sleep(0)
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.wait_for(stopped.wait(), 1)
+    assert "key" not in flight
@@ -7,7 +7,19 @@ Replace these tests with tests for YOUR data processing.
 """
 
 import pytest
-from tools.text_tools import text_analyzer
+from mcp.server.fastmcp import FastMCP
+
+import tools.text_tools as text_tools
+from tools.text_tools import (
+    analyze_file_stats,
+    analyze_text_stats,
+    batch_text_analyzer,
+    file_text_analyzer,
+    resolve_source,
+    shutdown_process_pool,
+    text_analyzer,
+)
+from utilities.config import settings
 
 
 @pytest.mark.asyncio
@@ -58,3 +70,149 @@ async def test_text_analyzer_statistics():
     assert "shortest_word" in result
     assert result["longest_word"] == "quick"  # Longest word by length
 
+
+
+def test_scanner_stitches_words_across_chunks(monkeypatch):
+    """Test words split by a chunk boundary are counted once, whole."""
+    text = "Tiny extraordinarily long words. Yes! Ok? a"
+    expected = analyze_text_stats(text)
+    monkeypatch.setattr(text_tools, "_CHUNK_SIZE", 3)
+    result = analyze_text_stats(text)
+
+    assert result == expected
+    assert result["word_count"] == 7
+    assert result["longest_word"] == "extraordinarily"
+    assert result["shortest_word"] == "a"
+    assert result["sentence_count"] == 3
+
+
+def test_scanner_whitespace_only():
+    """Test whitespace-only text has no words or sentences."""
+    result = analyze_text_stats(" \n\t  ")
+    assert result["word_count"] == 0
+    assert result["sentence_count"] == 0
+    assert result["characters_no_spaces"] == 2
+
+
+@pytest.mark.asyncio
+async def test_text_analyzer_offloads_large_input(monkeypatch):
+    """Test inputs above the threshold are analyzed off the event loop."""
+    monkeypatch.setattr(settings, "text_offload_threshold", 10)
+    result = await text_analyzer("Hello world. " * 10)
+    assert result["word_count"] == 20
+    assert result["sentence_count"] == 10
+
+
+@pytest.mark.asyncio
+async def test_text_analyzer_reports_running_counts(monkeypatch, call_with_progress):
+    """Test a client asking for progress receives running statistics while text is scanned."""
+    monkeypatch.setattr(settings, "text_offload_threshold", 10)
+    monkeypatch.setattr(settings, "progress_min_interval", 0.0)
+    monkeypatch.setattr(text_tools, "_CHUNK_SIZE", 13)
+    mcp = FastMCP("test")
+    mcp.tool()(text_analyzer)
+
+    result, received = await call_with_progress(mcp, "text_analyzer", {"text": "Progress on. " * 4})
+    assert not result.isError
+    assert [p.progress for p in received] == [13, 26, 39, 52]
+    assert {p.total for p in received} == {52}
+    assert received[1].meta.partial["word_count"] == 4
+    assert received[1].message == "4 words, 2 sentences"
+
+
+@pytest.mark.asyncio
+async def test_batch_text_analyzer_inline(sample_text):
+    """Test small batches return per-document and corpus statistics."""
+    texts = [sample_text, "", "Hi. Bye!"]
+    result = await batch_text_analyzer(texts)
+
+    assert [doc["word_count"] for doc in result["documents"]] == [9, 0, 2]
+    assert result["corpus"]["document_count"] == 3
+    assert result["corpus"]["word_count"] == 11
+    assert result["corpus"]["sentence_count"] == 2
+    assert result["corpus"]["longest_word"] == "quick"
+    assert result["corpus"]["shortest_word"] == "The"
+
+
+@pytest.mark.asyncio
+async def test_batch_text_analyzer_process_pool(monkeypatch):
+    """Test large batches are spread over the process pool in input order."""
+    monkeypatch.setattr(settings, "text_batch_inline_threshold", 0)
+    monkeypatch.setattr(settings, "text_process_workers", 2)
+    texts = [("word " * (i + 1)).strip() for i in range(20)]
+    try:
+        result = await batch_text_analyzer(texts)
+    finally:
+        shutdown_process_pool()
+
+    assert [doc["word_count"] for doc in result["documents"]] == list(range(1, 21))
+    assert result["corpus"]["word_count"] == sum(range(1, 21))
+
+
+@pytest.mark.asyncio
+async def test_batch_text_analyzer_limit(monkeypatch):
+    """Test oversized batches are rejected."""
+    monkeypatch.setattr(settings, "text_batch_max_documents", 1)
+    with pytest.raises(ValueError, match="Too many documents"):
+        await batch_text_analyzer(["a", "b"])
+
+
+@pytest.fixture
+def documents(tmp_path, monkeypatch):
+    """Directory clients may pass files from."""
+    root = tmp_path / "documents"
+    root.mkdir()
+    monkeypatch.setattr(settings, "text_file_roots", str(root))
+    return root
+
+
+def test_file_scanned_in_slices_matches_inline(documents, monkeypatch):
+    """Test mapped files give the inline result, even with characters split between slices."""
+    text = "Café naïve résumé. 日本語 text! Über-long words?\n" * 50
+    path = documents / "doc.txt"
+    path.write_text(text, encoding="utf-8")
+    expected = analyze_text_stats(text)
+    monkeypatch.setattr(text_tools, "_CHUNK_SIZE", 7)
+    assert analyze_file_stats(str(path)) == expected
+    (documents / "empty.txt").write_bytes(b"")
+    assert analyze_file_stats(str(documents / "empty.txt")) == analyze_text_stats("")
+
+
+def test_sources_limited_to_file_roots(documents, tmp_path, monkeypatch):
+    """Test paths and file:// URIs resolve only to files under the configured roots."""
+    (documents / "a.txt").write_text("a")
+    (tmp_path / "secret.txt").write_text("s")
+    assert resolve_source("a.txt") == str((documents / "a.txt").resolve())
+    assert resolve_source((documents / "a.txt").as_uri()) == str((documents / "a.txt").resolve())
+    for source in ("../secret.txt", str(tmp_path / "secret.txt"), "missing.txt", "."):
+        with pytest.raises(ValueError):
+            resolve_source(source)
+    with pytest.raises(ValueError, match="Unsupported source URI"):
+        resolve_source("https://example.com/a.txt")
+    monkeypatch.setattr(settings, "text_file_roots", "")
+    with pytest.raises(ValueError, match="disabled"):
+        resolve_source("a.txt")
+
+
+@pytest.mark.asyncio
+async def test_file_results_memoized_per_file_version(documents, monkeypatch):
+    """Test an unchanged file is answered from cache and a modified one rescanned."""
+    monkeypatch.setattr(settings, "text_offload_threshold", 10)
+    path = documents / "doc.txt"
+    path.write_text("one two three")
+    assert (await file_text_analyzer("doc.txt"))["word_count"] == 3
+    hits = text_tools._file_analyzer.cache.hits
+    assert (await file_text_analyzer("doc.txt"))["word_count"] == 3
+    assert text_tools._file_analyzer.cache.hits == hits + 1
+
+    path.write_text("one two three four")
+    assert (await file_text_analyzer("doc.txt"))["word_count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_analyzes_texts_then_sources(documents):
+    """Test a batch mixes inline texts and files, in that order."""
+    (documents / "b.txt").write_text("three words here")
+    result = await batch_text_analyzer(["one"], ["b.txt"])
+    assert [doc["word_count"] for doc in result["documents"]] == [1, 3]
+    assert result["corpus"]["document_count"] == 2
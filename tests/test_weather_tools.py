@@ -6,8 +6,18 @@ Example test cases showing how to test API integration patterns.
 Replace these tests with tests for YOUR API integrations.
 """
 
+import asyncio
+
 import pytest
-from tools.weather_tools import get_weather_data
+
+from tools.weather_tools import (
+    MockWeatherProvider,
+    WeatherProvider,
+    get_weather_data,
+    prewarm_weather_cache,
+    set_weather_provider,
+)
+from utilities.config import settings
 
 
 @pytest.mark.asyncio
@@ -41,3 +51,68 @@ async def test_get_weather_data_mock_values():
     assert isinstance(result["humidity"], (int, float))
     assert isinstance(result["wind_speed"], (int, float))
 
+
+
+class CountingProvider(WeatherProvider):
+    """Stand-in provider that counts upstream calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch(self, city):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"city": city, "temperature": self.calls}
+
+
+@pytest.fixture
+def provider():
+    """Plug a counting provider in front of the weather cache."""
+    counting = CountingProvider()
+    set_weather_provider(counting)
+    yield counting
+    set_weather_provider(MockWeatherProvider())
+
+
+@pytest.mark.asyncio
+async def test_weather_cache_hit(provider):
+    """Test fresh data is served without calling the provider again."""
+    first = await get_weather_data("Oslo")
+    second = await get_weather_data("oslo ")
+    assert first["cache"]["status"] == "miss"
+    assert second["cache"]["status"] == "hit"
+    assert provider.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_weather_cache_coalesces_concurrent_requests(provider):
+    """Test concurrent requests for one city share a provider call."""
+    results = await asyncio.gather(*[get_weather_data("Lima") for _ in range(5)])
+    assert provider.calls == 1
+    assert {result["temperature"] for result in results} == {1}
+
+
+@pytest.mark.asyncio
+async def test_weather_cache_serves_stale_while_refreshing(provider, monkeypatch):
+    """Test stale data is returned immediately and refreshed in the background."""
+    await get_weather_data("Rome")
+    monkeypatch.setattr(settings, "weather_cache_ttl", 0)
+
+    stale = await get_weather_data("Rome")
+    assert stale["cache"]["status"] == "stale"
+    assert stale["temperature"] == 1
+
+    await asyncio.sleep(0.05)
+    assert provider.calls == 2
+    monkeypatch.setattr(settings, "weather_cache_ttl", 300)
+    refreshed = await get_weather_data("Rome")
+    assert refreshed["temperature"] == 2
+
+
+@pytest.mark.asyncio
+async def test_weather_prewarm(provider):
+    """Test pre-warmed cities are served from cache."""
+    await prewarm_weather_cache(["Cairo", "Delhi"])
+    result = await get_weather_data("Cairo")
+    assert result["cache"]["status"] == "hit"
+    assert provider.calls == 2
@@ -50,7 +50,7 @@ HOW TO ADD YOUR OWN TOOLS:
    ```
    
 3. Export it here in __init__.py:
-   Add to imports and __all__ list
+   Add it to the _MANIFEST mapping (name -> module); it is imported on first use
    
 4. Register in mcp_server.py:
    ```python
@@ -65,15 +65,37 @@ and reusable across different MCP server implementations.
 """
 
 # Example Tool Implementations (Replace with your own)
-from .calculator_tools import calculate_operation  # Tool 1: Math operations
-from .weather_tools import get_weather_data        # Tool 2: API integration
-from .http_tools import fetch_api_data             # Tool 3: HTTP requests
-from .text_tools import text_analyzer              # Tool 4: Text processing
+# Manifest of exported names -> defining module. Modules are imported on first
+# attribute access, so importing one tool module does not import them all.
+_MANIFEST = {
+    'calculate_operation':   'calculator_tools',  # Tool 1: Math operations
+    'calculate_batch':       'calculator_tools',  # Tool 1
+    'evaluate_expression':   'calculator_tools',  # Tool 1
+    'get_weather_data':      'weather_tools',     # Tool 2: API integration
+    'prewarm_weather_cache': 'weather_tools',     # Tool 2
+    'set_weather_provider':  'weather_tools',     # Tool 2
+    'WeatherProvider':       'weather_tools',     # Tool 2
+    'fetch_api_data':        'http_tools',        # Tool 3: HTTP requests
+    'fetch_many':            'http_tools',        # Tool 3
+    'get_http_pool_stats':   'http_tools',        # Tool 3
+    'text_analyzer':         'text_tools',        # Tool 4: Text processing
+    'batch_text_analyzer':   'text_tools',        # Tool 4
+    'file_text_analyzer':    'text_tools',        # Tool 4
+}
 
 # Export all tool functions for server registration
-__all__ = [
-    'calculate_operation',  # Tool 1
-    'get_weather_data',     # Tool 2
-    'fetch_api_data',       # Tool 3
-    'text_analyzer',        # Tool 4
-]
+__all__ = list(_MANIFEST)
+
+
+def __getattr__(name):
+    """Import the module defining a tool the first time it is accessed."""
+    if name in _MANIFEST:
+        import importlib
+        value = getattr(importlib.import_module(f".{_MANIFEST[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
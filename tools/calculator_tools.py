@@ -4,42 +4,287 @@ Calculator tools for MCP Skeleton.
 Provides mathematical calculation capabilities.
 """
 
-from typing import Dict, Any
+import ast
+import math
+import operator
+from functools import lru_cache
+from types import CodeType
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+
+from utilities.config import settings
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency: poetry install -E vector
+    np = None
+
+Operand = Union[float, Sequence[float]]
+BatchResult = Tuple[List[Optional[float]], List[Dict[str, Any]]]
+
+# Built once at import time instead of on every call
+_OPERATIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+}
+
+_DIVISION_BY_ZERO = "Division by zero is not allowed"
+_NOT_FINITE = "Result is not a finite number"
+_LENGTH_MISMATCH = "Operand lists must have the same length, or one operand must be a number"
+
+
+def _check_operation(operation: str) -> None:
+    """Raise ValueError for operations the calculator does not support."""
+    if operation not in _OPERATIONS:
+        raise ValueError(f"Unsupported operation: {operation}. Choose from: {list(_OPERATIONS.keys())}")
 
 
 async def calculate_operation(operation: str, a: float, b: float) -> Dict[str, Any]:
     """
     Perform a mathematical operation.
-    
+
     Args:
         operation: Type of operation (add, subtract, multiply, divide)
         a: First number
         b: Second number
-        
+
     Returns:
         Dictionary containing the result
-        
+
     Raises:
         ValueError: If operation is not supported or division by zero
     """
-    operations = {
-        "add": lambda x, y: x + y,
-        "subtract": lambda x, y: x - y,
-        "multiply": lambda x, y: x * y,
-        "divide": lambda x, y: x / y if y != 0 else None
-    }
-    
-    if operation not in operations:
-        raise ValueError(f"Unsupported operation: {operation}. Choose from: {list(operations.keys())}")
-    
-    result = operations[operation](a, b)
-    
-    if result is None:
-        raise ValueError("Division by zero is not allowed")
-    
+    _check_operation(operation)
+
+    if operation == "divide" and b == 0:
+        raise ValueError(_DIVISION_BY_ZERO)
+
+    result = _OPERATIONS[operation](a, b)
+
     return {
         "operation": operation,
         "operand_a": a,
         "operand_b": b,
         "result": result
     }
+
+
+def _batch_numpy(operation: str, a: Operand, b: Operand) -> BatchResult:
+    """Vectorized evaluation with NumPy; invalid elements are found with array masks."""
+    x = np.asarray(a, dtype=np.float64)
+    y = np.asarray(b, dtype=np.float64)
+    if x.ndim > 1 or y.ndim > 1:
+        raise ValueError("Operands must be numbers or flat lists of numbers")
+    try:
+        x, y = np.broadcast_arrays(np.atleast_1d(x), np.atleast_1d(y))
+    except ValueError:
+        raise ValueError(_LENGTH_MISMATCH)
+
+    with np.errstate(all="ignore"):
+        result = _OPERATIONS[operation](x, y)
+
+    invalid = ~np.isfinite(result)
+    if not invalid.any():
+        return result.tolist(), []
+
+    zero_divisor = (y == 0) if operation == "divide" else np.zeros_like(invalid)
+    results = result.astype(object)
+    results[invalid] = None
+    errors = [
+        {"index": int(index), "error": _DIVISION_BY_ZERO if zero_divisor[index] else _NOT_FINITE}
+        for index in np.flatnonzero(invalid)
+    ]
+    return results.tolist(), errors
+
+
+def _batch_python(operation: str, a: Operand, b: Operand) -> BatchResult:
+    """Pure-Python fallback used when NumPy is not installed."""
+    xs = [float(v) for v in a] if isinstance(a, (list, tuple)) else None
+    ys = [float(v) for v in b] if isinstance(b, (list, tuple)) else None
+    if xs is None and ys is None:
+        xs, ys = [float(a)], [float(b)]
+    elif xs is None:
+        xs = [float(a)] * len(ys)
+    elif ys is None:
+        ys = [float(b)] * len(xs)
+    elif len(xs) != len(ys):
+        raise ValueError(_LENGTH_MISMATCH)
+
+    fn = _OPERATIONS[operation]
+    results: List[Optional[float]] = []
+    errors: List[Dict[str, Any]] = []
+    for index, (x, y) in enumerate(zip(xs, ys)):
+        if operation == "divide" and y == 0:
+            results.append(None)
+            errors.append({"index": index, "error": _DIVISION_BY_ZERO})
+            continue
+        value = fn(x, y)
+        if math.isfinite(value):
+            results.append(value)
+        else:
+            results.append(None)
+            errors.append({"index": index, "error": _NOT_FINITE})
+    return results, errors
+
+
+async def calculate_batch(operation: str, a: Operand, b: Operand) -> Dict[str, Any]:
+    """
+    Perform a mathematical operation element-wise over arrays of operands.
+
+    Either operand may be a single number, which is broadcast against the
+    other list. Uses NumPy vectorized arithmetic when it is installed (the
+    'vector' extra) and a pure-Python loop otherwise.
+
+    Division by zero and non-finite results do not fail the request: the
+    element's result is None and the problem is listed under "errors".
+
+    Args:
+        operation: Type of operation (add, subtract, multiply, divide)
+        a: First operand - a number or a list of numbers
+        b: Second operand - a number or a list of numbers
+
+    Returns:
+        Dictionary containing the results in input order and per-element errors
+
+    Raises:
+        ValueError: If the operation is unsupported, the operand lengths do not
+            match or the batch exceeds settings.calculator_batch_max_items
+    """
+    _check_operation(operation)
+    limit = settings.calculator_batch_max_items
+    for operand in (a, b):
+        if isinstance(operand, (list, tuple)) and len(operand) > limit:
+            raise ValueError(f"Too many operands: {len(operand)} (max {limit})")
+
+    if np is not None:
+        results, errors = _batch_numpy(operation, a, b)
+    else:
+        results, errors = _batch_python(operation, a, b)
+
+    return {
+        "operation": operation,
+        "count": len(results),
+        "results": results,
+        "errors": errors
+    }
+
+
+# AST nodes an expression may contain: numbers, variables, parentheses and the
+# calculator's operations. Anything else (calls, attributes, subscripts, ...)
+# is rejected before compilation, so evaluation cannot reach arbitrary code.
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.UAdd, ast.USub,
+)
+
+
+def _compile_expression(expression: str) -> Tuple[CodeType, Tuple[str, ...]]:
+    """
+    Parse and validate an arithmetic expression and compile it once.
+
+    Args:
+        expression: Expression text, e.g. "(price - cost) / price"
+
+    Returns:
+        Tuple of (compiled code object, sorted variable names)
+
+    Raises:
+        ValueError: If the expression is malformed or uses unsupported syntax
+    """
+    if len(expression) > settings.expression_max_length:
+        raise ValueError(f"Expression too long (max {settings.expression_max_length} characters)")
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e.msg}")
+
+    variables = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise ValueError(f"Unsupported constant in expression: {node.value!r}")
+        if isinstance(node, ast.Name):
+            variables.add(node.id)
+
+    return compile(tree, "<expression>", "eval"), tuple(sorted(variables))
+
+
+def _check_binding(binding: Dict[str, Any], variables: Tuple[str, ...]) -> Optional[str]:
+    """Return an error message if a binding lacks a variable or holds a non-number."""
+    for name in variables:
+        value = binding.get(name)
+        if value is None:
+            return f"Missing variable: {name}"
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return f"Variable '{name}' is not a number"
+    return None
+
+
+# Compiled expressions keyed by expression text
+_compile_cached = lru_cache(maxsize=settings.expression_cache_size)(_compile_expression)
+
+
+async def evaluate_expression(expression: str, bindings: List[Dict[str, float]]) -> Dict[str, Any]:
+    """
+    Evaluate an arithmetic expression over many sets of variable bindings.
+
+    The expression is parsed to an AST, validated against a whitelist of
+    node types and compiled once; the compiled form is kept in an LRU cache
+    keyed by the expression text, so repeated calls skip parsing entirely.
+
+    Supported syntax: numbers, variable names, parentheses, unary +/- and
+    the calculator operations (+, -, *, /).
+
+    Args:
+        expression: Arithmetic expression, e.g. "a * b + c"
+        bindings: List of variable bindings, e.g. [{"a": 1, "b": 2, "c": 3}]
+
+    Returns:
+        Dictionary containing one result per binding (in input order) and
+        per-binding errors such as division by zero or missing variables
+
+    Raises:
+        ValueError: If the expression is invalid or there are too many bindings
+    """
+    limit = settings.expression_max_bindings
+    if len(bindings) > limit:
+        raise ValueError(f"Too many bindings: {len(bindings)} (max {limit})")
+
+    code, variables = _compile_cached(expression)
+    no_builtins: Dict[str, Any] = {"__builtins__": {}}
+
+    results: List[Optional[float]] = []
+    errors: List[Dict[str, Any]] = []
+    for index, binding in enumerate(bindings):
+        problem = _check_binding(binding, variables)
+        if problem:
+            results.append(None)
+            errors.append({"index": index, "error": problem})
+            continue
+        try:
+            value = eval(code, no_builtins, binding)
+        except ZeroDivisionError:
+            results.append(None)
+            errors.append({"index": index, "error": _DIVISION_BY_ZERO})
+            continue
+        except OverflowError:
+            value = math.inf
+        if isinstance(value, float) and not math.isfinite(value):
+            results.append(None)
+            errors.append({"index": index, "error": _NOT_FINITE})
+        else:
+            results.append(value)
+
+    cache_info = _compile_cached.cache_info()
+    return {
+        "expression": expression,
+        "variables": list(variables),
+        "count": len(results),
+        "results": results,
+        "errors": errors,
+        "cache": {"hits": cache_info.hits, "misses": cache_info.misses, "size": cache_info.currsize}
+    }
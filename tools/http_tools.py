@@ -4,53 +4,457 @@ HTTP request tools for MCP Skeleton.
 Provides capabilities to make HTTP requests to external APIs.
 """
 
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
 import httpx
-from typing import Dict, Any
 
+from utilities.base_tools import BaseTools
+from utilities.config import settings
+from utilities.deadlines import bounded_timeout
+from utilities.disk_cache import DiskCache, disk_cache
+from utilities.http_client import http_pool
+from utilities.singleflight import SingleFlight
+
+CacheKey = Tuple[str, int, Tuple[Tuple[str, str], ...]]
+
+_tools = BaseTools("http_tools")
+
+# Expired responses with an ETag or Last-Modified stay on disk this long, so a
+# new process can still revalidate them instead of refetching the body
+_DISK_REVALIDATE_SECONDS = 86_400.0
+
+
+@dataclass
+class _CacheEntry:
+    """A cached GET result plus the validators needed to revalidate it."""
+    result: Dict[str, Any]
+    expires_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+def _cache_ttl(headers: httpx.Headers) -> Optional[float]:
+    """
+    Derive a freshness lifetime from the upstream Cache-Control header.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Seconds the response stays fresh (0 means "store, but revalidate
+        before reuse"), or None if the response must not be stored
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+
+    for name in ("s-maxage", "max-age"):
+        value = directives.get(name)
+        if value is not None:
+            try:
+                ttl = float(value)
+            except ValueError:
+                return 0.0
+            try:
+                ttl -= float(headers.get("age", 0))
+            except ValueError:
+                pass
+            return max(ttl, 0.0)
+    return 0.0
+
+
+@dataclass
+class _Fetched:
+    """An upstream response whose body has been read (up to max_bytes) and decoded."""
+    status_code: int
+    url: str
+    headers: httpx.Headers
+    data: Any
+    truncated: bool
+    size: int
+
+    def as_result(self) -> Dict[str, Any]:
+        """Build the tool result dictionary."""
+        return {
+            "status_code": self.status_code,
+            "url": self.url,
+            "data": self.data,
+            "truncated": self.truncated
+        }
+
+
+def _decode_body(response: httpx.Response, body: bytearray, truncated: bool) -> Any:
+    """
+    Decode a response body exactly once.
+
+    JSON is parsed straight from the raw bytes, so no intermediate text copy
+    is kept next to the parsed value. Truncated JSON cannot be parsed and is
+    returned as (partial) text instead.
+    """
+    if not truncated and response.headers.get("content-type", "").startswith("application/json"):
+        try:
+            return json.loads(body)
+        except ValueError:
+            # If JSON parsing fails, fall back to text
+            pass
+    return body.decode(response.encoding or "utf-8", errors="replace")
+
+
+async def _send(method: str, url: str, headers: Dict[str, str], max_bytes: int) -> _Fetched:
+    """
+    Send one request through the shared client, honouring the per-host cap.
+
+    The body is streamed and reading stops once max_bytes have been received,
+    so peak memory per call is bounded regardless of the upstream payload size.
+    Clients that ask for progress are told how many bytes have arrived.
+    """
+    if method.upper() not in ("GET", "POST"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
+
+    client = http_pool.client
+    # Never wait on the upstream longer than the tool call's deadline allows
+    timeout = bounded_timeout(settings.http_timeout)
+    async with http_pool.host_slot(url):
+        async with client.stream(method.upper(), url, headers=headers, timeout=timeout) as response:
+            body = bytearray()
+            truncated = False
+            length = response.headers.get("content-length", "")
+            total = min(int(length), max_bytes) if length.isdigit() else None
+            async with _tools.progress(total=total) as progress:
+                async for chunk in response.aiter_bytes():
+                    room = max_bytes - len(body)
+                    if len(chunk) > room:
+                        body += chunk[:room]
+                        truncated = True
+                        break
+                    body += chunk
+                    if progress.due():
+                        progress.report(
+                            len(body),
+                            message=f"{len(body)} bytes received",
+                            partial={"status_code": response.status_code, "bytes": len(body)},
+                        )
+
+            return _Fetched(
+                status_code=response.status_code,
+                url=str(response.url),
+                headers=response.headers,
+                data=_decode_body(response, body, truncated),
+                truncated=truncated,
+                size=len(body),
+            )
+
+
+def _raise_for_status(fetched: _Fetched, url: str, method: str) -> None:
+    """Raise httpx.HTTPStatusError for non-2xx responses."""
+    if not 200 <= fetched.status_code < 300:
+        request = httpx.Request(method, url)
+        response = httpx.Response(fetched.status_code, request=request)
+        response.raise_for_status()
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache for GET responses.
+
+    - Freshness comes from the upstream Cache-Control header
+    - Stale entries with an ETag or Last-Modified are revalidated with a
+      conditional request, so unchanged bodies cost a 304
+    - Concurrent identical requests share one upstream call (single-flight)
+    - With a disk tier, entries are written through to it and looked up
+      there on a miss, so other workers and restarted processes reuse them
+    """
+
+    def __init__(self, disk: Optional[DiskCache] = None) -> None:
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._inflight = SingleFlight()
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.coalesced = 0
+        self.disk_hits = 0
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.revalidations = self.coalesced = self.disk_hits = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters and the current number of entries."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "coalesced": self.coalesced,
+            "disk_hits": self.disk_hits,
+            "entries": len(self._entries),
+        }
+
+    async def get(
+        self, url: str, headers: Dict[str, str], max_bytes: int
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Return the result for a GET request, from cache when possible.
+
+        Args:
+            url: Request URL
+            headers: Request headers (part of the cache key)
+            max_bytes: Body size limit (part of the cache key)
+
+        Returns:
+            Tuple of (result dictionary, cache status) where the status is one
+            of "hit", "miss", "revalidated" or "coalesced"
+        """
+        key: CacheKey = (
+            url, max_bytes, tuple(sorted((k.lower(), v) for k, v in headers.items()))
+        )
+        entry = self._entries.get(key)
+        from_disk = False
+        if entry is None and self.disk is not None:
+            entry = await self._from_disk(key)
+            from_disk = entry is not None
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.disk_hits += from_disk  # Stale entries from disk are only revalidated
+            return entry.result, "hit"
+
+        outcome, shared = await self._inflight.run(
+            key, lambda: self._load(key, url, headers, max_bytes, entry)
+        )
+        if shared:
+            self.coalesced += 1
+            return outcome[0], "coalesced"
+        return outcome
 
-async def fetch_api_data(url: str, method: str = "GET", headers: Dict[str, str] = None) -> Dict[str, Any]:
+    async def _load(
+        self,
+        key: CacheKey,
+        url: str,
+        headers: Dict[str, str],
+        max_bytes: int,
+        entry: Optional[_CacheEntry],
+    ) -> Tuple[Dict[str, Any], str]:
+        """Fetch from upstream, revalidating the stale entry if it has validators."""
+        request_headers = dict(headers)
+        if entry is not None:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        fetched = await _send("GET", url, request_headers, max_bytes)
+
+        if fetched.status_code == 304 and entry is not None:
+            self.revalidations += 1
+            ttl = _cache_ttl(fetched.headers) or 0.0
+            entry.expires_at = time.monotonic() + ttl
+            self._remember(key, entry, ttl)
+            return entry.result, "revalidated"
+
+        self._entries.pop(key, None)
+        _raise_for_status(fetched, url, "GET")
+        self.misses += 1
+
+        result = fetched.as_result()
+        self._store(key, fetched, result)
+        return result, "miss"
+
+    def _store(self, key: CacheKey, fetched: _Fetched, result: Dict[str, Any]) -> None:
+        """Store a response if it is cacheable, evicting least recently used entries."""
+        ttl = _cache_ttl(fetched.headers)
+        etag = fetched.headers.get("etag")
+        last_modified = fetched.headers.get("last-modified")
+        if ttl is None or (ttl == 0 and not (etag or last_modified)):
+            return
+        if fetched.truncated or fetched.size > settings.http_cache_max_entry_bytes:
+            return
+
+        self._remember(key, _CacheEntry(result, time.monotonic() + ttl, etag, last_modified), ttl)
+
+    def _remember(self, key: CacheKey, entry: _CacheEntry, ttl: float) -> None:
+        """Keep an entry in memory and write it through to the disk tier."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.http_cache_max_entries:
+            self._entries.popitem(last=False)
+        if self.disk is not None:
+            keep = _DISK_REVALIDATE_SECONDS if entry.etag or entry.last_modified else 0.0
+            stored = {
+                "result": entry.result, "etag": entry.etag, "last_modified": entry.last_modified
+            }
+            self.disk.store("http", json.dumps(key), stored, ttl, keep)
+
+    async def _from_disk(self, key: CacheKey) -> Optional[_CacheEntry]:
+        """Load an entry stored by any process into memory, fresh or revalidatable."""
+        if self.disk is None:
+            return None
+        found = await self.disk.lookup("http", json.dumps(key))
+        if found is None:
+            return None
+        stored, expires_at = found
+        entry = _CacheEntry(
+            stored["result"],
+            time.monotonic() + (expires_at - time.time()),
+            stored["etag"],
+            stored["last_modified"],
+        )
+        self._entries[key] = entry
+        while len(self._entries) > settings.http_cache_max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+
+# Global cache instance for http_request
+response_cache = ResponseCache(disk_cache)
+
+
+async def fetch_api_data(
+    url: str,
+    method: str = "GET",
+    headers: Dict[str, str] = None,
+    max_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Make an HTTP request to an external API.
-    
+
+    Requests go through the shared, pooled client in utilities.http_client so
+    keep-alive connections are reused across tool calls. GET responses are
+    served from the response cache when the upstream allows it; the "cache"
+    key of the result reports how the call was served.
+
+    The body is streamed and reading stops after max_bytes; "truncated" in the
+    result tells whether the body was cut short.
+
     Args:
         url: The URL to fetch data from
         method: HTTP method (GET, POST, etc.)
         headers: Optional HTTP headers
-        
+        max_bytes: Maximum body size to read, defaults to settings.http_max_response_bytes
+
     Returns:
         Dictionary containing the response data
-        
+
     Raises:
         Exception: If the request fails
     """
-    async with httpx.AsyncClient() as client:
-        try:
-            if method.upper() == "GET":
-                response = await client.get(url, headers=headers or {})
-            elif method.upper() == "POST":
-                response = await client.post(url, headers=headers or {})
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            response.raise_for_status()
-            
-            # Try to parse JSON if content-type suggests it
-            data = response.text
-            if response.headers.get("content-type", "").startswith("application/json"):
-                try:
-                    data = response.json()
-                except ValueError:
-                    # If JSON parsing fails, fall back to text
-                    data = response.text
-            
-            return {
-                "status_code": response.status_code,
-                "url": str(response.url),
-                "data": data
-            }
-        except Exception as e:
+    if max_bytes is None:
+        max_bytes = settings.http_max_response_bytes
+    try:
+        if method.upper() == "GET" and settings.http_cache_enabled:
+            result, cache_status = await response_cache.get(url, headers or {}, max_bytes)
+            result = dict(result)
+        else:
+            fetched = await _send(method, url, headers or {}, max_bytes)
+            _raise_for_status(fetched, url, method.upper())
+            cache_status = "bypass"
+            result = fetched.as_result()
+
+        result["cache"] = {"status": cache_status, **response_cache.stats()}
+        return result
+    except Exception as e:
+        return {
+            "error": str(e),
+            "url": url,
+            "method": method
+        }
+
+
+async def fetch_many(
+    requests: List[Dict[str, Any]],
+    max_concurrency: Optional[int] = None,
+    max_per_host: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch several URLs concurrently with bounded fan-out.
+
+    Each item is fetched with fetch_api_data, so pooling, caching and size
+    limits apply. At most max_concurrency requests run at once overall and at
+    most max_per_host against any single host; both are capped by their
+    settings, so callers can only lower them.
+
+    Args:
+        requests: List of request specs: {"url": str, "method": str, "headers": dict}
+        max_concurrency: Global in-flight limit, capped by settings.http_batch_max_concurrency
+        max_per_host: Per-host in-flight limit, capped by settings.http_batch_max_per_host
+
+    Returns:
+        Dictionary with per-request results in input order and error count
+
+    Raises:
+        ValueError: If the batch exceeds settings.http_batch_max_items
+    """
+    if len(requests) > settings.http_batch_max_items:
+        raise ValueError(
+            f"Too many requests in batch: {len(requests)} (max {settings.http_batch_max_items})"
+        )
+
+    concurrency = min(
+        max_concurrency or settings.http_batch_max_concurrency, settings.http_batch_max_concurrency
+    )
+    global_limit = asyncio.Semaphore(max(concurrency, 1))
+    per_host = max(
+        min(max_per_host or settings.http_batch_max_per_host, settings.http_batch_max_per_host), 1
+    )
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def run_one(spec: Dict[str, Any]) -> Dict[str, Any]:
+        url = spec.get("url") if isinstance(spec, dict) else None
+        method = spec.get("method", "GET") if isinstance(spec, dict) else "GET"
+        if not isinstance(url, str) or not url:
             return {
-                "error": str(e),
+                "error": "Request spec must include a 'url' string",
                 "url": url,
                 "method": method
             }
+        try:
+            host = httpx.URL(url).host
+        except Exception as e:
+            return {"error": str(e), "url": url, "method": method}
+
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(per_host)
+        async with host_limits[host], global_limit:
+            result = await fetch_api_data(url, method, spec.get("headers"))
+        finished["requests"] += 1
+        finished["errors"] += "error" in result
+        progress.report(
+            finished["requests"],
+            message=f"{finished['requests']} of {len(requests)} requests finished",
+            partial=dict(finished),
+        )
+        return result
+
+    finished = {"requests": 0, "errors": 0}
+    # One progress sequence for the batch: the fetches do not report their own
+    async with _tools.progress(total=len(requests)) as progress:
+        results = await asyncio.gather(*(run_one(spec) for spec in requests))
+    return {
+        "count": len(results),
+        "errors": sum(1 for result in results if "error" in result),
+        "results": list(results)
+    }
+
+
+async def get_http_pool_stats() -> Dict[str, Any]:
+    """
+    Report usage of the shared HTTP connection pool.
+
+    Returns:
+        Dictionary with connections in use, idle connections, waiting requests
+        and the configured limits
+    """
+    return http_pool.stats()
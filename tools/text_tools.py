@@ -2,41 +2,404 @@
 Text analysis tools for MCP Skeleton.
 
 Provides text analysis capabilities including statistics and basic metrics.
+Documents can be passed inline or, for large inputs, by reference as a file
+path or file:// URI under settings.text_file_roots; such files are
+memory-mapped and scanned in slices instead of travelling in the request.
 """
 
-from typing import Dict, Any
+import asyncio
+import codecs
+import logging
+import mmap
+import multiprocessing
+import os
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
+from utilities.base_tools import BaseTools, ProgressReporter, memoize
+from utilities.config import settings
 
+logger = logging.getLogger(__name__)
+_tools = BaseTools("text_tools")
+
+# Size of the slices the scanner walks through. Large enough that the C-level
+# str primitives dominate, small enough that each slice stays cache-resident
+# and that per-slice word lists stay small.
+_CHUNK_SIZE = 1 << 18
+
+_SENTENCE_MARKS = (".", "!", "?")
+
+
+class _TextStats:
+    """Running statistics accumulated by the single-pass scanner."""
+
+    def __init__(self) -> None:
+        self.characters = 0
+        self.spaces = 0
+        self.sentence_marks = 0
+        self.word_count = 0
+        self.longest: Optional[str] = None
+        self.shortest: Optional[str] = None
+
+    def add_words(self, words: List[str]) -> None:
+        """Fold a run of words into the totals, keeping first-seen ties."""
+        if not words:
+            return
+        self.word_count += len(words)
+        self.update_extremes(max(words, key=len), min(words, key=len))
+
+    def update_extremes(self, longest: str, shortest: str) -> None:
+        """Replace the longest/shortest word only on a strictly better candidate."""
+        if self.longest is None or len(longest) > len(self.longest):
+            self.longest = longest
+        if self.shortest is None or len(shortest) < len(self.shortest):
+            self.shortest = shortest
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics in the text_analyzer response format."""
+        characters_no_spaces = self.characters - self.spaces
+        return {
+            "text_length": self.characters,
+            "characters_no_spaces": characters_no_spaces,
+            "word_count": self.word_count,
+            # Whitespace-only text has no sentences
+            "sentence_count": self.sentence_marks if self.word_count else 0,
+            "average_word_length": round(characters_no_spaces / max(self.word_count, 1), 2),
+            "longest_word": self.longest or "",
+            "shortest_word": self.shortest or ""
+        }
+
+
+def _scan(
+    slices: Iterable[Tuple[int, str]], progress: Optional[ProgressReporter]
+) -> Dict[str, Any]:
+    """
+    Compute text statistics from consecutive slices of one document.
+
+    Every statistic is updated from the slice while it is hot, so the full
+    word list is never built and memory use tracks the slice size instead of
+    the document size. Words that straddle a slice boundary are stitched
+    back together.
+
+    Args:
+        slices: (position, text) pairs; position is the progress reported
+            once the slice is scanned
+        progress: Receives the running statistics after each slice, if given
+    """
+    stats = _TextStats()
+    pending: Optional[str] = None  # Last word of the previous slice, if it may continue
+
+    for position, chunk in slices:
+        if not chunk:
+            continue
+        stats.characters += len(chunk)
+        stats.spaces += chunk.count(" ")
+        # Basic sentence counting - counts terminal punctuation marks
+        # Note: This is simplistic and may not handle abbreviations correctly
+        stats.sentence_marks += sum(chunk.count(mark) for mark in _SENTENCE_MARKS)
+
+        words = chunk.split()
+        if pending is not None:
+            if words and not chunk[0].isspace():
+                words[0] = pending + words[0]
+            else:
+                stats.add_words([pending])
+            pending = None
+        if words and not chunk[-1].isspace():
+            pending = words.pop()
+        stats.add_words(words)
+
+        if progress is not None and progress.due():
+            partial = stats.as_dict()
+            progress.report(
+                position,
+                message=f"{partial['word_count']} words, {partial['sentence_count']} sentences",
+                partial=partial,
+            )
+
+    if pending is not None:
+        stats.add_words([pending])
+    return stats.as_dict()
+
+
+def analyze_text_stats(text: str, progress: Optional[ProgressReporter] = None) -> Dict[str, Any]:
+    """
+    Compute text statistics in one sequential traversal.
+
+    The text is walked in fixed-size slices (see _scan). This is the
+    synchronous engine behind text_analyzer; it is safe to call from worker
+    threads and processes.
+
+    Args:
+        text: The text to analyze
+        progress: Receives the running statistics after each slice, if given
+
+    Returns:
+        Dictionary containing text statistics
+    """
+    return _scan(
+        (
+            (min(start + _CHUNK_SIZE, len(text)), text[start:start + _CHUNK_SIZE])
+            for start in range(0, len(text), _CHUNK_SIZE)
+        ),
+        progress,
+    )
+
+
+def analyze_file_stats(path: str, progress: Optional[ProgressReporter] = None) -> Dict[str, Any]:
+    """
+    Compute text statistics of a UTF-8 file without reading it into memory.
+
+    The file is memory-mapped and decoded slice by slice (invalid bytes are
+    replaced), so memory use tracks the slice size however large the file
+    is. Progress is reported in bytes.
+
+    Args:
+        path: The file to analyze
+        progress: Receives the running statistics after each slice, if given
+
+    Returns:
+        Dictionary containing text statistics, as analyze_text_stats
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:  # Empty files cannot be mapped
+            return _scan((), progress)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)  # Read ahead, drop pages behind
+            return _scan(_decoded_slices(mapped, size), progress)
+
+
+def _decoded_slices(mapped: mmap.mmap, size: int) -> Iterator[Tuple[int, str]]:
+    """Decode a mapped file in slices; characters split between slices are carried over."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for start in range(0, size, _CHUNK_SIZE):
+        end = min(start + _CHUNK_SIZE, size)
+        yield end, decoder.decode(mapped[start:end], final=end == size)
+
+
+def resolve_source(source: str) -> str:
+    """
+    Map a file path or file:// URI to a file clients may have analyzed.
+
+    Relative paths are taken relative to the first of
+    settings.text_file_roots; the resolved file (symlinks followed) must
+    lie under one of them.
+
+    Args:
+        source: A path or file:// URI
+
+    Returns:
+        The file's resolved path
+
+    Raises:
+        ValueError: If file input is disabled, the URI scheme is not file://,
+            or the file is outside the roots or does not exist
+    """
+    roots = [os.path.realpath(root.strip()) for root in settings.text_file_roots.split(",")
+             if root.strip()]
+    if not roots:
+        raise ValueError("File input is disabled (set TEXT_FILE_ROOTS to allow it)")
+
+    if "://" in source:
+        uri = urllib.parse.urlparse(source)
+        if uri.scheme != "file" or uri.netloc not in ("", "localhost"):
+            raise ValueError(f"Unsupported source URI: {source} (only local file:// URIs)")
+        path = urllib.parse.unquote(uri.path)
+    else:
+        path = source
+    path = os.path.realpath(os.path.join(roots[0], path))
+
+    if not any(os.path.commonpath([root, path]) == root for root in roots):
+        raise ValueError(f"Source is outside the allowed directories: {source}")
+    if not os.path.isfile(path):
+        raise ValueError(f"Source is not a file: {source}")
+    return path
+
+
+@memoize
 async def text_analyzer(text: str) -> Dict[str, Any]:
     """
     Analyze text and return statistics.
-    
+
     Note: This is a basic implementation. For production use, consider
     using NLP libraries like spaCy or NLTK for more accurate analysis.
-    
+
+    Inputs longer than settings.text_offload_threshold characters are
+    analyzed in a worker thread so the event loop keeps serving other
+    sessions while a large document is scanned. Clients that ask for progress
+    receive the running statistics while it is scanned. Results are
+    memoized, so re-sending the same text is answered from cache.
+
     Args:
         text: The text to analyze
-        
+
     Returns:
         Dictionary containing text statistics
     """
-    words = text.split()
-    characters = len(text)
-    characters_no_spaces = len(text.replace(" ", ""))
-    
-    # Basic sentence counting - counts terminal punctuation marks
-    # Note: This is simplistic and may not handle abbreviations correctly
-    sentence_count = text.count(".") + text.count("!") + text.count("?")
-    # Only set to 0 if text is empty, otherwise keep the count (even if 0)
-    if not text.strip():
-        sentence_count = 0
-    
+    async with _tools.progress(total=len(text)) as progress:
+        if len(text) > settings.text_offload_threshold:
+            return await asyncio.to_thread(analyze_text_stats, text, progress)
+        return analyze_text_stats(text, progress)
+
+
+async def file_text_analyzer(source: str) -> Dict[str, Any]:
+    """
+    Analyze a file passed by reference instead of inline.
+
+    The file is memory-mapped and scanned in slices (see analyze_file_stats),
+    off the event loop when larger than settings.text_offload_threshold
+    bytes. Results are memoized per file version (size and modification
+    time), so an unchanged file is not scanned twice.
+
+    Args:
+        source: Path or file:// URI of a UTF-8 file under settings.text_file_roots
+
+    Returns:
+        Dictionary containing text statistics, as text_analyzer
+
+    Raises:
+        ValueError: If the source is not an allowed file (see resolve_source)
+    """
+    path = resolve_source(source)
+    info = os.stat(path)
+    return await _file_analyzer(path, info.st_size, info.st_mtime_ns)
+
+
+@memoize
+async def _file_analyzer(path: str, size: int, mtime_ns: int) -> Dict[str, Any]:
+    """Analyze one version of a file; size and mtime_ns only key the memo cache."""
+    async with _tools.progress(total=size) as progress:
+        if size > settings.text_offload_threshold:
+            return await asyncio.to_thread(analyze_file_stats, path, progress)
+        return analyze_file_stats(path, progress)
+
+
+def _analyze_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """Analyze a group of documents in one worker task to amortize IPC overhead."""
+    return [analyze_text_stats(text) for text in texts]
+
+
+def _analyze_file_batch(paths: List[str]) -> List[Dict[str, Any]]:
+    """Analyze a group of files in one worker task; only the paths cross the process boundary."""
+    return [analyze_file_stats(path) for path in paths]
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _process_workers() -> int:
+    """Configured worker count, defaulting to every core of the host."""
+    return settings.text_process_workers or os.cpu_count() or 1
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, starting it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        # spawn avoids forking a process that already runs the event loop and threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=_process_workers(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("Started text analysis process pool with %d workers", _process_workers())
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the shared text analysis process pool, if it was started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+
+
+def _partition(sizes: List[int], parts: int) -> List[List[int]]:
+    """Split document indices into contiguous groups of roughly equal total size."""
+    target = max(sum(sizes) // parts, 1)
+    groups: List[List[int]] = [[]]
+    size = 0
+    for index, document_size in enumerate(sizes):
+        if size >= target and groups[-1]:
+            groups.append([])
+            size = 0
+        groups[-1].append(index)
+        size += document_size
+    return groups
+
+
+def _corpus_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-document statistics into corpus totals."""
+    total = _TextStats()
+    for result in results:
+        total.characters += result["text_length"]
+        total.spaces += result["text_length"] - result["characters_no_spaces"]
+        total.sentence_marks += result["sentence_count"]
+        total.word_count += result["word_count"]
+        if result["word_count"]:
+            total.update_extremes(result["longest_word"], result["shortest_word"])
+    summary = total.as_dict()
+    summary["document_count"] = len(results)
+    return summary
+
+
+async def batch_text_analyzer(
+    texts: Optional[List[str]] = None, sources: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Analyze many documents and return per-document and corpus statistics.
+
+    Uses the same engine as text_analyzer. Small batches are analyzed in a
+    worker thread; larger ones are split into size-balanced groups and
+    spread across a process pool (settings.text_process_workers) so the work
+    scales across all cores. Documents given as sources (paths or file://
+    URIs, see file_text_analyzer) are read by the workers themselves.
+
+    Args:
+        texts: The documents to analyze
+        sources: Files to analyze, after the texts
+
+    Returns:
+        Dictionary with per-document statistics (in input order) and corpus totals
+
+    Raises:
+        ValueError: If more than settings.text_batch_max_documents are given,
+            or a source is not an allowed file
+    """
+    texts, sources = texts or [], sources or []
+    if len(texts) + len(sources) > settings.text_batch_max_documents:
+        raise ValueError(
+            f"Too many documents: {len(texts) + len(sources)} "
+            f"(max {settings.text_batch_max_documents})"
+        )
+    paths = [resolve_source(source) for source in sources]
+
+    results = await _analyze_documents(_analyze_batch, texts, [len(text) for text in texts])
+    results += await _analyze_documents(
+        _analyze_file_batch, paths, [os.path.getsize(path) for path in paths]
+    )
     return {
-        "text_length": characters,
-        "characters_no_spaces": characters_no_spaces,
-        "word_count": len(words),
-        "sentence_count": sentence_count,
-        "average_word_length": round(characters_no_spaces / max(len(words), 1), 2),
-        "longest_word": max(words, key=len) if words else "",
-        "shortest_word": min(words, key=len) if words else ""
+        "documents": results,
+        "corpus": _corpus_summary(results)
     }
+
+
+async def _analyze_documents(
+    analyze: Callable[[List[Any]], List[Dict[str, Any]]], documents: List[Any], sizes: List[int]
+) -> List[Dict[str, Any]]:
+    """Run a batch analysis function over documents, in a thread or across the process pool."""
+    if not documents:
+        return []
+    if sum(sizes) <= settings.text_batch_inline_threshold or _process_workers() == 1:
+        return await asyncio.to_thread(analyze, documents)
+
+    loop = asyncio.get_running_loop()
+    pool = _get_process_pool()
+    groups = _partition(sizes, _process_workers() * 4)
+    group_results = await asyncio.gather(*(
+        loop.run_in_executor(pool, analyze, [documents[i] for i in group])
+        for group in groups
+    ))
+    return [result for batch in group_results for result in batch]
@@ -2,31 +2,230 @@
 Weather tools for MCP Skeleton.
 
 Provides weather information capabilities with mock data.
+
+Weather data comes from a pluggable WeatherProvider. Plug in a real API by
+subclassing WeatherProvider and calling set_weather_provider() at startup;
+the default MockWeatherProvider is a local stand-in used for development and
+tests. A stale-while-revalidate cache sits in front of the provider.
 """
 
-from typing import Dict, Any
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Set
+
+from utilities.config import settings
+from utilities.disk_cache import DiskCache, disk_cache
+from utilities.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class WeatherProvider(ABC):
+    """Interface for weather data sources."""
+
+    @abstractmethod
+    async def fetch(self, city: str) -> Dict[str, Any]:
+        """
+        Fetch current weather for a city from the upstream source.
+
+        Args:
+            city: Name of the city to get weather for
+
+        Returns:
+            Dictionary containing weather information
+        """
+
+
+class MockWeatherProvider(WeatherProvider):
+    """Local stand-in provider returning fixed sample data."""
+
+    async def fetch(self, city: str) -> Dict[str, Any]:
+        # Example implementation - replace with actual API call
+        # For demonstration, returning mock data
+        return {
+            "city": city,
+            "temperature": 72,
+            "condition": "Sunny",
+            "humidity": 45,
+            "wind_speed": 10,
+            "message": "This is sample data. Integrate with a real weather API."
+        }
+
+
+@dataclass
+class _WeatherEntry:
+    data: Dict[str, Any]
+    fetched_at: float
+
+
+class WeatherCache:
+    """
+    Per-city stale-while-revalidate cache in front of a WeatherProvider.
+
+    - Entries younger than weather_cache_ttl are served directly
+    - Entries up to weather_stale_ttl past that are served immediately while
+      a background refresh fetches a new copy
+    - Older or missing entries are fetched inline; concurrent requests for
+      the same city share a single provider call
+    - With a disk tier, fetched data is written through to it and looked up
+      there on a miss, so other workers and restarted processes reuse it
+    """
+
+    def __init__(self, provider: WeatherProvider, disk: Optional[DiskCache] = None) -> None:
+        self.provider = provider
+        self.disk = disk
+        self._entries: "OrderedDict[str, _WeatherEntry]" = OrderedDict()
+        self._inflight = SingleFlight()
+        self._refreshing: Set[asyncio.Task] = set()
+
+    def clear(self) -> None:
+        """Drop all cached cities."""
+        self._entries.clear()
+
+    async def get(self, city: str) -> Dict[str, Any]:
+        """
+        Return weather for a city, from cache when possible.
+
+        Args:
+            city: Name of the city to get weather for
+
+        Returns:
+            Weather data plus a "cache" block with the status ("hit", "stale",
+            "miss" or "coalesced") and the age of the data in seconds
+        """
+        key = city.strip().casefold()
+        entry = self._entries.get(key)
+        if entry is None and self.disk is not None:
+            entry = await self._from_disk(key)
+        now = time.monotonic()
+
+        if entry is not None:
+            age = now - entry.fetched_at
+            if age < settings.weather_cache_ttl:
+                self._entries.move_to_end(key)
+                return self._respond(entry, "hit", age)
+            if age < settings.weather_cache_ttl + settings.weather_stale_ttl:
+                self._entries.move_to_end(key)
+                self._refresh_in_background(key, city)
+                return self._respond(entry, "stale", age)
+
+        entry, shared = await self._inflight.run(key, lambda: self._load(key, city))
+        return self._respond(entry, "coalesced" if shared else "miss", 0.0)
+
+    async def _load(self, key: str, city: str) -> _WeatherEntry:
+        """Fetch from the provider and store the result."""
+        entry = _WeatherEntry(await self.provider.fetch(city), time.monotonic())
+        self._remember(key, entry)
+        if self.disk is not None:
+            self.disk.store(
+                self._disk_namespace(), key, {"data": entry.data, "fetched_at": time.time()},
+                ttl=settings.weather_cache_ttl, keep=settings.weather_stale_ttl,
+            )
+        return entry
+
+    def _remember(self, key: str, entry: _WeatherEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.weather_cache_max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_namespace(self) -> str:
+        # Data from one provider must not be served after another is plugged in
+        return f"weather:{type(self.provider).__name__}"
+
+    async def _from_disk(self, key: str) -> Optional[_WeatherEntry]:
+        """Load data stored by any process into memory, keeping its age."""
+        if self.disk is None:
+            return None
+        found = await self.disk.lookup(self._disk_namespace(), key)
+        if found is None:
+            return None
+        stored, _ = found
+        age = max(time.time() - stored["fetched_at"], 0.0)
+        entry = _WeatherEntry(stored["data"], time.monotonic() - age)
+        self._remember(key, entry)
+        return entry
+
+    def _refresh_in_background(self, key: str, city: str) -> None:
+        """Start a refresh for a stale city unless one is already running."""
+        if key in self._inflight:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._inflight.run(key, lambda: self._load(key, city))
+            except Exception:
+                logger.warning("Background weather refresh for %r failed", city, exc_info=True)
+
+        task = asyncio.create_task(refresh())
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+
+    @staticmethod
+    def _respond(entry: _WeatherEntry, status: str, age: float) -> Dict[str, Any]:
+        return {**entry.data, "cache": {"status": status, "age_seconds": round(age, 3)}}
+
+    async def prewarm(self, cities: List[str]) -> None:
+        """
+        Load a list of cities into the cache concurrently.
+
+        Failures are logged and skipped so a bad city never blocks startup.
+
+        Args:
+            cities: City names to fetch
+        """
+        results = await asyncio.gather(*(self.get(city) for city in cities), return_exceptions=True)
+        for city, result in zip(cities, results):
+            if isinstance(result, Exception):
+                logger.warning("Could not pre-warm weather for %r: %s", city, result)
+        logger.info("Pre-warmed weather cache with %d cities", len(cities))
+
+
+# Global cache instance, backed by the stand-in provider until one is plugged in
+weather_cache = WeatherCache(MockWeatherProvider(), disk_cache)
+
+
+def set_weather_provider(provider: WeatherProvider) -> None:
+    """
+    Plug in the weather data source used by get_weather_data.
+
+    Args:
+        provider: The provider implementation; clears previously cached data
+    """
+    weather_cache.provider = provider
+    weather_cache.clear()
+
+
+async def prewarm_weather_cache(cities: Optional[List[str]] = None) -> None:
+    """
+    Pre-fetch weather for hot cities so traffic spikes hit a warm cache.
+
+    Args:
+        cities: City names, defaults to the comma-separated
+            settings.weather_prewarm_cities
+    """
+    if cities is None:
+        cities = [city.strip() for city in settings.weather_prewarm_cities.split(",") if city.strip()]
+    if cities:
+        await weather_cache.prewarm(cities)
 
 
 async def get_weather_data(city: str) -> Dict[str, Any]:
     """
     Fetch weather data for a given city.
-    
+
     This is a sample implementation that would typically call a weather API.
-    Replace with your actual API integration.
-    
+    Replace with your actual API integration by plugging in a WeatherProvider
+    with set_weather_provider().
+
     Args:
         city: Name of the city to get weather for
-        
+
     Returns:
         Dictionary containing weather information
     """
-    # Example implementation - replace with actual API call
-    # For demonstration, returning mock data
-    return {
-        "city": city,
-        "temperature": 72,
-        "condition": "Sunny",
-        "humidity": 45,
-        "wind_speed": 10,
-        "message": "This is sample data. Integrate with a real weather API."
-    }
+    return await weather_cache.get(city)
@@ -5,6 +5,6 @@ Provides configuration management, base classes, and common utilities.
 """
 
 from .config import settings
-from .base_tools import BaseTools, ToolResponse
+from .base_tools import BaseTools, ToolResponse, memoize
 
-__all__ = ['settings', 'BaseTools', 'ToolResponse']
+__all__ = ['settings', 'BaseTools', 'ToolResponse', 'memoize']
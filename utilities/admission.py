@@ -0,0 +1,278 @@
+"""
+Admission control for MCP Skeleton tool calls.
+
+Caps how many tool calls run at once, globally and per tool. A call that
+finds its limit reached waits in a bounded queue; when the queue is full, or
+no slot frees up within the queue timeout, the call is rejected at once with
+a ToolResponse error instead of piling up work the server cannot finish in
+time. Settings: max_concurrent_tools, tool_concurrency_limits,
+tool_queue_size and tool_queue_timeout.
+
+Queue depth, running calls and rejections are exported with the tool
+metrics at /metrics.
+"""
+
+import asyncio
+import functools
+import logging
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from .base_tools import ToolResponse
+from .config import settings
+from .metrics import tool_metrics
+from .tool_hooks import ToolFunction, parse_tool_values, wrap_tools
+
+logger = logging.getLogger(__name__)
+
+# Set while a call holds a global slot: tool calls it makes itself (e.g. the
+# calls of a batch) run in that slot instead of waiting for free ones, which
+# could never come if every slot were held by such a caller
+_holds_global: ContextVar[bool] = ContextVar("holds_global_slot", default=False)
+
+
+class Overloaded(Exception):
+    """Raised when a call cannot be admitted."""
+
+    def __init__(self, scope: str, reason: str) -> None:
+        super().__init__(f"{scope}: {reason}")
+        self.scope = scope
+        self.reason = reason
+
+
+class ConcurrencyLimiter:
+    """
+    Concurrency limit with a bounded FIFO wait queue.
+
+    Args:
+        scope: Name used in errors and metrics ("global" or a tool name)
+        limit: Calls allowed to run at once
+        queue_size: Calls allowed to wait for a slot; further calls are rejected
+        queue_timeout: Seconds a call may wait before it is rejected
+    """
+
+    def __init__(self, scope: str, limit: int, queue_size: int, queue_timeout: float) -> None:
+        self.scope = scope
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting in the queue if necessary.
+
+        Raises:
+            Overloaded: If the queue is full or the wait timed out
+        """
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self.rejected["queue_full"] += 1
+                raise Overloaded(self.scope, "queue_full")
+            self.waiting += 1
+            acquire = asyncio.ensure_future(self._semaphore.acquire())
+            try:
+                await asyncio.wait((acquire,), timeout=self.queue_timeout)
+            except BaseException:
+                self._abandon(acquire)
+                raise
+            finally:
+                self.waiting -= 1
+            if not acquire.done():
+                self._abandon(acquire)
+                self.rejected["queue_timeout"] += 1
+                raise Overloaded(self.scope, "queue_timeout")
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+
+    def _abandon(self, acquire: asyncio.Future) -> None:
+        # A slot may be granted in the same loop iteration the wait ends (timeout
+        # or cancellation): give it back instead of leaking it
+        if not acquire.cancel() and not acquire.cancelled():
+            self._semaphore.release()
+
+    def release(self) -> None:
+        """Give a slot back."""
+        self.active -= 1
+        self._semaphore.release()
+
+
+def _positive_int(value: str) -> int:
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError("expected a positive integer")
+    return int(value)
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """
+    Parse per-tool limits written as "tool=limit,tool=limit".
+
+    Raises:
+        ValueError: If an entry is malformed or a limit is not a positive integer
+    """
+    return parse_tool_values(spec, _positive_int)
+
+
+class AdmissionController:
+    """
+    Global and per-tool concurrency limits for tool calls.
+
+    A call first takes a slot of its tool's limiter (if it has one) and then
+    a global slot, so calls queued behind a saturated tool do not hold
+    global capacity other tools could use.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 0,
+        tool_limits: Optional[Dict[str, int]] = None,
+        queue_size: int = 64,
+        queue_timeout: float = 5.0,
+    ) -> None:
+        self.global_limiter: Optional[ConcurrencyLimiter] = None
+        if max_concurrent > 0:
+            self.global_limiter = ConcurrencyLimiter(
+                "global", max_concurrent, queue_size, queue_timeout
+            )
+        self.tool_limiters = {
+            tool: ConcurrencyLimiter(tool, limit, queue_size, queue_timeout)
+            for tool, limit in (tool_limits or {}).items()
+        }
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionController":
+        """Build a controller from the admission settings."""
+        return cls(
+            max_concurrent=settings.max_concurrent_tools,
+            tool_limits=parse_limits(settings.tool_concurrency_limits),
+            queue_size=settings.tool_queue_size,
+            queue_timeout=settings.tool_queue_timeout,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is configured."""
+        return self.global_limiter is not None or bool(self.tool_limiters)
+
+    def _limiters(self) -> List[ConcurrencyLimiter]:
+        limiters = list(self.tool_limiters.values())
+        if self.global_limiter is not None:
+            limiters.append(self.global_limiter)
+        return limiters
+
+    def wrap(self, tool: str, fn: ToolFunction) -> ToolFunction:
+        """
+        Wrap an async tool function with the tool's and the global limits.
+
+        Args:
+            tool: Tool name, used to find its per-tool limit
+            fn: The async tool function
+
+        Returns:
+            The wrapped function; rejected calls return a ToolResponse error
+        """
+        tool_limiter = self.tool_limiters.get(tool)
+        if tool_limiter is None and self.global_limiter is None:
+            return fn
+
+        @functools.wraps(fn)
+        async def admitted(*args: Any, **kwargs: Any) -> Any:
+            limiters = [tool_limiter] if tool_limiter is not None else []
+            if self.global_limiter is not None and not _holds_global.get():
+                limiters.append(self.global_limiter)
+            held: List[ConcurrencyLimiter] = []
+            token = None
+            try:
+                for limiter in limiters:
+                    await limiter.acquire()
+                    held.append(limiter)
+                    if limiter is self.global_limiter:
+                        token = _holds_global.set(True)
+                return await fn(*args, **kwargs)
+            except Overloaded as e:
+                return self._rejection(tool, e)
+            finally:
+                if token is not None:
+                    _holds_global.reset(token)
+                for limiter in reversed(held):
+                    limiter.release()
+
+        return admitted
+
+    def _rejection(self, tool: str, error: Overloaded) -> Dict[str, Any]:
+        limiter = self.global_limiter if error.scope == "global" else self.tool_limiters[tool]
+        logger.warning("Rejected %s call: %s limit %s", tool, error.scope, error.reason)
+        return ToolResponse[Dict[str, Any]](
+            success=False,
+            error=(
+                f"Server overloaded: {error.scope} concurrency limit reached "
+                f"({error.reason.replace('_', ' ')}), retry later"
+            ),
+            data={
+                "tool": tool,
+                "scope": error.scope,
+                "reason": error.reason,
+                "limit": limiter.limit,
+                "queue_depth": limiter.waiting,
+            },
+        ).model_dump()
+
+    def stats(self) -> Dict[str, Any]:
+        """Running calls, queue depth and rejections per limiter."""
+        return {
+            limiter.scope: {
+                "limit": limiter.limit,
+                "active": limiter.active,
+                "queued": limiter.waiting,
+                "rejected": dict(limiter.rejected),
+            }
+            for limiter in self._limiters()
+        }
+
+    def render(self) -> str:
+        """Render the limiter state in the Prometheus text exposition format."""
+        limiters = self._limiters()
+        if not limiters:
+            return ""
+        lines = [
+            "# HELP mcp_admission_active Tool calls holding a slot of a concurrency limit.",
+            "# TYPE mcp_admission_active gauge",
+        ]
+        lines += [f'mcp_admission_active{{scope="{lim.scope}"}} {lim.active}' for lim in limiters]
+        lines += [
+            "# HELP mcp_admission_queued Tool calls waiting for a slot.",
+            "# TYPE mcp_admission_queued gauge",
+        ]
+        lines += [f'mcp_admission_queued{{scope="{lim.scope}"}} {lim.waiting}' for lim in limiters]
+        lines += [
+            "# HELP mcp_admission_rejected_total Tool calls rejected, by reason.",
+            "# TYPE mcp_admission_rejected_total counter",
+        ]
+        for limiter in limiters:
+            for reason, count in limiter.rejected.items():
+                lines.append(
+                    f'mcp_admission_rejected_total{{scope="{limiter.scope}",reason="{reason}"}} '
+                    f"{count}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def admit_tools(mcp: Any) -> AdmissionController:
+    """
+    Apply the configured concurrency limits to every tool registered from now on.
+
+    Args:
+        mcp: The FastMCP server, before its tools are registered
+
+    Returns:
+        The controller, for inspecting its stats
+    """
+    controller = AdmissionController.from_settings()
+    if controller.enabled:
+        wrap_tools(mcp, controller.wrap)
+        tool_metrics.add_collector(controller.render)
+    return controller
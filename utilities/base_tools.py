@@ -2,17 +2,46 @@
 Base tools module for MCP Skeleton.
 
 Provides base classes and utilities for creating consistent tool responses
-across all MCP tools in the server.
+across all MCP tools in the server, progress notifications for long-running
+tools, and the @memoize decorator for tool functions whose result depends
+only on their arguments.
 """
 
-from typing import Dict, Any, List, Optional, TypeVar, Generic
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import (
+    Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Set, TypeVar, Generic
+)
 from pydantic import BaseModel
+import asyncio
+import functools
+import hashlib
+import inspect
 import logging
+import threading
+import time
+
+import pydantic_core
+from mcp.types import ProgressNotification, ProgressNotificationParams, ServerNotification
+
+from .config import settings
+from .singleflight import SingleFlight
+
+try:
+    from mcp.server.lowlevel.server import request_ctx
+except ImportError:  # Older MCP SDKs do not expose the request context
+    request_ctx = None
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Reporter of the operation reporting progress in this context. Operations
+# nested in it (e.g. the fetches of http_batch_request, the calls of a batch)
+# stay silent, so the client sees one increasing sequence per request.
+_progress: ContextVar[Optional["ProgressReporter"]] = ContextVar("tool_progress", default=None)
+
 
 class ToolResponse(BaseModel, Generic[T]):
     """
@@ -39,6 +68,7 @@ class BaseTools:
     - Structured logging
     - Consistent error handling
     - Standard response formatting
+    - Progress notifications
     """
     
     def __init__(self, service_name: str):
@@ -78,9 +108,352 @@ class BaseTools:
         Returns:
             Dictionary with success=False and error message
         """
-        self.logger.error(f"{self.service_name} error: {error}")
+        self.logger.error("%s error: %s", self.service_name, error)
         return {
             "success": False,
             "data": data,
             "error": error
         }
+    
+    @asynccontextmanager
+    async def progress(self, total: Optional[float] = None) -> AsyncIterator["ProgressReporter"]:
+        """
+        Report progress of a long-running operation to the calling client.
+        
+        Example:
+            async with tools.progress(total=len(items)) as progress:
+                for done, item in enumerate(items, 1):
+                    process(item)
+                    progress.report(done, partial={"processed": done})
+        
+        Args:
+            total: Amount of work the progress values count up to, if known
+            
+        Yields:
+            The reporter; inactive when the client did not ask for progress
+            or an enclosing operation already reports it. Notifications still
+            being sent on exit are awaited, so they reach the client before
+            the tool's result.
+        """
+        reporter = ProgressReporter.for_current_request(total)
+        token = _progress.set(reporter)
+        try:
+            yield reporter
+        finally:
+            _progress.reset(token)
+            await reporter.flush()
+
+
+class ProgressReporter:
+    """
+    Rate-limited MCP progress notifications for one tool call.
+    
+    Notifications go to the client that made the current request, if it sent
+    a progressToken in the request's _meta; otherwise the reporter is
+    inactive and report() does nothing. Reports closer together than
+    settings.progress_min_interval are dropped, so a tool can report after
+    every chunk of work without flooding the transport. Partial results are
+    sent in the notification's _meta as {"partial": ...}.
+    
+    report() may be called from the event loop or from a worker thread
+    (e.g. a scan run with asyncio.to_thread); delivery never blocks the caller.
+    """
+    
+    def __init__(
+        self,
+        token: Any = None,
+        session: Any = None,
+        request_id: Any = None,
+        total: Optional[float] = None,
+        min_interval: float = 0.0,
+    ):
+        self.token = token
+        self.total = total
+        self.sent = 0
+        self._session = session
+        self._request_id = request_id
+        self._min_interval = min_interval
+        self._last = time.monotonic()
+        self._loop = asyncio.get_running_loop() if token is not None else None
+        self._thread = threading.get_ident()
+        self._tasks: Set["asyncio.Task[None]"] = set()
+    
+    @classmethod
+    def for_current_request(cls, total: Optional[float] = None) -> "ProgressReporter":
+        """Reporter for the request being handled (inactive outside one or if nested)."""
+        context = request_ctx.get(None) if request_ctx is not None else None
+        token = getattr(getattr(context, "meta", None), "progressToken", None)
+        if token is None or _progress.get() is not None:
+            return cls(total=total)
+        return cls(
+            token, context.session, context.request_id, total, settings.progress_min_interval
+        )
+    
+    @property
+    def active(self) -> bool:
+        """Whether the client asked for progress (and is still reachable)."""
+        return self.token is not None
+    
+    def due(self) -> bool:
+        """Whether a report made now would be sent; lets callers skip building it."""
+        return self.token is not None and time.monotonic() - self._last >= self._min_interval
+    
+    def report(
+        self, progress: float, message: Optional[str] = None, partial: Any = None
+    ) -> bool:
+        """
+        Send a progress notification unless the previous one was too recent.
+        
+        Args:
+            progress: Work done so far; must increase from one report to the next
+            message: Human-readable description of the progress
+            partial: JSON-compatible partial result (e.g. running totals)
+            
+        Returns:
+            True if the notification was sent
+        """
+        if not self.due():
+            return False
+        self._last = time.monotonic()
+        params = ProgressNotificationParams(
+            progressToken=self.token,
+            progress=progress,
+            total=self.total,
+            message=message,
+            **({"_meta": {"partial": partial}} if partial is not None else {}),
+        )
+        try:
+            if threading.get_ident() == self._thread:
+                self._schedule(params)
+            else:
+                self._loop.call_soon_threadsafe(self._schedule, params)
+        except RuntimeError:  # The event loop has shut down
+            self.token = None
+            return False
+        self.sent += 1
+        return True
+    
+    async def flush(self) -> None:
+        """Wait until the notifications reported so far have been sent."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+    
+    def _schedule(self, params: ProgressNotificationParams) -> None:
+        task = self._loop.create_task(self._send(params))
+        self._tasks.add(task)  # Keep a reference until it is sent
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _send(self, params: ProgressNotificationParams) -> None:
+        try:
+            await self._session.send_notification(
+                ServerNotification(ProgressNotification(params=params)),
+                related_request_id=self._request_id,
+            )
+        except Exception as e:
+            # The client went away; the call itself decides what to do about that
+            logger.debug("Progress notification not delivered: %s", e)
+            self.token = None
+
+
+class MemoCache:
+    """
+    Results of one memoized function, bounded by their total encoded size.
+    
+    Entries are stored as encoded JSON, so their size is known exactly and
+    callers that modify a returned result cannot change the cached copy.
+    Least recently used entries are evicted once max_bytes is exceeded.
+    
+    Args:
+        name: Name reported in stats and metrics
+        max_bytes: Total size of keys and encoded results kept
+        ttl: Seconds an entry stays valid, 0 for no expiry
+    """
+    
+    def __init__(self, name: str, max_bytes: int, ttl: float = 0.0):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()  # key -> (encoded, expiry)
+    
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Return the encoded result for a key, or None (counted as a miss)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] is None or entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self._remove(key)
+        self.misses += 1
+        return None
+    
+    def put(self, key: bytes, encoded: bytes) -> None:
+        """Store an encoded result, evicting least recently used entries to fit."""
+        size = len(key) + len(encoded)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expiry = time.monotonic() + self.ttl if self.ttl > 0 else None
+        self._entries[key] = (encoded, expiry)
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+    
+    def _remove(self, key: bytes) -> None:
+        encoded, _ = self._entries.pop(key)
+        self.size -= len(key) + len(encoded)
+    
+    def clear(self) -> None:
+        """Drop every entry (statistics are kept)."""
+        self._entries.clear()
+        self.size = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# Caches of every @memoize'd function, by name
+memo_caches: Dict[str, MemoCache] = {}
+
+
+def _canonical(value: Any) -> Any:
+    """Order dict keys so equal arguments always encode to the same bytes."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+# Characters of a string argument encoded and hashed at a time
+_HASH_CHUNK = 1 << 18
+
+
+def memo_key(signature: inspect.Signature, args: tuple, kwargs: Dict[str, Any]) -> bytes:
+    """
+    Build the cache key for a call: a digest of its canonically encoded arguments.
+    
+    Positional and keyword spellings of the same call, and calls relying on
+    default values, get the same key. Strings are hashed in slices, so a
+    large document is never copied whole.
+    """
+    if kwargs or len(args) != len(signature.parameters):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        args = tuple(bound.arguments.values())
+    digest = hashlib.blake2b(digest_size=20)
+    for value in args:
+        if isinstance(value, str):  # Hashed as is: large documents are common arguments
+            digest.update(b"s%d:" % len(value))
+            for start in range(0, len(value), _HASH_CHUNK):
+                digest.update(value[start:start + _HASH_CHUNK].encode("utf-8", "surrogatepass"))
+        else:
+            encoded = pydantic_core.to_json(_canonical(value), fallback=repr)
+            digest.update(b"j%d:" % len(encoded))
+            digest.update(encoded)
+    return digest.digest()
+
+
+AsyncFunction = Callable[..., Awaitable[Any]]
+
+
+def memoize(
+    fn: Optional[AsyncFunction] = None,
+    *,
+    max_bytes: Optional[int] = None,
+    ttl: Optional[float] = None,
+) -> Any:
+    """
+    Cache the results of an async function that depends only on its arguments.
+    
+    Use as @memoize or @memoize(max_bytes=..., ttl=...). Results must be
+    JSON-compatible; a hit returns a fresh copy decoded from the cache.
+    Exceptions are not cached, and concurrent calls with the same arguments
+    share one execution. The cache is available as fn.cache. Calls whose
+    string arguments total more than settings.text_offload_threshold
+    characters are keyed in a worker thread, off the event loop.
+    
+    Args:
+        fn: The function (when used without arguments)
+        max_bytes: Cache size, defaults to settings.memo_max_bytes
+        ttl: Seconds results stay valid, defaults to settings.memo_ttl (0 = forever)
+    
+    Returns:
+        The memoized function, or a decorator producing it
+    """
+    if fn is None:
+        return functools.partial(memoize, max_bytes=max_bytes, ttl=ttl)
+    
+    cache = MemoCache(
+        fn.__name__,
+        settings.memo_max_bytes if max_bytes is None else max_bytes,
+        settings.memo_ttl if ttl is None else ttl,
+    )
+    memo_caches[cache.name] = cache
+    signature = inspect.signature(fn)
+    inflight = SingleFlight()
+    
+    @functools.wraps(fn)
+    async def memoized(*args: Any, **kwargs: Any) -> Any:
+        if not settings.memo_enabled:
+            return await fn(*args, **kwargs)
+        text_size = sum(
+            len(value) for value in (*args, *kwargs.values()) if isinstance(value, str)
+        )
+        if text_size > settings.text_offload_threshold:
+            key = await asyncio.to_thread(memo_key, signature, args, kwargs)
+        else:
+            key = memo_key(signature, args, kwargs)
+        encoded = cache.get(key)
+        if encoded is None:
+            async def compute() -> Any:
+                result = await fn(*args, **kwargs)
+                try:
+                    encoded = pydantic_core.to_json(result)
+                except pydantic_core.PydanticSerializationError:
+                    logger.warning("%s returned a result that is not JSON; not cached", cache.name)
+                    return result
+                cache.put(key, encoded)
+                return encoded
+            
+            outcome, _ = await inflight.run(key, compute)
+            if not isinstance(outcome, bytes):
+                return outcome
+            encoded = outcome
+        return pydantic_core.from_json(encoded)
+    
+    memoized.cache = cache  # type: ignore[attr-defined]
+    return memoized
+
+
+def render_memo_metrics() -> str:
+    """Render memoization statistics in the Prometheus text exposition format."""
+    if not memo_caches:
+        return ""
+    caches = sorted(memo_caches.items())
+    lines = []
+    for metric, kind, help_text, field in (
+        ("mcp_memo_hits_total", "counter", "Memoized calls served from cache.", "hits"),
+        ("mcp_memo_misses_total", "counter", "Memoized calls that ran the function.", "misses"),
+        ("mcp_memo_evictions_total", "counter", "Entries evicted for space.", "evictions"),
+        ("mcp_memo_bytes", "gauge", "Size of cached keys and results.", "size"),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{function="{name}"}} {getattr(c, field)}' for name, c in caches]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,243 @@
+"""
+Batch tool calls for MCP Skeleton.
+
+run_batch() runs a list of tool invocations from one tools/call request, so a
+client chaining several tools pays one round trip instead of one per call.
+Each invocation is {"id": ..., "tool": ..., "args": {...}}. An argument value
+{"$ref": "<id>.<path>"} is replaced by part of another call's result (e.g.
+{"$ref": "sum.result"} or {"$ref": "page.data.items.0"}); calls wait for the
+calls they reference and everything else runs concurrently.
+
+Invocations go through the registered tools, so argument validation and the
+server-wide wrappers (metrics, deadlines, concurrency limits) apply to each
+one. batch_tools() records the tools as the server registers them in a
+ToolManager of its own, so batches only use the SDK's public API. Clients
+asking for progress are notified as calls finish.
+Settings: batch_max_calls, batch_max_concurrency.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set
+from weakref import WeakKeyDictionary
+
+from mcp.server.fastmcp.tools import ToolManager
+from pydantic import BaseModel
+
+from .base_tools import BaseTools
+from .config import settings
+from .serialization import raw_results
+from .tool_hooks import ToolFunction, wrap_tools
+
+_REF = "$ref"
+_NESTED = "batch"  # Name of the batch tool itself, which cannot be nested
+
+_tools = BaseTools("batch")
+
+# Tools callable from batches, per server
+_registries: "WeakKeyDictionary[Any, ToolManager]" = WeakKeyDictionary()
+
+
+class BatchError(ValueError):
+    """Raised for a batch that cannot run (malformed, unknown reference, cycle)."""
+
+
+class _Failed(Exception):
+    """A call did not produce a result; dependants fail with it."""
+
+
+def _references(value: Any, found: Set[str]) -> Set[str]:
+    """Collect the call ids referenced anywhere in an argument value."""
+    if isinstance(value, dict):
+        if set(value) == {_REF} and isinstance(value[_REF], str):
+            found.add(value[_REF].split(".", 1)[0])
+        else:
+            for item in value.values():
+                _references(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _references(item, found)
+    return found
+
+
+def _lookup(results: Dict[str, Any], ref: str) -> Any:
+    call_id, *path = ref.split(".")
+    value = results[call_id]
+    for part in path:
+        try:
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise _Failed(f"Reference {ref!r} does not exist in the result of {call_id!r}")
+    return value
+
+
+def _resolve(value: Any, results: Dict[str, Any]) -> Any:
+    """Replace references in an argument value by the referenced results."""
+    if isinstance(value, dict):
+        if set(value) == {_REF} and isinstance(value[_REF], str):
+            return _lookup(results, value[_REF])
+        return {key: _resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results) for item in value]
+    return value
+
+
+def _plan(calls: List[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    """
+    Validate a batch and return each call's dependencies, by call id.
+
+    Calls without an id get their position as id.
+
+    Raises:
+        BatchError: If the batch is empty, too large, malformed, nested,
+            references an unknown call or contains a cycle
+    """
+    if not calls:
+        raise BatchError("The batch is empty")
+    if len(calls) > settings.batch_max_calls:
+        raise BatchError(f"Too many calls: {len(calls)} (maximum {settings.batch_max_calls})")
+
+    dependencies: Dict[str, Set[str]] = {}
+    for index, call in enumerate(calls):
+        if not isinstance(call, dict) or not isinstance(call.get("tool"), str):
+            raise BatchError(f"Call {index} must be an object with a 'tool' name")
+        if call["tool"] == _NESTED:
+            raise BatchError("Batches cannot be nested")
+        if not isinstance(call.get("args", {}), dict):
+            raise BatchError(f"Call {index}: 'args' must be an object")
+        call_id = str(call.get("id", index))
+        if call_id in dependencies:
+            raise BatchError(f"Duplicate call id {call_id!r}")
+        dependencies[call_id] = _references(call.get("args", {}), set())
+
+    for call_id, needed in dependencies.items():
+        unknown = needed - dependencies.keys()
+        if unknown:
+            raise BatchError(f"Call {call_id!r} references unknown call(s) {sorted(unknown)}")
+
+    # Kahn's algorithm: every call must become runnable
+    remaining = {call_id: set(needed) for call_id, needed in dependencies.items()}
+    ready = [call_id for call_id, needed in remaining.items() if not needed]
+    while ready:
+        done = ready.pop()
+        for call_id, needed in remaining.items():
+            if done in needed:
+                needed.discard(done)
+                if not needed:
+                    ready.append(call_id)
+    cyclic = sorted(call_id for call_id, needed in remaining.items() if needed)
+    if cyclic:
+        raise BatchError(f"Calls {cyclic} depend on each other in a cycle")
+    return dependencies
+
+
+def batch_tools(mcp: Any) -> None:
+    """
+    Make every tool registered on a FastMCP server from now on callable from run_batch().
+
+    Install it before the other tool hooks: it then sees each function exactly
+    as the server registers it, with all the wrappers applied.
+
+    Args:
+        mcp: The FastMCP server, before its tools are registered
+    """
+    registry = _registries.setdefault(mcp, ToolManager())
+
+    def record(tool: str, fn: ToolFunction) -> ToolFunction:
+        registry.add_tool(fn, name=tool)
+        return fn
+
+    wrap_tools(mcp, record)
+
+
+async def run_batch(
+    mcp: Any, calls: List[Dict[str, Any]], max_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run tool invocations concurrently, in dependency order where they reference each other.
+
+    Args:
+        mcp: The FastMCP server whose tools are called
+        calls: Invocations as {"id": ..., "tool": ..., "args": {...}}
+        max_concurrency: Calls running at once, capped by settings.batch_max_concurrency
+
+    Returns:
+        Per-call outcomes in input order, each with its result or error and
+        its start offset and duration in ms, plus counts and the total time
+
+    Raises:
+        BatchError: If the batch is invalid; nothing has run in that case
+        RuntimeError: If batch_tools() was not installed on the server
+    """
+    registry = _registries.get(mcp)
+    if registry is None:
+        raise RuntimeError("Install batch_tools(mcp) before registering the server's tools")
+    dependencies = _plan(calls)
+    limit = min(max_concurrency or settings.batch_max_concurrency, settings.batch_max_concurrency)
+    semaphore = asyncio.Semaphore(max(limit, 1))
+    context = mcp.get_context()
+    results: Dict[str, Any] = {}
+    finished: Dict[str, asyncio.Future] = {
+        call_id: asyncio.get_running_loop().create_future() for call_id in dependencies
+    }
+    start = time.perf_counter()
+
+    async def run_one(call_id: str, call: Dict[str, Any]) -> Dict[str, Any]:
+        outcome: Dict[str, Any] = {"id": call_id, "tool": call["tool"]}
+        try:
+            for needed in dependencies[call_id]:
+                if not await finished[needed]:
+                    raise _Failed(f"Dependency {needed!r} failed")
+            arguments = _resolve(call.get("args", {}), results)
+            async with semaphore:
+                began = time.perf_counter()
+                outcome["started_ms"] = round((began - start) * 1000, 3)
+                try:
+                    with raw_results():
+                        result = await registry.call_tool(
+                            call["tool"], arguments, context=context
+                        )
+                finally:
+                    outcome["duration_ms"] = round((time.perf_counter() - began) * 1000, 3)
+        except Exception as e:
+            outcome.update(success=False, error=str(e))
+            finish(call_id, False)
+            return outcome
+
+        if isinstance(result, BaseModel):  # e.g. a ToolResponse; references need plain data
+            result = result.model_dump()
+        # Error responses (e.g. deadline exceeded, server overloaded, or the
+        # {"error", "url", "method"} of a failed HTTP request) fail the call too
+        # (success envelopes carry "error": None, so only a set error counts)
+        succeeded = not (isinstance(result, dict) and (
+            result.get("success") is False or bool(result.get("error"))
+        ))
+        outcome.update(success=succeeded, result=result)
+        if succeeded:
+            results[call_id] = result
+        else:
+            outcome["error"] = result.get("error") or "The call failed"
+        finish(call_id, succeeded)
+        return outcome
+
+    def finish(call_id: str, succeeded: bool) -> None:
+        finished[call_id].set_result(succeeded)
+        counts["succeeded" if succeeded else "failed"] += 1
+        done = counts["succeeded"] + counts["failed"]
+        progress.report(
+            done, message=f"{done} of {len(calls)} calls finished", partial=dict(counts)
+        )
+
+    counts = {"succeeded": 0, "failed": 0}
+    # One progress sequence for the batch: its calls do not report their own
+    async with _tools.progress(total=len(calls)) as progress:
+        outcomes = await asyncio.gather(*(
+            run_one(call_id, call) for call_id, call in zip(dependencies, calls)
+        ))
+    failed = sum(not outcome["success"] for outcome in outcomes)
+    return {
+        "results": outcomes,
+        "succeeded": len(outcomes) - failed,
+        "failed": failed,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
@@ -4,6 +4,8 @@ Configuration management for MCP Skeleton Server.
 Uses pydantic-settings for type-safe configuration with environment variables.
 """
 
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,11 +21,116 @@ class Settings(BaseSettings):
     server_name: str = "MCP Skeleton Server"
     server_version: str = "0.1.0"
     log_level: str = "INFO"
+
+    # Logging Pipeline Configuration (see utilities/logging_setup.py)
+    log_format: str = "text"  # "text" or "json" (one object per line)
+    log_async: bool = True  # Write log records from a background thread
+    log_queue_size: int = 10000  # Records buffered for the writer; more are dropped
+    log_repeat_limit: int = 20  # Records per call site and window; 0 = unlimited
+    log_repeat_window: float = 60.0  # Seconds
     
     # MCP Server Configuration (for HTTP/SSE transport)
     mcp_server_host: str = "0.0.0.0"
     mcp_server_port: int = 8000
-    
+
+    # Transport: stdio, sse or streamable-http (overridden by --transport / --http)
+    mcp_transport: str = "stdio"
+
+    # HTTP Serving Configuration (uvicorn, HTTP mode only)
+    http_workers: int = 1  # Worker processes sharing the listening socket
+    http_backlog: int = 2048
+    http_keepalive_timeout: int = 5  # Seconds an idle client keep-alive connection is held
+    http_limit_concurrency: Optional[int] = None  # Connections per worker before 503s
+    http_graceful_shutdown_timeout: int = 30
+    http_session_dir: str = ""  # SSE session registry (mode 0700); "" = per-user runtime dir
+    http_stateless: bool = True  # streamable-http: no per-session server state
+    http_json_response: bool = False  # streamable-http: plain JSON replies instead of SSE streams
+
+    # Health Checks (/healthz and /readyz in HTTP mode; a limit of 0 disables its check)
+    ready_max_loop_lag: float = 0.5  # Seconds the event loop may lag before /readyz fails
+    ready_max_in_flight: int = 0  # Tool calls running in the worker
+    ready_max_pool_utilization: float = 0.95  # Share of HTTP_MAX_CONNECTIONS in use or awaited
+
+    # Serialization Configuration (tool results, see utilities/serialization.py)
+    fast_serialization: bool = True  # Encode dict results once as compact JSON
+
+    # Memoization Configuration (tool functions decorated with @memoize)
+    memo_enabled: bool = True
+    memo_max_bytes: int = 16_777_216  # Per function: keys plus encoded results
+    memo_ttl: float = 0.0  # Seconds a result stays valid; 0 = until evicted
+
+    # Progress Notifications (sent to clients that pass a progressToken)
+    progress_min_interval: float = 0.5  # Seconds between notifications of one call
+
+    # Metrics Configuration (per-tool Prometheus metrics, /metrics in HTTP mode)
+    metrics_enabled: bool = True
+
+    # Admission Control (concurrent tool calls; excess calls queue, then are rejected)
+    max_concurrent_tools: int = 0  # Across all tools; 0 = unlimited
+    tool_concurrency_limits: str = ""  # Per tool, e.g. "analyze_text=4,http_request=32"
+    tool_queue_size: int = 64  # Calls allowed to wait per limit; more are rejected at once
+    tool_queue_timeout: float = 5.0  # Seconds a queued call waits for a slot
+
+    # Deadline Configuration (per tool call; 0 = no timeout)
+    tool_timeout: float = 60.0
+    tool_timeouts: str = ""  # Per tool, e.g. "analyze_texts=300,http_request=15"
+    tool_accept_client_timeout: bool = True  # Honour a shorter {"timeout": s} in request _meta
+
+    # Profiling Configuration (also adjustable at runtime via /admin/profiling)
+    profile_sample_rate: float = 0.0  # Fraction of tool calls run under cProfile
+    profile_dir: str = "/tmp/mcp-skeleton-profiles"
+    slow_call_threshold: float = 0.0  # Seconds; slower calls are logged with a stack sample
+    profile_max_argument_chars: int = 500  # Per-argument repr length in slow-call logs
+    admin_token: str = ""  # Bearer token for /admin endpoints; empty disables them
+
+    # Shared HTTP Client Configuration (connection pool used by http_tools)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_timeout: float = 5.0  # Seconds per outbound request, capped by the tool call's deadline
+    http_max_connections_per_host: int = 0  # 0 disables the per-host cap
+    http_enable_http2: bool = False  # Requires the optional 'h2' package
+    http_max_response_bytes: int = 10_485_760  # Bodies are truncated beyond this size
+
+    # HTTP Response Cache Configuration (GET responses in http_tools)
+    http_cache_enabled: bool = True
+    http_cache_max_entries: int = 256
+    http_cache_max_entry_bytes: int = 1_048_576
+
+    # HTTP Batch Fetch Configuration (http_batch_request tool)
+    http_batch_max_items: int = 100
+    http_batch_max_concurrency: int = 10
+    http_batch_max_per_host: int = 4
+
+    # Batch Tool Configuration (several tool calls in one request, see utilities/batch.py)
+    batch_max_calls: int = 50
+    batch_max_concurrency: int = 10  # Calls of one batch running at once
+
+    # Disk Cache Configuration (shared by the workers of a node, kept across restarts)
+    disk_cache_enabled: bool = False  # Tier under the HTTP response and weather caches
+    disk_cache_path: str = "/tmp/mcp-skeleton-cache/cache.db"
+    disk_cache_max_bytes: int = 268_435_456
+    disk_cache_compress_bytes: int = 1_024  # Larger entries are zlib-compressed
+
+    # Weather Cache Configuration (stale-while-revalidate, per city)
+    weather_cache_ttl: float = 300.0  # Seconds data is served as fresh
+    weather_stale_ttl: float = 600.0  # Extra seconds stale data is served while refreshing
+    weather_cache_max_entries: int = 1_024
+    weather_prewarm_cities: str = ""  # Comma-separated cities fetched at startup
+
+    # Calculator Configuration
+    calculator_batch_max_items: int = 1_000_000  # Maximum operands per calculator_batch call
+    expression_cache_size: int = 256  # Compiled expressions kept by evaluate_expression
+    expression_max_length: int = 1_000
+    expression_max_bindings: int = 100_000
+
+    # Text Analysis Configuration
+    text_offload_threshold: int = 1_000_000  # Characters; larger inputs run in a worker thread
+    text_process_workers: int = 0  # Process pool size for analyze_texts; 0 = one per CPU core
+    text_batch_max_documents: int = 10_000
+    text_batch_inline_threshold: int = 1_000_000  # Total characters handled without processes
+    text_file_roots: str = ""  # Comma-separated directories files may be analyzed from; "" = none
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
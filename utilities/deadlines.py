@@ -0,0 +1,238 @@
+"""
+Per-call deadlines and cancellation for MCP Skeleton tool calls.
+
+- Every tool call gets a deadline: settings.tool_timeout, a per-tool
+  override from settings.tool_timeouts, or a shorter timeout the client asks
+  for in the request's _meta ({"timeout": seconds}). A call past its
+  deadline is cancelled and returns a ToolResponse error.
+- The deadline is visible to tool code through remaining() and bounded_timeout(),
+  so outbound work (e.g. HTTP requests in http_tools) never waits longer
+  than the caller will.
+- In HTTP mode, CancelOnDisconnectMiddleware cancels the tool calls started
+  over a connection when the client goes away, instead of letting abandoned
+  work run to completion. Explicit MCP cancel notifications are already
+  handled by the MCP SDK.
+
+Work a tool has handed to a thread cannot be interrupted; cancellation stops
+the tool at its next await.
+"""
+
+import asyncio
+import functools
+import logging
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Set
+
+from .base_tools import ToolResponse
+from .config import settings
+from .tool_hooks import ToolFunction, parse_tool_values, wrap_tools
+
+try:
+    from mcp.server.lowlevel.server import request_ctx
+except ImportError:  # Older MCP SDKs do not expose the request context
+    request_ctx = None
+
+logger = logging.getLogger(__name__)
+
+# Absolute deadline (event loop time) of the tool call running in this context
+_deadline: ContextVar[Optional[float]] = ContextVar("tool_deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current tool call's deadline, or None without one."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - asyncio.get_running_loop().time()
+
+
+def bounded_timeout(timeout: float) -> float:
+    """
+    Cap a timeout for outbound work by the current deadline.
+
+    Args:
+        timeout: The timeout that applies without a deadline
+
+    Returns:
+        The smaller of timeout and the time left (never below 1 ms)
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    return max(min(timeout, left), 0.001)
+
+
+class _Connection:
+    """Tool calls started over one HTTP connection."""
+
+    def __init__(self) -> None:
+        self.tasks: Set["asyncio.Task[Any]"] = set()
+        self.disconnected = False
+
+    def disconnect(self) -> None:
+        self.disconnected = True
+        for task in self.tasks:
+            task.cancel()
+
+
+_connection: ContextVar[Optional[_Connection]] = ContextVar("tool_connection", default=None)
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    ASGI middleware cancelling a connection's tool calls when the client leaves.
+
+    The MCP SDK runs tool calls in tasks spawned from the request (SSE: the
+    GET stream; streamable HTTP: the POST), so they inherit the connection
+    recorded here. The disconnect is seen when the transport reads the
+    http.disconnect message.
+    """
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        connection = _Connection()
+
+        async def watching_receive() -> Dict[str, Any]:
+            message = await receive()
+            if message["type"] == "http.disconnect" and not connection.disconnected:
+                if connection.tasks:
+                    logger.info(
+                        "Client disconnected; cancelling %d tool call(s)", len(connection.tasks)
+                    )
+                connection.disconnect()
+            return message
+
+        token = _connection.set(connection)
+        try:
+            await self.app(scope, watching_receive, send)
+        finally:
+            _connection.reset(token)
+
+
+def _client_timeout() -> Optional[float]:
+    """Timeout in seconds requested in the current MCP request's _meta, if any."""
+    if request_ctx is None or not settings.tool_accept_client_timeout:
+        return None
+    context = request_ctx.get(None)
+    meta = getattr(context, "meta", None)
+    value = (getattr(meta, "model_extra", None) or {}).get("timeout")
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return float(value)
+    return None
+
+
+def _non_negative_float(value: str) -> float:
+    seconds = float(value)
+    if seconds < 0:
+        raise ValueError("expected a number of seconds >= 0")
+    return seconds
+
+
+class DeadlinePolicy:
+    """
+    Deadline and cancellation handling for tool calls.
+
+    Args:
+        default_timeout: Seconds allowed per call, 0 for no limit
+        tool_timeouts: Per-tool overrides of default_timeout
+    """
+
+    def __init__(
+        self, default_timeout: float = 0.0, tool_timeouts: Optional[Dict[str, float]] = None
+    ) -> None:
+        self.default_timeout = default_timeout
+        self.tool_timeouts = tool_timeouts or {}
+
+    @classmethod
+    def from_settings(cls) -> "DeadlinePolicy":
+        """Build the policy from the deadline settings."""
+        return cls(
+            default_timeout=settings.tool_timeout,
+            tool_timeouts=parse_tool_values(settings.tool_timeouts, _non_negative_float),
+        )
+
+    def timeout_for(self, tool: str) -> Optional[float]:
+        """Seconds the next call of a tool may take, or None without a limit."""
+        configured = self.tool_timeouts.get(tool, self.default_timeout) or None
+        requested = _client_timeout()
+        candidates = [t for t in (configured, requested) if t is not None]
+        return min(candidates) if candidates else None
+
+    def wrap(self, tool: str, fn: ToolFunction) -> ToolFunction:
+        """
+        Wrap an async tool function with its deadline and disconnect cancellation.
+
+        Args:
+            tool: Tool name, used to find its timeout
+            fn: The async tool function
+
+        Returns:
+            The wrapped function; calls that time out or whose client
+            disconnected return a ToolResponse error
+        """
+
+        @functools.wraps(fn)
+        async def bounded(*args: Any, **kwargs: Any) -> Any:
+            timeout = self.timeout_for(tool)
+            connection = _connection.get()
+            if timeout is None and connection is None:
+                return await fn(*args, **kwargs)
+
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            deadline = _deadline.get()
+            if timeout is not None:
+                deadline = start + timeout if deadline is None else min(deadline, start + timeout)
+
+            token = _deadline.set(deadline)
+            try:
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+            finally:
+                _deadline.reset(token)
+            if connection is not None:
+                connection.tasks.add(task)
+                task.add_done_callback(connection.tasks.discard)
+
+            try:
+                budget = None if deadline is None else max(deadline - start, 0.0)
+                return await asyncio.wait_for(task, budget)
+            except asyncio.TimeoutError:
+                if deadline is None or loop.time() < deadline:
+                    raise  # Raised by the tool itself, not by the deadline
+                return self._failure(
+                    tool, f"Deadline exceeded: {tool} did not finish within {budget:.3g}s", budget
+                )
+            except asyncio.CancelledError:
+                if connection is not None and connection.disconnected and task.cancelled():
+                    return self._failure(tool, "Cancelled: the client disconnected", budget)
+                raise
+
+        return bounded
+
+    @staticmethod
+    def _failure(tool: str, error: str, budget: Optional[float]) -> Dict[str, Any]:
+        logger.warning("%s call ended early: %s", tool, error)
+        return ToolResponse[Dict[str, Any]](
+            success=False, error=error, data={"tool": tool, "timeout_seconds": budget}
+        ).model_dump()
+
+
+def deadline_tools(mcp: Any) -> DeadlinePolicy:
+    """
+    Apply deadlines and disconnect cancellation to every tool registered from now on.
+
+    Args:
+        mcp: The FastMCP server, before its tools are registered
+
+    Returns:
+        The policy, for inspection
+    """
+    policy = DeadlinePolicy.from_settings()
+    wrap_tools(mcp, policy.wrap)
+    return policy
@@ -0,0 +1,333 @@
+"""
+Persistent cache tier for MCP Skeleton.
+
+A small key/value store in a SQLite database (WAL mode), shared by every
+worker process on a node and kept across restarts, so a fresh process starts
+with a warm cache instead of sending every request upstream. It sits under
+the in-memory caches of http_tools and weather_tools: they consult it on a
+miss and write through to it.
+
+- Entries carry an expiry (wall-clock time, comparable across processes) and
+  are kept for an extra grace period afterwards, so stale data can still be
+  revalidated or served while refreshing.
+- Values are stored as compact JSON, zlib-compressed above
+  disk_cache_compress_bytes.
+- The stored values are kept under disk_cache_max_bytes by dropping the
+  least recently read entries first. Running totals kept by triggers and an
+  index on the last access time spare eviction a scan of the table.
+- lookup() and store() run the SQLite I/O in a dedicated thread, so the
+  event loop never waits on the disk or on another process's write lock.
+- The database directory is private to the user running the server (mode
+  0700) and the database file is created with mode 0600.
+- It is best effort: SQLite errors (locked or read-only database, full disk)
+  are counted and logged, and the call proceeds as a cache miss.
+
+Settings: disk_cache_enabled, disk_cache_path, disk_cache_max_bytes,
+disk_cache_compress_bytes.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import pydantic_core
+
+from .config import settings
+from .private_dirs import ensure_private_dir
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the layout changes; older databases are recreated (it is only a cache)
+_SCHEMA_VERSION = 2
+
+_SCHEMA = (
+    """CREATE TABLE entries (
+        key BLOB PRIMARY KEY,
+        value BLOB NOT NULL,
+        compressed INTEGER NOT NULL,
+        expires_at REAL NOT NULL,
+        purge_at REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        size INTEGER NOT NULL
+    ) WITHOUT ROWID""",
+    "CREATE INDEX entries_purge_at ON entries (purge_at)",
+    "CREATE INDEX entries_accessed_at ON entries (accessed_at)",
+    "CREATE TABLE totals (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER, count INTEGER)",
+    "INSERT INTO totals VALUES (0, 0, 0)",
+    """CREATE TRIGGER entries_insert AFTER INSERT ON entries BEGIN
+        UPDATE totals SET size = size + new.size, count = count + 1;
+    END""",
+    """CREATE TRIGGER entries_delete AFTER DELETE ON entries BEGIN
+        UPDATE totals SET size = size - old.size, count = count - 1;
+    END""",
+    """CREATE TRIGGER entries_update AFTER UPDATE OF size ON entries BEGIN
+        UPDATE totals SET size = size + new.size - old.size;
+    END""",
+    f"PRAGMA user_version = {_SCHEMA_VERSION}",
+)
+
+# Seconds a process waits for another one setting up the same database
+_SETUP_TIMEOUT = 5.0
+
+# Writes between two checks of the database size
+_EVICT_EVERY = 64
+
+# Seconds before a read refreshes an entry's last access time; reads of hot
+# entries then rarely need the write lock
+_TOUCH_AFTER = 60.0
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid = 0
+
+
+def _io_thread() -> ThreadPoolExecutor:
+    """The single thread running disk cache I/O in this process."""
+    global _executor, _executor_pid
+    # Threads do not survive a fork: a worker process starts its own
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-cache")
+        _executor_pid = os.getpid()
+    return _executor
+
+
+class DiskCache:
+    """
+    SQLite-backed cache shared by the processes using the same file.
+
+    Args:
+        path: Database file; its directory is created if needed
+        max_bytes: Size the stored values are kept under
+        compress_bytes: Values at least this large (encoded) are compressed
+    """
+
+    def __init__(self, path: str, max_bytes: int, compress_bytes: int = 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress_bytes = compress_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+
+    @classmethod
+    def from_settings(cls) -> Optional["DiskCache"]:
+        """The cache configured in Settings, or None when it is disabled."""
+        if not settings.disk_cache_enabled:
+            return None
+        return cls(
+            settings.disk_cache_path,
+            settings.disk_cache_max_bytes,
+            settings.disk_cache_compress_bytes,
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per process: connections must not cross a fork
+        if self._connection is None or self._pid != os.getpid():
+            # Entries hold upstream responses: keep them away from other users
+            directory = os.path.dirname(self.path)
+            if directory:
+                ensure_private_dir(directory)
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            connection = sqlite3.connect(
+                self.path, timeout=_SETUP_TIMEOUT, isolation_level=None, check_same_thread=False
+            )
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")  # Durable enough for a cache
+                self._create_schema(connection)
+            except BaseException:
+                connection.close()
+                raise
+            connection.execute("PRAGMA busy_timeout = 50")  # Then a busy database is a miss
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> None:
+        """Create the tables unless present, replacing those of an older layout."""
+        # Under the write lock: workers starting together create the tables once
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                # Version 0 with tables present is the first, unversioned layout
+                if version or connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'entries'"
+                ).fetchone():
+                    connection.execute("DROP TABLE IF EXISTS entries")
+                    connection.execute("DROP TABLE IF EXISTS totals")
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+
+    def _failed(self, action: str, error: Exception) -> None:
+        self.errors += 1
+        # The first failure is worth a warning; a persistent one should not flood the log
+        log = logger.warning if self.errors == 1 else logger.debug
+        log("Disk cache %s failed (%s): %s", action, self.path, error)
+
+    @staticmethod
+    def _key(namespace: str, key: str) -> bytes:
+        return hashlib.blake2b(f"{namespace}\0{key}".encode(), digest_size=16).digest()
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Look up an entry that has not been purged yet.
+
+        Args:
+            namespace: Name of the cache using the entry (e.g. "http")
+            key: The entry's key within the namespace
+
+        Returns:
+            Tuple of (value, expires_at as a time.time() timestamp), which may
+            lie in the past for stale entries, or None
+        """
+        digest, now = self._key(namespace, key), time.time()
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value, compressed, expires_at, accessed_at FROM entries "
+                    "WHERE key = ? AND purge_at > ?",
+                    (digest, now),
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            self._failed("read", e)
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        value, compressed, expires_at, accessed_at = row
+        self.hits += 1
+        if now - accessed_at >= _TOUCH_AFTER:
+            try:
+                with self._lock:
+                    self._connect().execute(
+                        "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, digest)
+                    )
+            except (sqlite3.Error, OSError) as e:
+                self._failed("access time update", e)
+        return pydantic_core.from_json(zlib.decompress(value) if compressed else value), expires_at
+
+    def put(self, namespace: str, key: str, value: Any, ttl: float, keep: float = 0.0) -> None:
+        """
+        Store a JSON-compatible value.
+
+        Args:
+            namespace: Name of the cache using the entry
+            key: The entry's key within the namespace
+            value: The value to store
+            ttl: Seconds until the entry expires
+            keep: Seconds the expired entry is kept for revalidation or stale use
+        """
+        encoded = pydantic_core.to_json(value)
+        compressed = len(encoded) >= self.compress_bytes
+        if compressed:
+            encoded = zlib.compress(encoded, 1)
+        if len(encoded) > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + ttl
+        try:
+            with self._lock:
+                # An upsert rather than INSERT OR REPLACE: the replaced row's
+                # delete trigger would not fire and the totals would drift
+                self._connect().execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE "
+                    "SET value = excluded.value, compressed = excluded.compressed, "
+                    "expires_at = excluded.expires_at, purge_at = excluded.purge_at, "
+                    "accessed_at = excluded.accessed_at, size = excluded.size",
+                    (self._key(namespace, key), encoded, int(compressed),
+                     expires_at, expires_at + keep, now, len(encoded)),
+                )
+                self.writes += 1
+                self._writes_since_check += 1
+                if self._writes_since_check >= _EVICT_EVERY:
+                    self._writes_since_check = 0
+                    self._evict()
+        except (sqlite3.Error, OSError) as e:
+            self._failed("write", e)
+
+    def _evict(self) -> None:
+        """Drop purged entries, then the least recently read ones until under max_bytes."""
+        connection = self._connect()
+        connection.execute("DELETE FROM entries WHERE purge_at <= ?", (time.time(),))
+        size, count = connection.execute("SELECT size, count FROM totals").fetchone()
+        if size <= self.max_bytes or not count:
+            return
+        # Drop the same share of entries as the share of bytes over the limit, plus 10%
+        excess = int(count * ((size - self.max_bytes) / size + 0.1)) + 1
+        deleted = connection.execute(
+            "DELETE FROM entries WHERE key IN "
+            "(SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+            (excess,),
+        ).rowcount
+        self.evictions += deleted
+
+    async def lookup(self, namespace: str, key: str) -> Optional[Tuple[Any, float]]:
+        """get() run in the disk cache thread, for callers on the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            _io_thread(), self.get, namespace, key
+        )
+
+    def store(
+        self, namespace: str, key: str, value: Any, ttl: float, keep: float = 0.0
+    ) -> Future:
+        """
+        put() queued to the disk cache thread, without waiting for it.
+
+        Lookups queued afterwards in this process see the entry.
+
+        Returns:
+            Future completed once the entry is written
+        """
+        return _io_thread().submit(self.put, namespace, key, value, ttl, keep)
+
+    def clear(self) -> None:
+        """Delete every entry, in every namespace."""
+        try:
+            with self._lock:
+                self._connect().execute("DELETE FROM entries")
+        except (sqlite3.Error, OSError) as e:
+            self._failed("clear", e)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of this process."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+    def render(self) -> str:
+        """Render this process's counters in the Prometheus text exposition format."""
+        lines = []
+        for name, value in self.stats().items():
+            metric = f"mcp_disk_cache_{name}_total"
+            lines += [
+                f"# HELP {metric} Disk cache {name} in this worker.",
+                f"# TYPE {metric} counter",
+                f"{metric} {value}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+# Shared tier for http_tools and weather_tools; None when disabled
+disk_cache = DiskCache.from_settings()
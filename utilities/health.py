@@ -0,0 +1,144 @@
+"""
+Liveness and readiness checks for MCP Skeleton (HTTP mode).
+
+/healthz answers as long as the worker's event loop does, without touching
+the MCP transport or its sessions, so container health checks and liveness
+probes cost one small request. /readyz also tells whether the worker should
+receive more traffic: it answers 503 once any of these crosses its limit, so
+load balancers send new requests elsewhere before latency collapses.
+
+- Event-loop lag: how late a periodic timer fires (ready_max_loop_lag)
+- Tool calls running in the worker (ready_max_in_flight; counted by the
+  tool metrics, so it needs metrics_enabled)
+- Connections of the shared HTTP client in use or waited for, as a share of
+  http_max_connections (ready_max_pool_utilization)
+
+A limit of 0 disables its check. Each worker process answers for itself.
+"""
+
+import asyncio
+import logging
+import sys
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+from .config import settings
+from .metrics import tool_metrics
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two event-loop lag samples, and seconds of samples kept
+_LAG_INTERVAL = 0.25
+_LAG_WINDOW = 2.0
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how much later than scheduled a sleep returns.
+
+    The reported lag is the worst sample of the last window, so a stall is
+    still visible to a probe that arrives after it ended.
+
+    Args:
+        interval: Seconds between samples
+        window: Seconds of samples the reported lag covers
+    """
+
+    def __init__(self, interval: float = _LAG_INTERVAL, window: float = _LAG_WINDOW) -> None:
+        self.interval = interval
+        self.samples: "deque[float]" = deque(maxlen=max(int(window / interval), 1))
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def lag(self) -> float:
+        """Worst lag in seconds over the window (0 before the first sample)."""
+        return max(self.samples, default=0.0)
+
+    async def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - start - self.interval, 0.0))
+
+
+def _pool_utilization() -> float:
+    """Connections of the shared HTTP client in use or waited for, per allowed connection."""
+    http_client = sys.modules.get("utilities.http_client")
+    if http_client is None:  # No tool has used the client in this worker
+        return 0.0
+    stats = http_client.http_pool.stats()
+    if not stats["open"] or not stats["max_connections"]:
+        return 0.0
+    return (stats["connections_in_use"] + stats["requests_waiting"]) / stats["max_connections"]
+
+
+class HealthChecks:
+    """
+    Readiness of one worker, from its saturation signals.
+
+    Args:
+        max_loop_lag: Seconds of event-loop lag tolerated, 0 to ignore
+        max_in_flight: Tool calls running at once tolerated, 0 to ignore
+        max_pool_utilization: Share of HTTP client connections in use
+            tolerated, 0 to ignore
+    """
+
+    def __init__(
+        self, max_loop_lag: float = 0.0, max_in_flight: int = 0, max_pool_utilization: float = 0.0
+    ) -> None:
+        self.max_loop_lag = max_loop_lag
+        self.max_in_flight = max_in_flight
+        self.max_pool_utilization = max_pool_utilization
+        self.monitor = LoopLagMonitor()
+        self._ready = True
+
+    @classmethod
+    def from_settings(cls) -> "HealthChecks":
+        """Build the checks from the readiness settings."""
+        return cls(
+            max_loop_lag=settings.ready_max_loop_lag,
+            max_in_flight=settings.ready_max_in_flight,
+            max_pool_utilization=settings.ready_max_pool_utilization,
+        )
+
+    def readiness(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Evaluate every check.
+
+        Returns:
+            Tuple of (ready, report) where the report lists each check's
+            value, limit and outcome
+        """
+        checks: Dict[str, Dict[str, Any]] = {}
+        for name, value, limit in (
+            ("loop_lag_seconds", round(self.monitor.lag, 4), self.max_loop_lag),
+            ("tool_calls_in_flight", tool_metrics.in_flight(), self.max_in_flight),
+            ("http_pool_utilization", round(_pool_utilization(), 4), self.max_pool_utilization),
+        ):
+            checks[name] = {"value": value, "limit": limit, "ok": not limit or value <= limit}
+
+        ready = all(check["ok"] for check in checks.values())
+        if ready != self._ready:
+            self._ready = ready
+            if ready:
+                logger.info("Worker ready again")
+            else:
+                failing = [name for name, check in checks.items() if not check["ok"]]
+                logger.warning("Worker not ready: %s over the limit", ", ".join(failing))
+        return ready, {"ready": ready, "checks": checks}
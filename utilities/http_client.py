@@ -0,0 +1,180 @@
+"""
+Shared HTTP client for MCP Skeleton.
+
+Provides a single pooled httpx.AsyncClient per process so that outbound
+requests reuse keep-alive connections instead of paying for a fresh TCP/TLS
+handshake on every tool call. The pool is opened and closed by the server
+lifespan in mcp_server.py and is created lazily when used outside of it
+(tests, scripts).
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientPool:
+    """
+    Process-wide owner of the shared httpx.AsyncClient.
+
+    Limits (total connections, keep-alive connections, keep-alive expiry,
+    HTTP/2, request timeout) come from Settings. httpx has no per-host cap, so one is enforced
+    here with a semaphore per host when http_max_connections_per_host > 0.
+    """
+
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[httpx.AsyncBaseTransport] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_waiting = 0
+        self._in_flight = 0
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create the pooled client from the current settings."""
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        http2 = settings.http_enable_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+                http2 = False
+        return httpx.AsyncClient(
+            limits=limits,
+            http2=http2,
+            timeout=settings.http_timeout,
+            transport=self._transport,
+        )
+
+    def _check_loop(self) -> None:
+        """Drop state bound to an event loop that is no longer running."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._client = None
+            self._host_semaphores.clear()
+            self._host_waiting = 0
+            self._in_flight = 0
+            self._loop = loop
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use."""
+        self._check_loop()
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    def configure(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        """
+        Override the transport used for new clients (e.g. httpx.MockTransport in tests).
+
+        Args:
+            transport: Transport to use, or None to restore the default pool
+        """
+        self._transport = transport
+        self._client = None
+
+    async def start(self) -> None:
+        """Create the shared client eagerly so the first tool call does not pay for it."""
+        _ = self.client
+        logger.info("Shared HTTP client started")
+
+    async def close(self) -> None:
+        """Close the shared client and release all pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._host_semaphores.clear()
+        logger.info("Shared HTTP client closed")
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """
+        Hold one of the per-host connection slots for the duration of a request.
+
+        Every request sent through the shared client runs inside one, so
+        requests in flight are counted here, without per-host limit too.
+
+        Args:
+            url: Request URL; its host selects the semaphore
+        """
+        self._check_loop()
+        limit = settings.http_max_connections_per_host
+        if limit <= 0:
+            async with self._counted():
+                yield
+            return
+
+        host = httpx.URL(url).host
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(limit)
+
+        self._host_waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._host_waiting -= 1
+        try:
+            async with self._counted():
+                yield
+        finally:
+            semaphore.release()
+
+    @asynccontextmanager
+    async def _counted(self) -> AsyncIterator[None]:
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report connection pool usage for sizing the limits.
+
+        Requests waiting are counted here rather than read from httpcore:
+        those beyond http_max_connections in flight wait for a connection,
+        plus those waiting for a per-host slot. Connection counts come from
+        the pool's internals and read 0 if an httpx upgrade moves them.
+
+        Returns:
+            Dictionary with connections in use, idle, waiting requests and limits
+        """
+        in_use = idle = 0
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        try:
+            for connection in getattr(pool, "connections", ()):
+                if connection.is_idle():
+                    idle += 1
+                else:
+                    in_use += 1
+        except AttributeError:
+            in_use = idle = 0
+        waiting = max(self._in_flight - settings.http_max_connections, 0)
+
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "connections_in_use": in_use,
+            "connections_idle": idle,
+            "requests_waiting": waiting + self._host_waiting,
+            "max_connections": settings.http_max_connections,
+            "max_keepalive_connections": settings.http_max_keepalive_connections,
+            "max_connections_per_host": settings.http_max_connections_per_host,
+        }
+
+
+# Global pool instance
+http_pool = HttpClientPool()
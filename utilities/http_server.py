@@ -0,0 +1,420 @@
+"""
+HTTP serving layer for MCP Skeleton.
+
+Builds the ASGI application served in HTTP mode and runs it with uvicorn,
+using the tuning knobs from Settings (workers, backlog, keep-alive timeout,
+concurrency limit) instead of patching uvicorn.
+
+Multi-worker SSE
+----------------
+With HTTP_WORKERS > 1 uvicorn binds the listening socket once and shares it
+between worker processes, so any worker may accept any request. An SSE
+session, however, lives in the worker that accepted its GET stream. The
+SessionAffinityMiddleware below records which worker owns each session in a
+small file-based registry (HTTP_SESSION_DIR) and forwards POSTed messages that
+land on another worker to the owner over its private unix socket. The registry
+directory defaults to a per-user one and must not be writable by other users,
+who could otherwise plant entries pointing at sockets of their own.
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import os
+import re
+import struct
+import sys
+import tempfile
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs
+
+from .config import settings
+from .deadlines import CancelOnDisconnectMiddleware
+from .health import HealthChecks
+from .metrics import tool_metrics
+from .private_dirs import ensure_private_dir
+from .profiling import tool_profiler
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict[str, Any]
+ASGIApp = Callable[..., Any]
+
+_SESSION_ID = re.compile(rb"session_id=([0-9a-fA-F]{32})")
+_SAFE_SESSION_ID = re.compile(r"^[0-9a-fA-F]{32}$")
+
+
+async def _write_frame(writer: asyncio.StreamWriter, header: Dict[str, Any], body: bytes) -> None:
+    """Write a length-prefixed JSON header followed by a length-prefixed body."""
+    encoded = json.dumps(header).encode()
+    writer.write(struct.pack("!I", len(encoded)) + encoded + struct.pack("!I", len(body)) + body)
+    await writer.drain()
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[Dict[str, Any], bytes]:
+    """Read a frame written by _write_frame."""
+    (size,) = struct.unpack("!I", await reader.readexactly(4))
+    header = json.loads(await reader.readexactly(size))
+    (size,) = struct.unpack("!I", await reader.readexactly(4))
+    return header, await reader.readexactly(size)
+
+
+def _encode_headers(headers: List[Tuple[bytes, bytes]]) -> List[List[str]]:
+    return [[name.decode("latin-1"), value.decode("latin-1")] for name, value in headers]
+
+
+def _decode_headers(headers: List[List[str]]) -> List[Tuple[bytes, bytes]]:
+    return [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+
+def default_session_dir() -> str:
+    """Per-user session registry directory: under $XDG_RUNTIME_DIR, else the temp dir."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "mcp-skeleton-sessions")
+    return os.path.join(tempfile.gettempdir(), f"mcp-skeleton-sessions-{os.getuid()}")
+
+
+class SessionAffinityMiddleware:
+    """
+    ASGI middleware keeping each SSE session on the worker that owns it.
+
+    - GET streams answered with text/event-stream are sniffed for the
+      session_id the MCP transport announces; the session is registered as
+      owned by this worker until the stream ends
+    - POSTs carrying a session_id owned by another worker are relayed to that
+      worker's unix socket and the owner's response is returned unchanged
+    """
+
+    def __init__(self, app: ASGIApp, session_dir: str) -> None:
+        self.app = app
+        self.session_dir = session_dir
+        self.socket_path = os.path.join(session_dir, f"worker-{os.getpid()}.sock")
+        self._local: Set[str] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # -- lifecycle -----------------------------------------------------------
+
+    async def start(self) -> None:
+        """
+        Open this worker's relay socket.
+
+        Raises:
+            PermissionError: If the session directory is not private to this user
+        """
+        ensure_private_dir(self.session_dir)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._serve_relay, path=self.socket_path)
+        logger.info("Session relay listening on %s", self.socket_path)
+
+    async def stop(self) -> None:
+        """Close the relay socket and drop this worker's sessions from the registry."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for session_id in list(self._local):
+            self._unregister(session_id)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    # -- registry ------------------------------------------------------------
+
+    def _entry_path(self, session_id: str) -> str:
+        return os.path.join(self.session_dir, session_id.lower())
+
+    def _register(self, session_id: str) -> None:
+        self._local.add(session_id.lower())
+        temp_path = f"{self._entry_path(session_id)}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.socket_path)
+        os.replace(temp_path, self._entry_path(session_id))
+
+    def _unregister(self, session_id: str) -> None:
+        self._local.discard(session_id.lower())
+        try:
+            os.unlink(self._entry_path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def _owner(self, session_id: str) -> Optional[str]:
+        try:
+            with open(self._entry_path(session_id)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    # -- ASGI ----------------------------------------------------------------
+
+    async def __call__(self, scope: Scope, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "GET":
+            await self._handle_stream(scope, receive, send)
+            return
+
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        session_id = query.get("session_id", [""])[0]
+        if (
+            scope["method"] == "POST"
+            and _SAFE_SESSION_ID.match(session_id)
+            and session_id.lower() not in self._local
+        ):
+            owner = self._owner(session_id)
+            if owner is not None and owner != self.socket_path:
+                await self._relay(owner, session_id, scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+    async def _handle_stream(self, scope: Scope, receive: Any, send: Any) -> None:
+        """Pass a GET through, registering the session if it is an SSE stream."""
+        session_id: Optional[str] = None
+        is_event_stream = False
+
+        async def sniffing_send(message: Dict[str, Any]) -> None:
+            nonlocal session_id, is_event_stream
+            if message["type"] == "http.response.start":
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                is_event_stream = content_type.startswith(b"text/event-stream")
+            elif is_event_stream and session_id is None and message["type"] == "http.response.body":
+                match = _SESSION_ID.search(message.get("body", b""))
+                if match:
+                    session_id = match.group(1).decode()
+                    self._register(session_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, sniffing_send)
+        finally:
+            if session_id is not None:
+                self._unregister(session_id)
+
+    async def _relay(
+        self, owner: str, session_id: str, scope: Scope, receive: Any, send: Any
+    ) -> None:
+        """Forward a request to the owning worker and send back its response."""
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        header = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "root_path": scope.get("root_path", ""),
+            "query_string": scope.get("query_string", b"").decode("latin-1"),
+            "headers": _encode_headers(scope.get("headers", [])),
+        }
+        try:
+            reader, writer = await asyncio.open_unix_connection(owner)
+        except OSError:
+            # The owning worker is gone; its session cannot be resumed
+            self._unregister(session_id)
+            await self.app(scope, _replay(body), send)
+            return
+
+        try:
+            await _write_frame(writer, header, body)
+            response, response_body = await _read_frame(reader)
+        finally:
+            writer.close()
+
+        await send({
+            "type": "http.response.start",
+            "status": response["status"],
+            "headers": _decode_headers(response["headers"]),
+        })
+        await send({"type": "http.response.body", "body": response_body})
+
+    async def _serve_relay(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Run a relayed request against the local app and write the response back."""
+        try:
+            request, body = await _read_frame(reader)
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": request["method"],
+                "scheme": "http",
+                "path": request["path"],
+                "raw_path": request["path"].encode(),
+                "root_path": request["root_path"],
+                "query_string": request["query_string"].encode("latin-1"),
+                "headers": _decode_headers(request["headers"]),
+                "client": None,
+                "server": None,
+            }
+            status = 500
+            headers: List[List[str]] = []
+            chunks: List[bytes] = []
+
+            async def collect(message: Dict[str, Any]) -> None:
+                nonlocal status, headers
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = _encode_headers(message.get("headers", []))
+                elif message["type"] == "http.response.body":
+                    chunks.append(message.get("body", b""))
+
+            await self.app(scope, _replay(body), collect)
+            await _write_frame(writer, {"status": status, "headers": headers}, b"".join(chunks))
+        except Exception:
+            logger.exception("Failed to serve relayed session request")
+        finally:
+            writer.close()
+
+
+def _replay(body: bytes) -> Callable[[], Any]:
+    """ASGI receive callable that yields an already-read request body once."""
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()  # Nothing more to receive; wait for cancellation
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+def build_http_app(
+    mcp_app: ASGIApp,
+    lifespan: Callable[[], Any],
+    transport_lifespan: Optional[Callable[[], Any]] = None,
+    session_affinity: bool = False,
+) -> ASGIApp:
+    """
+    Wrap the MCP ASGI app for serving under uvicorn.
+
+    The returned app enters the server lifespan once per worker process (so
+    shared pools live as long as the worker, not a single session or request),
+    answers liveness (/healthz) and readiness (/readyz) checks outside the
+    MCP transport, and serves the tool metrics at /metrics when metrics are
+    enabled. When
+    settings.admin_token is set, /admin/profiling reads (GET) or changes (POST
+    a JSON object with sample_rate and/or slow_call_threshold) the profiling
+    settings of the worker that receives the request.
+
+    Args:
+        mcp_app: The transport app produced by FastMCP (e.g. mcp.sse_app())
+        lifespan: The server lifespan (utilities.lifecycle.server_lifespan)
+        transport_lifespan: Lifespan the transport app needs (e.g. the
+            streamable-HTTP session manager), since mounted apps do not get one
+        session_affinity: Route SSE sessions to their owning worker when more
+            than one worker is configured
+
+    Returns:
+        ASGI application
+    """
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, PlainTextResponse
+    from starlette.routing import Mount, Route
+
+    router: Optional[SessionAffinityMiddleware] = None
+    if session_affinity and settings.http_workers > 1:
+        router = SessionAffinityMiddleware(
+            mcp_app, settings.http_session_dir or default_session_dir()
+        )
+    health = HealthChecks.from_settings()
+
+    @asynccontextmanager
+    async def app_lifespan(app: Any) -> AsyncIterator[None]:
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(lifespan())
+            if transport_lifespan is not None:
+                await stack.enter_async_context(transport_lifespan())
+            if router is not None:
+                await router.start()
+                stack.push_async_callback(router.stop)
+            await health.monitor.start()
+            stack.push_async_callback(health.monitor.stop)
+            yield
+
+    async def healthz(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok"})
+
+    async def readyz(request: Request) -> JSONResponse:
+        ready, report = health.readiness()
+        return JSONResponse(report, status_code=200 if ready else 503)
+
+    async def metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(tool_metrics.render(), media_type="text/plain; version=0.0.4")
+
+    async def profiling(request: Request) -> JSONResponse:
+        expected = f"Bearer {settings.admin_token}"
+        if not hmac.compare_digest(request.headers.get("authorization", ""), expected):
+            return JSONResponse({"error": "Unauthorized"}, status_code=401)
+        if request.method == "GET":
+            return JSONResponse(tool_profiler.status())
+        try:
+            changes = await request.json()
+            return JSONResponse(tool_profiler.configure(
+                sample_rate=changes.get("sample_rate"),
+                slow_call_threshold=changes.get("slow_call_threshold"),
+            ))
+        except (ValueError, TypeError, AttributeError) as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+
+    routes: List[Any] = [
+        Route("/healthz", healthz, methods=["GET"]),
+        Route("/readyz", readyz, methods=["GET"]),
+    ]
+    if settings.metrics_enabled:
+        routes.append(Route("/metrics", metrics, methods=["GET"]))
+    if settings.admin_token:
+        routes.append(Route("/admin/profiling", profiling, methods=["GET", "POST"]))
+    # Abandoned tool calls are cancelled when their client disconnects
+    routes.append(Mount("/", app=CancelOnDisconnectMiddleware(router or mcp_app)))
+    return Starlette(routes=routes, lifespan=app_lifespan)
+
+
+def _import_string(factory: Callable[[], ASGIApp]) -> str:
+    """Import string for a factory, resolving __main__ to the script's module name."""
+    module = factory.__module__
+    if module == "__main__":
+        main_file = getattr(sys.modules["__main__"], "__file__", "")
+        module = os.path.splitext(os.path.basename(main_file))[0]
+    return f"{module}:{factory.__qualname__}"
+
+
+def serve_http(app_factory: Callable[[], ASGIApp]) -> None:
+    """
+    Run the HTTP server with uvicorn.
+
+    Args:
+        app_factory: Zero-argument function returning the ASGI app. With more
+            than one worker uvicorn imports it by name in each worker process,
+            so it must be a module-level function
+    """
+    import uvicorn
+
+    app: Any = app_factory
+    if settings.http_workers > 1:
+        app = _import_string(app_factory)
+
+    uvicorn.run(
+        app,
+        factory=True,
+        host=settings.mcp_server_host,
+        port=settings.mcp_server_port,
+        workers=settings.http_workers,
+        backlog=settings.http_backlog,
+        timeout_keep_alive=settings.http_keepalive_timeout,
+        limit_concurrency=settings.http_limit_concurrency,
+        timeout_graceful_shutdown=settings.http_graceful_shutdown_timeout,
+        log_level=settings.log_level.lower(),
+        log_config=None,  # uvicorn's loggers propagate to the logging pipeline
+    )
@@ -0,0 +1,61 @@
+"""
+Deferred imports for MCP Skeleton.
+
+Tool implementations (and the libraries they pull in, such as httpx or
+numpy) are imported the first time they are called instead of when the
+server starts. Stdio clients launch the server for every session, so import
+time is paid directly as startup latency.
+
+Targets are written as "package.module:attribute", e.g.
+"tools.http_tools:fetch_api_data" or "utilities.http_client:http_pool.close".
+"""
+
+import importlib
+import sys
+from functools import reduce
+from typing import Any, Callable, Optional
+
+
+def _split(target: str) -> tuple:
+    module, _, attribute = target.partition(":")
+    if not module or not attribute:
+        raise ValueError(f"Lazy target must look like 'package.module:attribute', got {target!r}")
+    return module, attribute
+
+
+def resolve(target: str) -> Any:
+    """Import the module and return the (possibly dotted) attribute a target names."""
+    module, attribute = _split(target)
+    return reduce(getattr, attribute.split("."), importlib.import_module(module))
+
+
+def lazy_callable(target: str, only_if_imported: bool = False) -> Callable[..., Any]:
+    """
+    Return a stand-in that imports a callable on first call and then delegates to it.
+
+    Async targets work unchanged: the stand-in returns the coroutine for the
+    caller to await.
+
+    Args:
+        target: "package.module:attribute" naming the callable
+        only_if_imported: Skip the call (returning None) unless the module was
+            already imported by someone else - for shutdown hooks that release
+            resources a module creates only once it is used
+
+    Returns:
+        The stand-in callable
+    """
+    module, attribute = _split(target)
+    function: Optional[Callable[..., Any]] = None
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        nonlocal function
+        if function is None:
+            if only_if_imported and module not in sys.modules:
+                return None
+            function = resolve(target)
+        return function(*args, **kwargs)
+
+    call.__name__ = attribute.rsplit(".", 1)[-1]
+    call.__qualname__ = f"lazy({target})"
+    return call
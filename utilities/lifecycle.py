@@ -0,0 +1,80 @@
+"""
+Server lifecycle management for MCP Skeleton.
+
+Collects startup and shutdown hooks for shared resources (connection pools,
+worker pools, caches) and exposes them as a single lifespan for FastMCP.
+"""
+
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, List
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[[], Any]
+
+
+class ServerLifespan:
+    """
+    Lifespan that runs startup hooks once and shutdown hooks once.
+
+    Reference counted: depending on the transport, the framework may enter the
+    lifespan once per process or once per client session. Startup hooks run
+    when the first user enters and shutdown hooks (in reverse order) when the
+    last one leaves, so shared resources are never torn down under an active
+    session. Hooks may be plain or async callables.
+    """
+
+    def __init__(self) -> None:
+        self._startup: List[Hook] = []
+        self._shutdown: List[Hook] = []
+        self._users = 0
+
+    def on_startup(self, hook: Hook) -> Hook:
+        """Register a hook to run when the server starts."""
+        self._startup.append(hook)
+        return hook
+
+    def on_shutdown(self, hook: Hook) -> Hook:
+        """Register a hook to run when the server stops."""
+        self._shutdown.append(hook)
+        return hook
+
+    @property
+    def active(self) -> bool:
+        """Whether the lifespan is currently entered."""
+        return self._users > 0
+
+    @staticmethod
+    async def _run(hook: Hook) -> None:
+        result = hook()
+        if inspect.isawaitable(result):
+            await result
+
+    @asynccontextmanager
+    async def __call__(self, server: Any = None) -> AsyncIterator[None]:
+        """
+        Enter the lifespan.
+
+        Args:
+            server: The MCP server instance (unused, accepted for the hook signature)
+        """
+        self._users += 1
+        if self._users == 1:
+            for hook in self._startup:
+                await self._run(hook)
+        try:
+            yield
+        finally:
+            self._users -= 1
+            if self._users == 0:
+                for hook in reversed(self._shutdown):
+                    try:
+                        await self._run(hook)
+                    except Exception:
+                        logger.exception("Shutdown hook %r failed", hook)
+
+
+# Global lifespan instance used by mcp_server.py
+server_lifespan = ServerLifespan()
@@ -0,0 +1,275 @@
+"""
+Logging pipeline for MCP Skeleton.
+
+configure_logging() replaces logging.basicConfig:
+
+- Asynchronous (log_async): log calls only put the record on a bounded queue;
+  a background thread formats and writes it, so a slow or blocked stderr
+  never stalls the event loop. When the queue is full, records are dropped
+  and counted instead of blocking.
+- Lazy: message arguments are merged ("%s" style) on the writer thread, not
+  by the caller. Do not mutate objects after passing them as log arguments.
+- Structured (log_format="json"): one JSON object per line, with the tool
+  name, call id and duration of the tool call the record belongs to.
+- Rate limited (log_repeat_limit / log_repeat_window): records from the same
+  call site (logger, level and message template) beyond the limit within a
+  window are suppressed; the next one emitted reports how many were dropped.
+
+log_tools(mcp) tags records logged during a tool call with the tool name and
+a call id, and logs each call's duration at DEBUG.
+
+The per-call cost on the hot path is measured by benchmarks/bench_logging.py.
+"""
+
+import atexit
+import functools
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+from .config import settings
+from .tool_hooks import ToolFunction, wrap_tools
+
+_TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# (tool name, call id) of the tool call running in this context
+_current_call: ContextVar[Optional[Tuple[str, str]]] = ContextVar("log_call", default=None)
+_call_ids = itertools.count(1)
+_call_prefix = f"{os.getpid():x}"
+
+# Standard LogRecord attributes (and uvicorn's ANSI-colored duplicate of the
+# message), not copied into JSON output as extra fields
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "tool", "call_id", "suppressed", "color_message",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("tool", "call_id", "suppressed"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        # Fields passed with extra={...}, e.g. duration_ms
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The classic text format, with the tool call and suppression count appended."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        call_id = getattr(record, "call_id", None)
+        if call_id is not None:
+            text += f" [tool={record.tool} call={call_id}]"
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            text += f" ({suppressed} similar messages suppressed)"
+        return text
+
+
+class _CallContextFilter(logging.Filter):
+    """Tag records with the tool call running where they were logged."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        call = _current_call.get()
+        if call is not None and getattr(record, "call_id", None) is None:
+            record.tool, record.call_id = call
+        return True
+
+
+class RepeatLimitFilter(logging.Filter):
+    """
+    Drop repeats of the same call site beyond a limit per time window.
+
+    A call site is (logger name, level, unformatted message template), so an
+    error logged in a loop with varying arguments counts as one site.
+    """
+
+    def __init__(self, limit: int, window: float) -> None:
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._sites: Dict[Tuple[str, int, str], List[float]] = {}  # [start, count, dropped]
+        self._lock = threading.Lock()  # Tools log from worker threads too
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                if len(self._sites) >= 10_000:  # Bound memory if messages are not templates
+                    self._sites.clear()
+                self._sites[key] = [now, 1, 0]
+                if site is not None and site[2]:
+                    record.suppressed = int(site[2])
+                return True
+            site[1] += 1
+            if site[1] <= self.limit:
+                return True
+            site[2] += 1
+            return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that neither formats records nor blocks when the queue is full."""
+
+    def __init__(self, log_queue: "queue.Queue[Any]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting is left to the writer thread (the stock handler formats here)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Writer(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room in a full queue instead of failing."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def build_handler(
+    stream: IO[str],
+    json_format: bool = False,
+    queue_size: int = 0,
+    repeat_limit: int = 0,
+    repeat_window: float = 60.0,
+) -> Tuple[logging.Handler, Optional[logging.handlers.QueueListener]]:
+    """
+    Build the pipeline's handler.
+
+    Args:
+        stream: Where formatted records are written
+        json_format: Write JSON lines instead of text
+        queue_size: Queue records for a background writer, holding at most
+            this many; 0 writes synchronously from the logging thread
+        repeat_limit: Records per call site and window; 0 = unlimited
+        repeat_window: Window of repeat_limit in seconds
+
+    Returns:
+        The handler to attach, and the listener writing its queue (not yet
+        started) when queue_size > 0
+    """
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter() if json_format else TextFormatter(_TEXT_FORMAT))
+
+    handler: logging.Handler = output
+    listener = None
+    if queue_size > 0:
+        queued = NonBlockingQueueHandler(queue.Queue(queue_size))
+        listener = _Writer(queued.queue, output)
+        handler = queued
+
+    # Filters run in the logging thread, before the record is queued
+    handler.addFilter(_CallContextFilter())
+    if repeat_limit > 0:
+        handler.addFilter(RepeatLimitFilter(repeat_limit, repeat_window))
+    return handler, listener
+
+
+_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging() -> None:
+    """Install the logging pipeline on the root logger according to Settings."""
+    global _handler, _listener
+    shutdown_logging()
+
+    _handler, _listener = build_handler(
+        sys.stderr,
+        json_format=settings.log_format == "json",
+        queue_size=settings.log_queue_size if settings.log_async else 0,
+        repeat_limit=settings.log_repeat_limit,
+        repeat_window=settings.log_repeat_window,
+    )
+    if _listener is not None:
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(getattr(logging, settings.log_level.upper()))
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    if isinstance(_handler, NonBlockingQueueHandler) and _handler.dropped:
+        print(f"Logging queue overflowed; {_handler.dropped} records dropped", file=sys.stderr)
+
+
+def log_tools(mcp: Any) -> None:
+    """
+    Tag log records with the tool call they belong to, for every tool registered from now on.
+
+    Args:
+        mcp: The FastMCP server, before its tools are registered
+    """
+    logger = logging.getLogger("mcp_skeleton.tools")
+
+    def wrap(tool: str, fn: ToolFunction) -> ToolFunction:
+        @functools.wraps(fn)
+        async def logged(*args: Any, **kwargs: Any) -> Any:
+            call_id = f"{_call_prefix}-{next(_call_ids)}"
+            token = _current_call.set((tool, call_id))
+            start = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                logger.warning(
+                    "Tool call failed: %s", type(e).__name__,
+                    extra={"duration_ms": round((time.perf_counter() - start) * 1000, 3)},
+                )
+                raise
+            else:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Tool call finished",
+                        extra={"duration_ms": round((time.perf_counter() - start) * 1000, 3)},
+                    )
+                return result
+            finally:
+                _current_call.reset(token)
+
+        return logged
+
+    wrap_tools(mcp, wrap)
@@ -0,0 +1,206 @@
+"""
+Per-tool metrics for MCP Skeleton.
+
+Records call counts, in-flight calls, errors by exception type, latency and
+response payload size for every registered tool, and renders them in the
+Prometheus text exposition format (served at /metrics in HTTP mode).
+
+instrument_tools(mcp) hooks mcp.tool() so every tool registered afterwards is
+measured without touching the tool code.
+
+Recording is lock-free: tool wrappers only run on the event loop thread, so
+the counters are plain integers updated without synchronization. Each worker
+process keeps its own series, labelled with its pid.
+"""
+
+import functools
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from .config import settings
+from .serialization import payload_size
+from .tool_hooks import ToolFunction, wrap_tools
+
+# Histogram upper bounds (the +Inf bucket is implicit)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+PAYLOAD_BUCKETS: Tuple[float, ...] = (
+    64, 256, 1_024, 4_096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216,
+)
+
+
+class _Histogram:
+    """Fixed-bucket histogram; counts are stored per bucket and summed on render."""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str, lines: List[str]) -> None:
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+
+
+class _ToolSeries:
+    """All series recorded for one tool."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.errors: Dict[str, int] = {}
+        self.latency = _Histogram(LATENCY_BUCKETS)
+        self.payload = _Histogram(PAYLOAD_BUCKETS)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ToolMetrics:
+    """Registry of per-tool metrics."""
+
+    def __init__(self) -> None:
+        self._tools: Dict[str, _ToolSeries] = {}
+        self._collectors: List[Callable[[], str]] = []
+        self._worker = str(os.getpid())
+
+    def add_collector(self, collector: Callable[[], str]) -> None:
+        """
+        Append another component's exposition text (e.g. admission control) to render().
+
+        A collector returning None (e.g. for a component not in use) adds nothing.
+        """
+        self._collectors.append(collector)
+
+    def reset(self) -> None:
+        """Drop every recorded series (used by tests)."""
+        self._tools.clear()
+
+    def series(self, tool: str) -> _ToolSeries:
+        """Return the series for a tool, creating it on first use."""
+        series = self._tools.get(tool)
+        if series is None:
+            series = self._tools[tool] = _ToolSeries()
+        return series
+
+    def in_flight(self) -> int:
+        """Tool calls running in this worker, across all tools."""
+        return sum(series.in_flight for series in self._tools.values())
+
+    def instrument(self, tool: str, fn: ToolFunction) -> ToolFunction:
+        """
+        Wrap an async tool function so each call is recorded.
+
+        The wrapper keeps the function's name, docstring and signature, so
+        FastMCP derives the same tool schema from it.
+
+        Args:
+            tool: Tool name used as the metric label
+            fn: The async tool function
+
+        Returns:
+            The instrumented function
+        """
+        series = self.series(tool)
+
+        @functools.wraps(fn)
+        async def instrumented(*args: Any, **kwargs: Any) -> Any:
+            series.in_flight += 1
+            start = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as e:
+                name = type(e).__name__
+                series.errors[name] = series.errors.get(name, 0) + 1
+                raise
+            finally:
+                series.latency.observe(time.perf_counter() - start)
+                series.in_flight -= 1
+                series.calls += 1
+            series.payload.observe(payload_size(result))
+            return result
+
+        return instrumented
+
+    def render(self) -> str:
+        """Render all series in the Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        tools = sorted(self._tools.items())
+        labels = {
+            tool: f'tool="{_escape(tool)}",worker="{self._worker}"' for tool, _ in tools
+        }
+
+        lines += [
+            "# HELP mcp_tool_calls_total Tool calls completed, successful or not.",
+            "# TYPE mcp_tool_calls_total counter",
+        ]
+        lines += [f"mcp_tool_calls_total{{{labels[tool]}}} {s.calls}" for tool, s in tools]
+
+        lines += [
+            "# HELP mcp_tool_errors_total Tool calls that raised, by exception type.",
+            "# TYPE mcp_tool_errors_total counter",
+        ]
+        for tool, s in tools:
+            for exception, count in sorted(s.errors.items()):
+                lines.append(
+                    f'mcp_tool_errors_total{{{labels[tool]},exception="{_escape(exception)}"}} '
+                    f"{count}"
+                )
+
+        lines += [
+            "# HELP mcp_tool_in_flight Tool calls currently running.",
+            "# TYPE mcp_tool_in_flight gauge",
+        ]
+        lines += [f"mcp_tool_in_flight{{{labels[tool]}}} {s.in_flight}" for tool, s in tools]
+
+        lines += [
+            "# HELP mcp_tool_duration_seconds Tool call latency.",
+            "# TYPE mcp_tool_duration_seconds histogram",
+        ]
+        for tool, s in tools:
+            s.latency.render("mcp_tool_duration_seconds", labels[tool], lines)
+
+        lines += [
+            "# HELP mcp_tool_response_bytes Size of successful tool results serialized as JSON.",
+            "# TYPE mcp_tool_response_bytes histogram",
+        ]
+        for tool, s in tools:
+            s.payload.render("mcp_tool_response_bytes", labels[tool], lines)
+
+        collected = "".join(collector() or "" for collector in self._collectors)
+        return "\n".join(lines) + "\n" + collected
+
+
+# Global metrics registry
+tool_metrics = ToolMetrics()
+
+
+def instrument_tools(mcp: Any, metrics: ToolMetrics = tool_metrics) -> None:
+    """
+    Measure every tool registered on a FastMCP server from now on.
+
+    Does nothing when settings.metrics_enabled is false.
+
+    Args:
+        mcp: The FastMCP server, before its tools are registered
+        metrics: Registry to record into
+    """
+    if settings.metrics_enabled:
+        wrap_tools(mcp, metrics.instrument)
@@ -0,0 +1,26 @@
+"""
+Private directories for MCP Skeleton.
+
+Node-local state (the SSE session registry, the disk cache) lives in
+directories other local users must not read or plant files in.
+"""
+
+import os
+import stat
+
+
+def ensure_private_dir(path: str) -> None:
+    """
+    Create a directory with mode 0700, or check that an existing one is as private.
+
+    Raises:
+        PermissionError: If the path is not a directory of this user, or other
+            users have any access to it
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(
+            f"Directory {path} must be a directory owned by uid {os.getuid()} "
+            f"with mode 0700 (found uid {info.st_uid}, mode {stat.filemode(info.st_mode)})"
+        )
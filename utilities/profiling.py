@@ -0,0 +1,265 @@
+"""
+On-demand profiling for MCP Skeleton tool calls.
+
+Two independent switches, both adjustable while the server runs (see the
+/admin/profiling endpoint in utilities/http_server.py):
+
+- Sampling profiler: a fraction of tool calls (profile_sample_rate) runs
+  under cProfile and the stats are written to profile_dir as
+  <tool>-<timestamp>-<pid>.prof, readable with pstats or snakeviz
+- Slow-call capture: calls running longer than slow_call_threshold seconds
+  are logged with their arguments and a stack sample taken while the call
+  was still running
+
+Only one call is profiled at a time (cProfile is per thread and cannot be
+nested), and because tools share the event loop, a profile also contains any
+other task that ran on the loop meanwhile.
+"""
+
+import asyncio
+import cProfile
+import functools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .config import settings
+from .tool_hooks import ToolFunction, wrap_tools
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ActiveCall:
+    tool: str
+    started: float
+    arguments: Dict[str, Any]
+    task: Optional["asyncio.Task[Any]"]
+    thread_id: int
+    stack: Optional[str] = field(default=None)
+
+
+def _format_arguments(arguments: Dict[str, Any]) -> str:
+    """repr of the call arguments, each value cut to profile_max_argument_chars."""
+    limit = settings.profile_max_argument_chars
+    parts = []
+    for name, value in arguments.items():
+        text = repr(value)
+        if len(text) > limit:
+            text = f"{text[:limit]}... ({len(text)} chars)"
+        parts.append(f"{name}={text}")
+    return ", ".join(parts)
+
+
+class ToolProfiler:
+    """
+    Sampling profiler and slow-call watchdog for tool calls.
+
+    The watchdog is a daemon thread started by the first watched call. Every
+    interval it looks for calls past the threshold and samples
+    both the event loop thread's stack (which shows the culprit when a tool
+    blocks the loop) and the call's own coroutine stack (which shows what it
+    is awaiting).
+    """
+
+    def __init__(self) -> None:
+        self.sample_rate = settings.profile_sample_rate
+        self.slow_call_threshold = settings.slow_call_threshold
+        self.profile_dir = settings.profile_dir
+        self._active: Dict[int, _ActiveCall] = {}
+        self._profiling = False
+        self._watchdog: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        sample_rate: Optional[float] = None,
+        slow_call_threshold: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Change the profiling settings at runtime.
+
+        Args:
+            sample_rate: Fraction of calls to profile, 0 disables sampling
+            slow_call_threshold: Seconds after which a call is logged as slow,
+                0 disables slow-call capture
+
+        Returns:
+            The settings now in effect
+
+        Raises:
+            ValueError: If a value is out of range
+        """
+        if sample_rate is not None:
+            if not 0.0 <= sample_rate <= 1.0:
+                raise ValueError("sample_rate must be between 0 and 1")
+            self.sample_rate = sample_rate
+        if slow_call_threshold is not None:
+            if slow_call_threshold < 0:
+                raise ValueError("slow_call_threshold must not be negative")
+            self.slow_call_threshold = slow_call_threshold
+        logger.info(
+            "Profiling: sample_rate=%s slow_call_threshold=%ss",
+            self.sample_rate, self.slow_call_threshold,
+        )
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """Current settings and number of calls being watched."""
+        return {
+            "sample_rate": self.sample_rate,
+            "slow_call_threshold": self.slow_call_threshold,
+            "profile_dir": self.profile_dir,
+            "active_calls": len(self._active),
+        }
+
+    def wrap(self, tool: str, fn: ToolFunction) -> ToolFunction:
+        """
+        Wrap an async tool function with sampling and slow-call capture.
+
+        Args:
+            tool: Tool name used in logs and profile file names
+            fn: The async tool function
+
+        Returns:
+            The wrapped function
+        """
+
+        @functools.wraps(fn)
+        async def profiled(*args: Any, **kwargs: Any) -> Any:
+            watch = self.slow_call_threshold > 0
+            sample = (
+                self.sample_rate > 0
+                and not self._profiling
+                and random.random() < self.sample_rate
+            )
+            if not watch and not sample:
+                return await fn(*args, **kwargs)
+
+            call = _ActiveCall(
+                tool=tool,
+                started=time.monotonic(),
+                arguments={**{f"arg{i}": a for i, a in enumerate(args)}, **kwargs},
+                task=asyncio.current_task(),
+                thread_id=threading.get_ident(),
+            )
+            if watch:
+                self._watch(call)
+            profile = self._start_profile() if sample else None
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                if profile is not None:
+                    await self._finish_profile(tool, profile)
+                if watch:
+                    self._unwatch(call)
+
+        return profiled
+
+    # -- sampling ------------------------------------------------------------
+
+    def _start_profile(self) -> Optional[cProfile.Profile]:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # Another profiler (e.g. a debugger) is active
+            return None
+        self._profiling = True
+        return profile
+
+    async def _finish_profile(self, tool: str, profile: cProfile.Profile) -> None:
+        profile.disable()
+        self._profiling = False
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S.%f")[:-3]
+        path = os.path.join(self.profile_dir, f"{tool}-{stamp}-{os.getpid()}.prof")
+        try:
+            await asyncio.to_thread(self._dump, profile, path)
+            logger.info("Wrote profile for %s to %s", tool, path)
+        except OSError as e:
+            logger.warning("Could not write profile for %s: %s", tool, e)
+
+    @staticmethod
+    def _dump(profile: cProfile.Profile, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profile.dump_stats(path)
+
+    # -- slow calls ----------------------------------------------------------
+
+    def _watch(self, call: _ActiveCall) -> None:
+        with self._lock:
+            self._active[id(call)] = call
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(
+                    target=self._run_watchdog, name="slow-call-watchdog", daemon=True
+                )
+                self._watchdog.start()
+
+    def _unwatch(self, call: _ActiveCall) -> None:
+        with self._lock:
+            self._active.pop(id(call), None)
+        elapsed = time.monotonic() - call.started
+        threshold = self.slow_call_threshold
+        if threshold <= 0 or elapsed < threshold:
+            return
+        logger.warning(
+            "Slow tool call: %s took %.3fs (threshold %.3fs)\n"
+            "  arguments: %s\n"
+            "  stack sample:\n%s",
+            call.tool, elapsed, threshold, _format_arguments(call.arguments),
+            call.stack or "    (no sample: the call finished before the watchdog ran)",
+        )
+
+    def _run_watchdog(self) -> None:
+        while True:
+            threshold = self.slow_call_threshold
+            time.sleep(min(max(threshold / 4, 0.01), 1.0) if threshold > 0 else 1.0)
+            now = time.monotonic()
+            with self._lock:
+                overdue = [
+                    call for call in self._active.values()
+                    if call.stack is None and threshold > 0 and now - call.started >= threshold
+                ]
+            for call in overdue:
+                call.stack = self._sample_stack(call)
+
+    @staticmethod
+    def _sample_stack(call: _ActiveCall) -> str:
+        """Format the loop thread's current stack and the call's coroutine stack."""
+        sections = []
+        frame = sys._current_frames().get(call.thread_id)
+        if frame is not None:
+            loop_stack = "".join(traceback.format_stack(frame))
+            sections.append(f"    event loop thread:\n{loop_stack}")
+        if call.task is not None:
+            try:
+                frames = call.task.get_stack()
+                summary = traceback.StackSummary.extract((f, f.f_lineno) for f in frames)
+                sections.append(f"    awaiting in task:\n{''.join(summary.format())}")
+            except Exception:  # The task may finish while its frames are read
+                pass
+        return "".join(sections)
+
+
+# Global profiler instance
+tool_profiler = ToolProfiler()
+
+
+def profile_tools(mcp: Any, profiler: ToolProfiler = tool_profiler) -> None:
+    """
+    Put every tool registered on a FastMCP server from now on under the profiler.
+
+    The wrapper is always installed so profiling can be switched on at runtime;
+    while both switches are off it adds only two attribute checks per call.
+
+    Args:
+        mcp: The FastMCP server, before its tools are registered
+        profiler: Profiler to use
+    """
+    wrap_tools(mcp, profiler.wrap)
@@ -0,0 +1,118 @@
+"""
+Fast-path serialization of tool results.
+
+FastMCP turns a tool's dict result into text content by encoding it as
+indented JSON, and the metrics hook encoded it once more to measure its size.
+serialize_tools(mcp) instead encodes each result once, compactly, straight
+from the tool's objects (a ToolResponse model is encoded without a
+model_dump() copy), and returns it as a ready-made CallToolResult. That
+result is built without re-validation (it is produced here, from our own
+tools) and the MCP SDK passes it through as is.
+
+Only dict and ToolResponse results of tools without an output schema take
+the fast path; tools with structured output keep the SDK's validation, and
+other results (strings, content blocks, lists) its conversion rules. Calls
+made from inside another tool (see utilities/batch.py) run under
+raw_results() and get the tool's own return value.
+Setting: fast_serialization.
+
+benchmarks/bench_serialization.py compares both paths by result size.
+"""
+
+import functools
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+import pydantic_core
+from mcp.types import CallToolResult, TextContent
+
+from .base_tools import ToolResponse
+from .config import settings
+from .tool_hooks import ToolFunction, wrap_tools
+
+logger = logging.getLogger(__name__)
+
+# Set while a tool calls other tools and needs their results as Python objects
+_raw: ContextVar[bool] = ContextVar("raw_results", default=False)
+
+
+@contextmanager
+def raw_results() -> Iterator[None]:
+    """Skip the fast path for tool calls made in this block (and tasks they start)."""
+    token = _raw.set(True)
+    try:
+        yield
+    finally:
+        _raw.reset(token)
+
+
+def encode(result: Any) -> bytes:
+    """Encode a tool result as compact JSON in one pass (unknown types via str())."""
+    return pydantic_core.to_json(result, fallback=str)
+
+
+def encode_result(result: Any) -> CallToolResult:
+    """
+    Build the MCP result for a tool's return value without validation.
+
+    Args:
+        result: A JSON-compatible value or pydantic model
+
+    Returns:
+        A CallToolResult with the encoded value as its only text content
+    """
+    text = TextContent.model_construct(type="text", text=encode(result).decode())
+    return CallToolResult.model_construct(content=[text], isError=False)
+
+
+def payload_size(result: Any) -> int:
+    """Size in bytes of a tool result as sent, reusing the fast path's encoding."""
+    if isinstance(result, CallToolResult):
+        size = 0
+        for block in result.content:
+            text = getattr(block, "text", None)
+            if text is not None:
+                size += len(text) if text.isascii() else len(text.encode())
+        return size
+    return len(encode(result))
+
+
+def _has_output_schema(mcp: Any, tool: str) -> bool:
+    """Whether a registered tool declares structured output (True if unknown)."""
+    try:
+        registered = mcp._tool_manager.get_tool(tool)
+    except AttributeError:  # FastMCP without a tool manager: keep the SDK path
+        return True
+    return registered is None or getattr(registered, "output_schema", None) is not None
+
+
+def serialize_tools(mcp: Any) -> None:
+    """
+    Encode the results of every tool registered from now on on the fast path.
+
+    Args:
+        mcp: The FastMCP server, before its tools are registered
+    """
+    if not settings.fast_serialization:
+        return
+
+    def wrap(tool: str, fn: ToolFunction) -> ToolFunction:
+        structured: Optional[bool] = None  # Known once the tool is registered
+
+        @functools.wraps(fn)
+        async def serialized(*args: Any, **kwargs: Any) -> Any:
+            nonlocal structured
+            result = await fn(*args, **kwargs)
+            if structured is None:
+                structured = _has_output_schema(mcp, tool)
+                if structured:
+                    logger.debug("%s has structured output; results use the SDK path", tool)
+            if structured or _raw.get() or not isinstance(result, (dict, ToolResponse)):
+                return result
+            return encode_result(result)
+
+        return serialized
+
+    wrap_tools(mcp, wrap)
@@ -0,0 +1,71 @@
+"""
+Single-flight request coalescing for MCP Skeleton.
+
+Ensures that concurrent callers asking for the same key share one execution
+of the underlying coroutine instead of each hitting the upstream.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    """A call in flight and the number of callers awaiting it."""
+
+    def __init__(self) -> None:
+        self.task: "asyncio.Task[Any]"
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls by key.
+
+    The first caller for a key starts the work; callers arriving while it is
+    in flight await the same result (or exception). The work runs in a task
+    of its own, so a caller that is cancelled (e.g. by its deadline or a client
+    disconnect) leaves it running for the others; it is cancelled only when
+    every caller has gone. Nothing is cached once the call completes - pair
+    this with a cache for that.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, _Call] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def run(self, key: Hashable, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run work() for key, or join the call already in flight for it.
+
+        Args:
+            key: Identity of the call
+            work: Zero-argument coroutine function performing the call
+
+        Returns:
+            Tuple of (result, shared) where shared is True if the result came
+            from a call started by another caller
+        """
+        call = self._inflight.get(key)
+        shared = call is not None
+        if call is None:
+            call = self._inflight[key] = _Call()
+
+            async def execute() -> Any:
+                try:
+                    return await work()
+                finally:
+                    del self._inflight[key]
+
+            call.task = asyncio.ensure_future(execute())
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()  # Nobody is left waiting for the result
+            raise
+        finally:
+            call.waiters -= 1
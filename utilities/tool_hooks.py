@@ -0,0 +1,63 @@
+"""
+Tool registration hooks for MCP Skeleton.
+
+Lets server-wide concerns (metrics, profiling) wrap every tool at the point
+where mcp_server.py registers it, so tool modules never have to change.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+ToolFunction = Callable[..., Awaitable[Any]]
+T = TypeVar("T")
+ToolWrapper = Callable[[str, ToolFunction], ToolFunction]
+
+
+def wrap_tools(mcp: Any, wrapper: ToolWrapper) -> None:
+    """
+    Apply a wrapper to every tool registered on a FastMCP server from now on.
+
+    Replaces mcp.tool with a decorator that passes each function through
+    wrapper(tool_name, fn) before registering it. Hooks installed later wrap
+    the result of earlier ones, so the last hook installed runs outermost.
+
+    Args:
+        mcp: The FastMCP server, before its tools are registered
+        wrapper: Returns the function to register; it must keep the wrapped
+            function's signature (functools.wraps) so the tool schema is unchanged
+    """
+    register = mcp.tool
+
+    def tool(name: Any = None, *args: Any, **kwargs: Any) -> Callable[[ToolFunction], Any]:
+        decorator = register(name, *args, **kwargs)
+
+        def wrap(fn: ToolFunction) -> Any:
+            return decorator(wrapper(name or fn.__name__, fn))
+
+        return wrap
+
+    mcp.tool = tool
+
+
+def parse_tool_values(spec: str, convert: Callable[[str], T]) -> Dict[str, T]:
+    """
+    Parse per-tool settings written as "tool=value,tool=value".
+
+    Args:
+        spec: The setting text; empty entries are ignored
+        convert: Converts and validates a value, raising ValueError if invalid
+
+    Raises:
+        ValueError: If an entry is malformed or its value is rejected by convert
+    """
+    values: Dict[str, T] = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        tool, _, value = entry.partition("=")
+        try:
+            if not tool.strip():
+                raise ValueError("missing tool name")
+            values[tool.strip()] = convert(value.strip())
+        except ValueError as e:
+            raise ValueError(f"Invalid per-tool setting {entry.strip()!r}: {e}") from None
+    return values